@@ -1,9 +1,26 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 print("DEBUG: main.py - Top of file")
 
-app = FastAPI(title="Renewable Energy Dashboard API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background consumer for bulk-ingested laptop usage events
+    from .services.usage_ingestion_service import laptop_usage_queue
+    from .services.data_repository import get_repository, close_repository
+    from .services.seating_shard_service import shard_workers
+    await laptop_usage_queue.start()
+    # Open the configured backend (seeding SQLite on first run) before serving requests
+    await asyncio.to_thread(get_repository)
+    yield
+    await laptop_usage_queue.stop()
+    shard_workers.shutdown()
+    close_repository()
+
+app = FastAPI(title="Renewable Energy Dashboard API", lifespan=lifespan)
 print("DEBUG: main.py - FastAPI app created")
 
 origins = [
@@ -28,11 +45,12 @@ async def root():
 
 # Import routers
 print("DEBUG: main.py - Importing routers...")
-from .routes import energy_routes, employees_routes, seating_routes
+from .routes import energy_routes, employees_routes, seating_routes, dashboard_routes
 
 app.include_router(employees_routes.router, prefix="/api/employees", tags=["Employees & Leaderboard"])
 app.include_router(energy_routes.router, prefix="/api/energy", tags=["Energy Consumption"])
 app.include_router(seating_routes.router, prefix="/api/seating", tags=["Seating Arrangement"])
+app.include_router(dashboard_routes.router, prefix="/api/dashboard", tags=["Dashboard"])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+from .employee_models import LeaderboardEntry
+from .energy_models import LaptopUsage, LightingZone, HvacZone
+from .seating_models import SeatingArrangement, SeatingSuggestion
+
+class DashboardData(BaseModel):
+    # Every widget payload of the dashboard page; sections that were not requested are None
+    leaderboard: Optional[List[LeaderboardEntry]] = None
+    laptop_usage: Optional[List[LaptopUsage]] = None
+    lighting: Optional[List[LightingZone]] = None
+    hvac: Optional[List[HvacZone]] = None
+    arrangement: Optional[SeatingArrangement] = None
+    suggestions: Optional[SeatingSuggestion] = None
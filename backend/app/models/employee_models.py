@@ -1,5 +1,6 @@
+from datetime import datetime
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 
 class EmployeeBase(BaseModel):
     id: str = Field(..., example="emp001")
@@ -22,3 +23,18 @@ class LeaderboardEntry(BaseModel):
     name: str
     awe_points: int
     department: Optional[str] = None
+
+class EmployeeRank(BaseModel):
+    employee_id: str
+    rank: int
+    awe_points: int
+    total_ranked: int # Number of employees on the leaderboard
+    above: List[LeaderboardEntry] = Field(default_factory=list) # Entries ranked just above, best first
+    below: List[LeaderboardEntry] = Field(default_factory=list) # Entries ranked just below, best first
+
+class AwePointsEvent(BaseModel):
+    sequence: int # Position in the ledger, strictly increasing
+    employee_id: str
+    amount: int
+    reason: str = Field(..., example="dark_mode_usage")
+    timestamp: datetime
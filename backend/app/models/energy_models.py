@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict, Literal
 from enum import Enum
 import datetime
 
@@ -15,6 +15,14 @@ class LaptopUsage(BaseModel):
     # average_cpu_usage: Optional[float] = Field(None, ge=0, le=100)
     # energy_consumed_wh: Optional[float] = Field(None, gt=0)
 
+class LaptopUsageEvent(LaptopUsage):
+    # A usage report pushed by an endpoint agent; reports without a timestamp count as "now"
+    timestamp: Optional[datetime.datetime] = None
+
+class UsageIngestionReceipt(BaseModel):
+    accepted: int # Events validated and queued for processing
+    pending_batches: int # Batches waiting for the background consumer, including this one
+
 class LightState(str, Enum):
     ON = "ON"
     OFF = "OFF"
@@ -55,3 +63,48 @@ class OverallEnergySummary(BaseModel):
     total_consumption_kwh_today: float
     comparison_yesterday_percentage: float # e.g., -5.2 means 5.2% less than yesterday
     main_contributors: List[EnergyComponentData]
+
+class EnergyHistoryAggregate(BaseModel):
+    scope: Literal["employee", "zone"]
+    key: str = Field(..., example="emp001") # Employee id or zone id, depending on scope
+    start: Optional[datetime.datetime] = None # Inclusive window bounds; None means unbounded
+    end: Optional[datetime.datetime] = None
+    aggregation: Literal["sum", "mean", "max"] = "sum"
+    record_count: int
+    values: Dict[str, Optional[float]] # Metric name (e.g. "laptop_hours") -> aggregated value, None if no records
+
+class SensorReading(BaseModel):
+    # One zone snapshot as exported by the building sensors (see datasets/mock_sensor_data.json)
+    timestamp: datetime.datetime
+    office_zone: str = Field(..., example="A1")
+    temperature_celsius: Optional[float] = None
+    humidity_percent: Optional[float] = Field(None, ge=0, le=100)
+    light_status: LightState = Field(LightState.OFF)
+    light_level_lux: Optional[float] = Field(None, ge=0)
+    ac_status: HvacStatus = Field(HvacStatus.OFF)
+    ac_setpoint_celsius: Optional[float] = None
+    projector_status: LightState = Field(LightState.OFF)
+    energy_consumption_kwh_hourly: float = Field(..., ge=0, example=1.5)
+
+class IngestionReport(BaseModel):
+    source: str
+    records_read: int # Every element of the JSON array
+    records_ingested: int
+    records_rejected: int # Zone snapshots that failed validation
+    records_skipped: int # Elements that are not zone snapshots (e.g. per-employee laptop records)
+    elapsed_seconds: float
+    records_per_second: float
+
+class ZoneEnergyPoint(BaseModel):
+    bucket_start: datetime.datetime
+    kwh: float
+    readings: int # Raw hourly readings folded into this bucket
+
+class ZoneEnergySeries(BaseModel):
+    zone_id: str = Field(..., example="A1")
+    resolution: Literal["hour", "day", "month"]
+    tier_used: Literal["hour", "day", "month"] # Pre-aggregated tier the answer was read from
+    start: Optional[datetime.datetime] = None # Inclusive
+    end: Optional[datetime.datetime] = None # Exclusive
+    total_kwh: float
+    points: List[ZoneEnergyPoint]
@@ -12,7 +12,7 @@ class Seat(BaseModel):
     seat_id: str = Field(..., example="A101") # e.g., "A1-R1-S1" (Area1-Row1-Seat1) or "Desk101"
     status: SeatStatus = Field(SeatStatus.UNOCCUPIED)
     employee_id: Optional[str] = Field(None, example="emp001") # If occupied
-    # position: Tuple[int, int] # (row, col) for grid layout visualization
+    position: Optional[Tuple[int, int]] = Field(None, example=(0, 0)) # (row, col) in the zone grid, counted from 0
 
 class SeatingZone(BaseModel):
     zone_id: str = Field(..., example="Floor1-NorthWing")
@@ -21,12 +21,47 @@ class SeatingZone(BaseModel):
     grid_rows: int = Field(..., example=10) # Number of rows in this zone
     grid_cols: int = Field(..., example=10) # Number of columns in this zone
     seats: List[Seat] # A flat list of seats; their seat_id or an additional position field can map to grid
+    version: Optional[int] = Field(None, example=3) # Rises with every change to this zone's seats; send it back as expected_zone_version
 
 class SeatingArrangement(BaseModel):
     zones: List[SeatingZone]
     total_seats: int
     occupied_seats: int
     unoccupied_seats: int
+    version: Optional[int] = Field(None, example=42) # Seating version of this snapshot; pass as `since` to /changes/
+
+class ShardOccupancy(BaseModel):
+    shard: str = Field(..., example="HQ") # Building or floor, from the "<shard>/" prefix of its zone ids
+    zones: int
+    total_seats: int
+    occupied_seats: int
+    unoccupied_seats: int
+
+class CampusOccupancy(BaseModel):
+    shards: List[ShardOccupancy]
+    total_seats: int
+    occupied_seats: int
+    unoccupied_seats: int
+
+class SeatChange(BaseModel):
+    zone_id: str
+    seat: Seat # The seat's state now, not the individual change
+
+class SeatingChanges(BaseModel):
+    version: int # Ask for changes since this version next time
+    full_snapshot_required: bool = False # Too far behind: refetch the arrangement and continue from its version
+    changes: List[SeatChange] = Field(default_factory=list)
+
+class SeatUpdate(BaseModel):
+    status: SeatStatus
+    employee_id: Optional[str] = Field(None, example="emp001") # Required when status is occupied; moves the employee here
+    expected_zone_version: Optional[int] = Field(None, example=3) # Reject with 409 if the zone changed since this version
+
+class SeatUpdateResult(BaseModel):
+    zone_id: str
+    zone_version: int
+    seat: Seat
+    vacated_seat_id: Optional[str] = None # The employee's previous seat, released by this move
 
 class SeatingSuggestion(BaseModel):
     message: str
@@ -34,3 +69,11 @@ class SeatingSuggestion(BaseModel):
     estimated_energy_saving_kwh: Optional[float] = None
     vacated_zones_lights_off: List[str] = Field(default_factory=list) # Zones where lights can be turned off
     vacated_zones_ac_off: List[str] = Field(default_factory=list) # Zones where AC can be turned off
+
+class MoveSimulationRequest(BaseModel):
+    plans: List[List[Tuple[str, str]]] = Field(..., max_length=1000) # Each plan is a list of (employee_id, new_seat_id)
+
+class MoveSimulationResult(BaseModel):
+    kwh_without_moves: float # Projected zone energy (lighting, HVAC, base load) for a day as seated now
+    kwh_with_moves: float
+    saving_kwh: float
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, Query
+from typing import List, Literal, Optional
+
+from ..models.dashboard_models import DashboardData
+from ..services.data_repository import DataRepository, get_repository
+
+print("DEBUG: Loading dashboard_routes.py")
+router = APIRouter()
+
+DashboardSection = Literal["leaderboard", "laptop_usage", "lighting", "hvac", "arrangement", "suggestions"]
+
+@router.get("/", response_model=DashboardData, summary="Get all dashboard widgets in one request")
+async def get_dashboard_data(
+    sections: Optional[List[DashboardSection]] = Query(None),
+    leaderboard_limit: int = 10,
+    repo: DataRepository = Depends(get_repository),
+):
+    """
+    Retrieve the leaderboard, laptop usage, lighting, HVAC, seating arrangement and
+    seating suggestions together. Pass `sections` (repeatable) to include only some
+    of them; the others are returned as null.
+    """
+    return await repo.dashboard(sections, leaderboard_limit)
@@ -1,48 +1,66 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Query, Header, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from typing import AsyncIterable, AsyncIterator, List, Optional
 
-from ..models.employee_models import Employee, LeaderboardEntry
-from ..services import data_generation_service # Using the new service
+from ..models.employee_models import AwePointsEvent, Employee, EmployeeRank, LeaderboardEntry
+from ..services.data_repository import DataRepository, get_repository
 
 print("DEBUG: Loading employees_routes.py")
 router = APIRouter()
 
-# Dependency to get the data generation service (though it's globally managed for now)
-# This structure is useful if the service had state or needed setup per request.
-# For now, it's more of a pattern for future DB integration.
-def get_data_service():
-    return data_generation_service
+# Routes read through the repository returned by get_repository(): the storage backend
+# (in-memory mock, SQLite or file) and the read-through cache in front of it are chosen
+# in data_repository, so nothing here depends on where the data lives.
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+_employee_list_adapter = TypeAdapter(List[Employee])
+
+async def _ndjson_lines(employees: AsyncIterable[Employee]) -> AsyncIterator[bytes]:
+    # One JSON document per line, serialized as the iterator advances
+    async for emp in employees:
+        yield emp.model_dump_json().encode() + b"\n"
 
 @router.get("/", response_model=List[Employee], summary="Get all employees")
-async def read_employees(skip: int = 0, limit: int = 100, service = Depends(get_data_service)):
+async def read_employees(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    accept: Optional[str] = Header(None),
+    repo: DataRepository = Depends(get_repository),
+):
     """
     Retrieve a list of all employees.
     Supports pagination via `skip` and `limit` query parameters.
+
+    For deep pages, pass `cursor` instead of `skip` (an empty `cursor` starts at the
+    beginning): employees are returned in id order after the cursor, and the
+    `X-Next-Cursor` response header holds the cursor for the following page.
+
+    Sending `Accept: application/x-ndjson` streams every employee after `cursor`
+    (all of them if no cursor) as newline-delimited JSON; `limit` is ignored.
     """
-    print(f"DEBUG: employees_routes.py - / route called (skip={skip}, limit={limit})")
-    if service.USE_DATABASE_SWITCH:
-        # Replace with actual database query and logic
-        raise HTTPException(status_code=501, detail="Database connection not implemented yet.")
+    print(f"DEBUG: employees_routes.py - / route called (skip={skip}, limit={limit}, cursor={cursor})")
+    if accept and NDJSON_MEDIA_TYPE in accept:
+        return StreamingResponse(_ndjson_lines(repo.iter_employees(cursor)), media_type=NDJSON_MEDIA_TYPE)
+    elif cursor is not None:
+        page = await repo.employees_page(cursor, limit)
+        headers = {"X-Next-Cursor": page[-1].id} if page and len(page) == limit else {}
+        # Serialize the page directly; these are already validated Employee objects
+        return Response(content=_employee_list_adapter.dump_json(page), media_type="application/json", headers=headers)
     else:
-        employees = service.get_mock_employees()
-        return employees[skip : skip + limit]
+        return await repo.list_employees(skip, limit)
 
 @router.get("/{employee_id}", response_model=Employee, summary="Get a specific employee by ID")
-async def read_employee(employee_id: str, service = Depends(get_data_service)):
+async def read_employee(employee_id: str, repo: DataRepository = Depends(get_repository)):
     """
     Retrieve detailed information for a specific employee by their ID.
     """
     try:
-        if service.USE_DATABASE_SWITCH:
-            raise HTTPException(status_code=501, detail="Database connection not implemented yet.")
-
-        employees = service.get_mock_employees()
-
-        for emp in employees:
-            if emp.id == employee_id:
-                return emp
-
-        raise HTTPException(status_code=404, detail="Employee not found")
+        employee = await repo.get_employee(employee_id)
+        if employee is None:
+            raise HTTPException(status_code=404, detail="Employee not found")
+        return employee
 
     except HTTPException as http_exc:
         raise http_exc  # Re-raise known API exceptions
@@ -51,17 +69,35 @@ async def read_employee(employee_id: str, service = Depends(get_data_service)):
         # Catch unexpected errors
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
+@router.get("/{employee_id}/rank", response_model=EmployeeRank, summary="Get an employee's leaderboard rank and neighbours")
+async def read_employee_rank(employee_id: str, window: int = Query(5, ge=0, le=50), repo: DataRepository = Depends(get_repository)):
+    """
+    Retrieve one employee's leaderboard rank together with the `window` entries
+    ranked directly above and below them, without downloading the whole leaderboard.
+    """
+    rank_data = await repo.employee_rank(employee_id, window)
+    if rank_data is None:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    return rank_data
+
+@router.get("/{employee_id}/points-history", response_model=List[AwePointsEvent], summary="Get an employee's Awe Points awards")
+async def read_employee_points_history(employee_id: str, limit: int = Query(50, ge=1, le=1000), repo: DataRepository = Depends(get_repository)):
+    """
+    Retrieve the Awe Points ledger entries for one employee, newest first.
+    Each entry records the amount awarded, the reason and when it happened.
+    """
+    history = await repo.points_history(employee_id, limit)
+    if history is None:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    return history
+
 @router.get("/leaderboard/", response_model=List[LeaderboardEntry], summary="Get employee leaderboard")
-async def get_leaderboard(limit: int = 10, service = Depends(get_data_service)):
+async def get_leaderboard(limit: int = 10, repo: DataRepository = Depends(get_repository)):
     """
     Retrieve the employee leaderboard, ranked by Awe Points.
     Shows top N employees, default is 10.
     """
-    if service.USE_DATABASE_SWITCH:
-        raise HTTPException(status_code=501, detail="Database connection not implemented yet.")
-    else:
-        leaderboard_data = service.get_mock_leaderboard()
-        return leaderboard_data[:limit]
+    return await repo.leaderboard(limit)
 
 # Placeholder for future POST/PUT/DELETE operations if employee management is added
 # @router.post("/", response_model=Employee, status_code=201)
@@ -1,72 +1,197 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Dict, Any
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from typing import List, Any, AsyncIterator, Literal, Optional
+from datetime import datetime
+import asyncio
+import json
 
 # Assuming models are in ..models.energy_models
-from ..models.energy_models import LaptopUsage, LightingZone, HvacZone # Add more as needed
-from ..services import data_generation_service
+from ..models.energy_models import LaptopUsage, LightingZone, HvacZone, EnergyHistoryAggregate, ZoneEnergySeries, OverallEnergySummary, UsageIngestionReceipt # Add more as needed
+from ..services import energy_history_service, zone_energy_rollup_service, energy_summary_service, usage_ingestion_service
+from ..services.data_repository import DataRepository, get_repository
+from ..services.zone_state_stream_service import zone_state_broadcaster
 
 print("DEBUG: Loading energy_routes.py")
 router = APIRouter()
 
-def get_data_service():
-    return data_generation_service
+def get_history_service():
+    return energy_history_service
+
+def get_rollup_service():
+    return zone_energy_rollup_service
+
+def get_summary_service():
+    return energy_summary_service
+
+def get_zone_broadcaster():
+    return zone_state_broadcaster
+
+def get_usage_ingestion():
+    return usage_ingestion_service
+
+STREAM_KEEPALIVE_SECONDS = 15.0
 
 @router.get("/laptop-usage/", response_model=List[LaptopUsage], summary="Get laptop usage data")
-async def get_laptop_usage_data(service = Depends(get_data_service)):
+async def get_laptop_usage_data(repo: DataRepository = Depends(get_repository)):
     """
     Retrieve mock data for laptop usage across employees.
     Includes hours on and light/dark mode.
     """
     print("DEBUG: energy_routes.py - /laptop-usage/ route called")
-    if service.USE_DATABASE_SWITCH:
-        raise HTTPException(status_code=501, detail="Database connection not implemented yet.")
-    else:
-        # The service returns dicts, Pydantic will validate them against LaptopUsage model
-        raw_data = service.get_mock_laptop_usage()
-        return [LaptopUsage(**item) for item in raw_data]
+    # The repository returns dicts, Pydantic will validate them against LaptopUsage model
+    raw_data = await repo.laptop_usage()
+    return [LaptopUsage(**item) for item in raw_data]
+
 
+@router.post("/laptop-usage/bulk", response_model=UsageIngestionReceipt, status_code=202, summary="Bulk-ingest laptop usage events")
+async def ingest_laptop_usage_bulk(request: Request, repo: DataRepository = Depends(get_repository), ingestion = Depends(get_usage_ingestion)):
+    """
+    Accept up to 50,000 laptop usage events per request, either as a JSON array or as
+    NDJSON (`Content-Type: application/x-ndjson`). The whole batch is validated in one
+    pass and handed to the repository: the in-memory backends queue it for a background
+    consumer, SQLite writes it in one transaction. Responds 503 with `Retry-After`
+    when the queue is full.
+    """
+    too_large = HTTPException(status_code=413, detail=f"At most {ingestion.MAX_EVENTS_PER_REQUEST} events per request.")
+    # Refuse oversized batches before reading (by Content-Length) or validating (by a byte scan) them
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > ingestion.MAX_BODY_BYTES:
+        raise too_large
+    body = await request.body()
+    if ingestion.count_usage_events(body) > ingestion.MAX_EVENTS_PER_REQUEST:
+        raise too_large
+    ndjson = "ndjson" in request.headers.get("content-type", "")
+    try:
+        events = ingestion.parse_usage_events(body, ndjson=ndjson)
+    except ValidationError as exc:
+        raise HTTPException(status_code=422, detail=exc.errors(include_url=False, include_input=False)[:20])
+    if len(events) > ingestion.MAX_EVENTS_PER_REQUEST:  # E.g. ids written with escapes the scan does not see
+        raise too_large
+
+    pending_batches = await repo.ingest_laptop_usage(events)
+    if pending_batches is None:
+        raise HTTPException(status_code=503, detail="Usage ingestion queue is full, retry later.", headers={"Retry-After": "1"})
+    return {"accepted": len(events), "pending_batches": pending_batches}
 
 @router.get("/lighting/", response_model=List[LightingZone], summary="Get lighting status for zones")
-async def get_lighting_status_data(service = Depends(get_data_service)):
+async def get_lighting_status_data(repo: DataRepository = Depends(get_repository)):
     """
     Retrieve mock data for lighting status in different office zones.
     """
-    if service.USE_DATABASE_SWITCH:
-        raise HTTPException(status_code=501, detail="Database connection not implemented yet.")
-    else:
-        raw_data = service.get_mock_lighting_status()
-        # Manually create LightingZone objects if the service returns dicts
-        # that don't perfectly match due to potential future fields in the model
-        return [LightingZone(**item) for item in raw_data]
+    raw_data = await repo.lighting_status()
+    # Manually create LightingZone objects if the repository returns dicts
+    # that don't perfectly match due to potential future fields in the model
+    return [LightingZone(**item) for item in raw_data]
 
 
 @router.get("/hvac/", response_model=List[HvacZone], summary="Get HVAC status for zones")
-async def get_hvac_status_data(service = Depends(get_data_service)):
+async def get_hvac_status_data(repo: DataRepository = Depends(get_repository)):
     """
     Retrieve mock data for HVAC (Air Conditioning/Heating) status in different office zones.
     """
-    if service.USE_DATABASE_SWITCH:
-        raise HTTPException(status_code=501, detail="Database connection not implemented. This is a test of a longer line that might cause issues with the diffing algorithm if not handled carefully by the model generating the diff and ensuring it is properly formatted for the tool.")
-    else:
-        raw_data = service.get_mock_hvac_status()
-        # Manually create HvacZone objects
-        return [HvacZone(**item) for item in raw_data]
-
-# Example of a combined energy overview (conceptual)
-# from ..models.energy_models import OverallEnergySummary, EnergyComponentData
-# @router.get("/summary/", response_model=OverallEnergySummary, summary="Get overall energy summary")
-# async def get_energy_summary(service = Depends(get_data_service)):
-#     if service.USE_DATABASE_SWITCH:
-#         raise HTTPException(status_code=501, detail="Not implemented")
-#     else:
-#         # This would require more sophisticated data aggregation in the service
-        # main_contributors = [
-        #     EnergyComponentData(component_name="Total Laptop Usage", usage_metric="Hours", current_value=sum(u['hours_on'] for u in service.get_mock_laptop_usage())),
-        #     EnergyComponentData(component_name="Lights On (Zones)", usage_metric="Count", current_value=sum(1 for l in service.get_mock_lighting_status() if l['status'] == "ON")),
-        # ]
-        # return OverallEnergySummary(
-        #     total_consumption_kwh_today=round(random.uniform(50, 200),2),
-        #     comparison_yesterday_percentage=round(random.uniform(-10, 10),1),
-        #     main_contributors=main_contributors
-        # )
-#     pass
+    raw_data = await repo.hvac_status()
+    # Manually create HvacZone objects
+    return [HvacZone(**item) for item in raw_data]
+
+def _sse_message(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def _zone_state_events(request: Request, repo: DataRepository, broadcaster) -> AsyncIterator[str]:
+    # Subscribe before taking the snapshot so no change falls between the two
+    queue = broadcaster.subscribe()
+    try:
+        yield _sse_message("snapshot", await repo.zone_state_snapshot())
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if event["type"] == "resync":
+                yield _sse_message("snapshot", await repo.zone_state_snapshot())
+            else:
+                yield _sse_message(event["type"], {key: value for key, value in event.items() if key != "type"})
+    finally:
+        broadcaster.unsubscribe(queue)
+
+
+@router.get("/stream/", summary="Stream lighting and HVAC zone changes (Server-Sent Events)")
+async def stream_zone_states(request: Request, repo: DataRepository = Depends(get_repository), broadcaster = Depends(get_zone_broadcaster)):
+    """
+    Server-Sent Events stream replacing polling of `/lighting/` and `/hvac/`.
+    Sends a `snapshot` event with every zone on connect, then one `lighting` or
+    `hvac` event per zone whose state changed. A fresh `snapshot` is sent if the
+    client falls too far behind.
+
+    Only available with the in-memory backends: zone changes are published by the
+    in-memory simulation.
+    """
+    if not repo.supports_zone_stream:
+        raise HTTPException(status_code=501, detail="Database connection not implemented yet.")
+    return StreamingResponse(
+        _zone_state_events(request, repo, broadcaster),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/history/employees/{employee_id}", response_model=EnergyHistoryAggregate, summary="Aggregate an employee's usage history")
+async def get_employee_energy_history(
+    employee_id: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    agg: Literal["sum", "mean", "max"] = "sum",
+    history = Depends(get_history_service),
+):
+    """
+    Aggregate one employee's recorded daily usage (laptop, lighting, AC, projector hours
+    and Awe Points earned) over an optional [start, end] window.
+    """
+    result = history.get_employee_history_aggregate(employee_id, start=start, end=end, aggregation=agg)
+    if result is None:
+        raise HTTPException(status_code=404, detail="No history for this employee")
+    return result
+
+
+@router.get("/history/zones/{zone_id}", response_model=EnergyHistoryAggregate, summary="Aggregate a zone's usage history")
+async def get_zone_energy_history(
+    zone_id: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    agg: Literal["sum", "mean", "max"] = "sum",
+    history = Depends(get_history_service),
+):
+    """
+    Aggregate the recorded usage of every employee who worked in a zone over an
+    optional [start, end] window.
+    """
+    result = history.get_zone_history_aggregate(zone_id, start=start, end=end, aggregation=agg)
+    if result is None:
+        raise HTTPException(status_code=404, detail="No history for this zone")
+    return result
+
+@router.get("/zones/{zone_id}/consumption", response_model=ZoneEnergySeries, summary="Get a zone's energy consumption over time")
+async def get_zone_energy_consumption(
+    zone_id: str,
+    resolution: Literal["hour", "day", "month"] = "day",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    rollups = Depends(get_rollup_service),
+):
+    """
+    Retrieve a zone's sensor-reported kWh in [start, end) bucketed by hour, day or month.
+    Answers come from pre-aggregated tiers; `tier_used` shows which one was read.
+    """
+    result = rollups.get_zone_energy_series(zone_id, resolution=resolution, start=start, end=end)
+    if result is None:
+        raise HTTPException(status_code=404, detail="No sensor data for this zone")
+    return result
+
+@router.get("/summary/", response_model=OverallEnergySummary, summary="Get overall energy summary")
+async def get_energy_summary(summary_service = Depends(get_summary_service)):
+    """
+    Retrieve today's total kWh, the change versus yesterday and the main contributing
+    components. Totals are running counters maintained as usage and sensor events arrive.
+    """
+    return summary_service.get_energy_summary()
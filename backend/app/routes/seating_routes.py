@@ -1,30 +1,56 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import Dict, Any # Changed from List to Dict for top-level structure
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Response
+from typing import List, Optional
 
-from ..models.seating_models import SeatingArrangement, SeatingSuggestion #, SeatingZone, Seat
-from ..services import data_generation_service
+from ..models.seating_models import CampusOccupancy, MoveSimulationRequest, MoveSimulationResult, Seat, SeatingArrangement, SeatingChanges, SeatingSuggestion, SeatUpdate, SeatUpdateResult #, SeatingZone
+from ..services.data_repository import DataRepository, SeatConflictError, get_repository
+from ..services import seating_binary_codec
 
 print("DEBUG: Loading seating_routes.py")
 router = APIRouter()
 
-def get_data_service():
-    return data_generation_service
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match uses weak comparison: "W/" prefixes are ignored and "*" matches anything
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag.removeprefix("W/") in candidates
 
-@router.get("/arrangement/", response_model=SeatingArrangement, summary="Get current seating arrangement")
-async def get_seating_arrangement_data(service = Depends(get_data_service)):
+def _wants_binary(accept: Optional[str]) -> bool:
+    # Binary only when the client names it and does not rank JSON higher; everything else gets JSON
+    ranks = {}
+    for media_range in (accept or "").split(","):
+        media_type, *params = [part.strip() for part in media_range.split(";")]
+        q = next((param[2:] for param in params if param.startswith("q=")), "1")
+        try:
+            ranks[media_type.lower()] = float(q)
+        except ValueError:
+            continue
+    binary = ranks.get(seating_binary_codec.MEDIA_TYPE, 0.0)
+    return binary > 0 and binary >= ranks.get("application/json", 0.0)
+
+@router.get("/arrangement/", response_model=SeatingArrangement, summary="Get current seating arrangement",
+            responses={200: {"content": {seating_binary_codec.MEDIA_TYPE: {}}}})
+async def get_seating_arrangement_data(shard: Optional[str] = None, if_none_match: Optional[str] = Header(None),
+                                       accept: Optional[str] = Header(None), repo: DataRepository = Depends(get_repository)):
     """
     Retrieve the current mock seating arrangement for the office,
     including zone details, seat statuses, and occupancy counts.
+
+    The response carries an `ETag` that changes whenever a seat changes; sending it
+    back in `If-None-Match` returns `304 Not Modified` while the seating is unchanged.
+    Its `version` is the starting point for `/changes/`. With `shard`, only that
+    building's (or floor's) zones are returned, and its ETag only changes with them.
+
+    Large floor plans can be fetched far smaller with
+    `Accept: application/vnd.rtms.seating+binary`: one status byte per grid cell and a
+    shared employee-id table (format in `app/services/seating_binary_codec.py`).
     """
     print("DEBUG: seating_routes.py - /arrangement/ route called")
     try:
-        if service.USE_DATABASE_SWITCH:
-            raise HTTPException(status_code=501, detail="Database connection not implemented yet.")
-        else:
-            # The service now returns a dict that should match SeatingArrangement
-            raw_arrangement_data = service.get_mock_seating_arrangement_and_assign_employees()
-            # Pydantic will validate this structure against the SeatingArrangement model
-            return SeatingArrangement(**raw_arrangement_data)
+        # Pre-serialized JSON or binary, rebuilt by the service only when a seat changes
+        binary = _wants_binary(accept)
+        encoding = seating_binary_codec.ENCODING_BINARY if binary else seating_binary_codec.ENCODING_JSON
+        snapshot = await repo.seating_arrangement_snapshot(encoding, shard)
     except HTTPException as http_exc:
         raise http_exc  # Known HTTP errors (like 501) are re-raised
 
@@ -32,31 +58,118 @@ async def get_seating_arrangement_data(service = Depends(get_data_service)):
         # Catch and return unexpected internal errors
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Shard not found")
+    etag, body = snapshot
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=seating_binary_codec.MEDIA_TYPE if binary else "application/json", headers=headers)
+
+@router.get("/changes/", response_model=SeatingChanges, summary="Get seats changed since a seating version")
+async def get_seating_changes(since: int = Query(..., ge=0), shard: Optional[str] = None, repo: DataRepository = Depends(get_repository)):
+    """
+    Retrieve only the seats that changed after seating version `since`, in their current
+    state, plus the version to ask from next time. Start from the `version` of a full
+    arrangement. If the client is too far behind (or the layout was regenerated),
+    `full_snapshot_required` is set and it should refetch `/arrangement/`.
+    With `shard`, only changes in that building's zones are returned.
+    """
+    if not repo.supports_seat_updates:
+        raise HTTPException(status_code=501, detail="Seating changes are not available for this data backend")
+    return await repo.seating_changes(since, shard)
+
 @router.get("/suggestions/", response_model=SeatingSuggestion, summary="Get seating optimization suggestions")
-async def get_seating_suggestions_data(service = Depends(get_data_service)):
-    """
-    Retrieve mock suggestions for optimizing seating arrangements to save energy.
-    This is a simplified mock endpoint.
-    """
-    if service.USE_DATABASE_SWITCH:
-        raise HTTPException(status_code=501, detail="Database connection not implemented yet.")
-    else:
-        suggestion_data = service.get_mock_seating_suggestions()
-        return SeatingSuggestion(**suggestion_data)
-
-# Potential future endpoint to update a seat status (e.g., when an employee moves)
-# @router.post("/update-seat/{seat_id}", summary="Update status of a seat")
-# async def update_seat_status(seat_id: str, new_status: str, employee_id: str = None, service = Depends(get_data_service)):
-#     if service.USE_DATABASE_SWITCH:
-#         raise HTTPException(status_code=501, detail="Not implemented")
-#     else:
-#         # Logic to find and update the seat in mock data
-#         # This would be more complex, involving finding the seat in the nested structure
-#         # and potentially updating employee records.
-#         # For now, just a placeholder.
-#         updated = service.update_mock_seat_status(seat_id, new_status, employee_id)
-#         if updated:
-#             return {"message": f"Seat {seat_id} updated to {new_status}"}
-#         else:
-#             raise HTTPException(status_code=404, detail=f"Seat {seat_id} not found or update failed.")
-#     pass
+async def get_seating_suggestions_data(
+    objective: str = Query("zones", pattern="^(zones|energy)$"),
+    group_by_department: bool = False,
+    time_budget_ms: Optional[int] = Query(None, ge=1, le=10_000),
+    shard: Optional[str] = None,
+    repo: DataRepository = Depends(get_repository),
+):
+    """
+    Retrieve a consolidation plan: the full set of moves that empties the most zones
+    (`objective=zones`) or saves the most lighting and HVAC energy (`objective=energy`)
+    while keeping everyone seated. With `group_by_department`, moved employees are
+    seated near their own department. `time_budget_ms` bounds the search; the best
+    plan found within it is returned.
+
+    Each building (shard) is planned separately on its own worker, and moves stay
+    within a building; `shard` limits the plan to one building.
+    """
+    suggestion_data = await repo.seating_suggestions(objective, group_by_department, time_budget_ms, shard)
+    if suggestion_data is None:
+        raise HTTPException(status_code=404, detail="Shard not found")
+    return SeatingSuggestion(**suggestion_data)
+
+@router.get("/occupancy/", response_model=CampusOccupancy, summary="Get seat occupancy per building and campus-wide")
+async def get_campus_occupancy(repo: DataRepository = Depends(get_repository)):
+    """
+    Retrieve seat totals for each shard (building or floor) and for the whole campus,
+    merged from the per-shard figures.
+    """
+    return await repo.campus_occupancy()
+
+@router.post("/simulate/", response_model=List[MoveSimulationResult], summary="Project the energy effect of seat moves")
+async def simulate_seat_moves(request: MoveSimulationRequest, repo: DataRepository = Depends(get_repository)):
+    """
+    Replay a day of occupancy, lighting and HVAC per zone for each plan of
+    (employee id, new seat id) moves, and return the projected kWh without and
+    with the moves. Plans are independent of each other and of the live seating;
+    nothing is moved. Up to 1000 plans per request.
+    """
+    try:
+        return await repo.simulate_seat_moves(request.plans)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+# Zone and seat ids in sharded layouts contain "/" ("HQ/ZoneA-R1C1", see seating_shard_service), hence the path params
+@router.get("/zones/{zone_id:path}/nearest-free/", response_model=List[Seat], summary="Find the free seats nearest a grid position")
+async def get_nearest_free_seats(
+    zone_id: str,
+    row: int = Query(..., ge=0),
+    col: int = Query(..., ge=0),
+    k: int = Query(5, ge=1, le=100),
+    repo: DataRepository = Depends(get_repository),
+):
+    """
+    Retrieve up to `k` unoccupied seats in a zone, nearest to grid position
+    (`row`, `col`) first. Positions count from 0, as in each seat's `position`.
+    """
+    seats = await repo.nearest_free_seats(zone_id, row, col, k)
+    if seats is None:
+        raise HTTPException(status_code=404, detail="Zone not found")
+    return seats
+
+@router.get("/zones/{zone_id:path}/free-block/", response_model=List[Seat], summary="Get the largest block of adjacent free seats")
+async def get_largest_free_block(zone_id: str, repo: DataRepository = Depends(get_repository)):
+    """
+    Retrieve the longest run of adjacent unoccupied seats in one row of a zone,
+    e.g. to seat a team together. Empty when the zone has no free seats.
+    """
+    seats = await repo.largest_free_block(zone_id)
+    if seats is None:
+        raise HTTPException(status_code=404, detail="Zone not found")
+    return seats
+
+@router.put("/seats/{seat_id:path}", response_model=SeatUpdateResult, summary="Update a seat's status or move an employee to it")
+async def update_seat(seat_id: str, update: SeatUpdate, repo: DataRepository = Depends(get_repository)):
+    """
+    Set a seat's status. With `status: occupied` and an `employee_id`, the employee moves
+    here and their previous seat is released, all in one step.
+
+    Send the zone `version` from the arrangement as `expected_zone_version` to make the
+    update conditional: it is rejected with `409 Conflict` if anything in the zone changed since.
+    Taking a seat held by another employee is also a `409`.
+    """
+    if not repo.supports_seat_updates:
+        raise HTTPException(status_code=501, detail="Seat updates are not supported by this data backend")
+    try:
+        result = await repo.update_seat(seat_id, update.status, update.employee_id, update.expected_zone_version)
+    except SeatConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Seat or employee not found")
+    return result
@@ -0,0 +1,196 @@
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from ..models.employee_models import AwePointsEvent
+
+REASON_DARK_MODE_USAGE = "dark_mode_usage"
+SNAPSHOT_EVERY_EVENTS = 10_000
+
+EVENTS_FILE = "events.jsonl"
+SNAPSHOT_FILE = "snapshot.json"
+
+# Called with (employee_id, new total) after every award
+TotalListener = Callable[[str, int], None]
+
+
+class AwePointsLedger:
+    """
+    Append-only log of Awe Points awards plus the running total per employee.
+
+    Totals are a projection of the log: they only change when an event is appended,
+    and listeners (the ranked leaderboard) are told the new total straight away.
+
+    With a `directory`, every event is appended to `events.jsonl` and every
+    `snapshot_every` events the totals are written to `snapshot.json` together with
+    the log offset they cover. A restart loads the snapshot and replays only the
+    events after that offset; the events before it are indexed by file offset per
+    employee, so history still reaches back to the first award. Opening balances
+    (the generated starting points) are part of the snapshot rather than the log.
+    """
+
+    def __init__(self, directory: Optional[str] = None, snapshot_every: int = SNAPSHOT_EVERY_EVENTS):
+        self._directory = directory
+        self._snapshot_every = snapshot_every
+        self._lock = threading.Lock()
+        self._totals: Dict[str, int] = {}
+        self._events: List[AwePointsEvent] = []  # Events appended or replayed in this process
+        self._events_by_employee: Dict[str, List[int]] = {}  # Positions in _events
+        self._archived_by_employee: Dict[str, List[int]] = {}  # Byte offsets in events.jsonl of events not replayed
+        self._listeners: List[TotalListener] = []
+        self._sequence = 0
+        self._snapshot_sequence = 0
+        self._log = None
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._restore()
+            self._log = open(os.path.join(directory, EVENTS_FILE), "a", encoding="utf-8")
+
+    @property
+    def sequence(self) -> int:
+        return self._sequence
+
+    def add_listener(self, listener: TotalListener) -> None:
+        self._listeners.append(listener)
+
+    def total_of(self, employee_id: str) -> Optional[int]:
+        return self._totals.get(employee_id)
+
+    def set_opening_balances(self, balances: Dict[str, int], overwrite: bool = False) -> Dict[str, int]:
+        """
+        Give employees the ledger has not seen yet their starting points and return the
+        current total for every id in `balances` (restored totals win over new balances
+        unless `overwrite` is set, e.g. when loading a saved state).
+        """
+        with self._lock:
+            new_ids = [emp_id for emp_id in balances if overwrite or emp_id not in self._totals]
+            for emp_id in new_ids:
+                self._totals[emp_id] = balances[emp_id]
+            if new_ids and self._directory:
+                self._write_snapshot()
+            return {emp_id: self._totals[emp_id] for emp_id in balances}
+
+    def award(self, employee_id: str, amount: int, reason: str, timestamp: Optional[datetime] = None,
+              cap: Optional[int] = None) -> Optional[AwePointsEvent]:
+        """
+        Append an award and update the projection. With `cap` the amount is reduced so
+        the total does not exceed it; the event records the amount actually awarded.
+        Returns None when nothing was awarded.
+        """
+        with self._lock:
+            current = self._totals.get(employee_id, 0)
+            if cap is not None:
+                amount = min(amount, cap - current)
+            if amount <= 0:
+                return None
+            event = AwePointsEvent(
+                sequence=self._sequence + 1,
+                employee_id=employee_id,
+                amount=amount,
+                reason=reason,
+                timestamp=timestamp or datetime.now(timezone.utc),
+            )
+            self._apply(event)
+            if self._log is not None:
+                self._log.write(event.model_dump_json() + "\n")
+                self._log.flush()
+                if self._sequence - self._snapshot_sequence >= self._snapshot_every:
+                    self._write_snapshot()
+            total = self._totals[employee_id]
+        for listener in self._listeners:
+            listener(employee_id, total)
+        return event
+
+    def history(self, employee_id: str, limit: Optional[int] = None) -> List[AwePointsEvent]:
+        """Events for one employee, newest first: those of this process, then older ones read from the log."""
+        positions = self._events_by_employee.get(employee_id, [])
+        selected = positions[::-1] if limit is None else positions[:-limit - 1:-1]
+        events = [self._events[position] for position in selected]
+        archived = self._archived_by_employee.get(employee_id)
+        if archived and (limit is None or len(events) < limit):
+            wanted = archived[::-1] if limit is None else archived[:-(limit - len(events)) - 1:-1]
+            with open(os.path.join(self._directory, EVENTS_FILE), "rb") as handle:
+                for offset in wanted:
+                    handle.seek(offset)
+                    events.append(AwePointsEvent.model_validate_json(handle.readline()))
+        return events
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return {"sequence": self._sequence, "totals": dict(self._totals)}
+
+    def close(self) -> None:
+        if self._log is not None:
+            with self._lock:
+                self._write_snapshot()
+            self._log.close()
+            self._log = None
+
+    def _apply(self, event: AwePointsEvent) -> None:
+        self._totals[event.employee_id] = self._totals.get(event.employee_id, 0) + event.amount
+        self._sequence = event.sequence
+        self._events_by_employee.setdefault(event.employee_id, []).append(len(self._events))
+        self._events.append(event)
+
+    def _write_snapshot(self) -> None:
+        # Write to a temp file and rename so a crash never leaves a half-written snapshot
+        if self._log is not None:
+            self._log.flush()
+        events_path = os.path.join(self._directory, EVENTS_FILE)
+        state = {
+            "sequence": self._sequence,
+            "events_offset": os.path.getsize(events_path) if os.path.exists(events_path) else 0,
+            "taken_at": datetime.now(timezone.utc).isoformat(),
+            "totals": self._totals,
+        }
+        snapshot_path = os.path.join(self._directory, SNAPSHOT_FILE)
+        with open(snapshot_path + ".tmp", "w", encoding="utf-8") as handle:
+            json.dump(state, handle)
+        os.replace(snapshot_path + ".tmp", snapshot_path)
+        self._snapshot_sequence = self._sequence
+
+    def _restore(self) -> None:
+        offset = 0
+        snapshot_path = os.path.join(self._directory, SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, encoding="utf-8") as handle:
+                state = json.load(handle)
+            self._totals = {emp_id: int(points) for emp_id, points in state["totals"].items()}
+            self._sequence = self._snapshot_sequence = state["sequence"]
+            offset = state["events_offset"]
+
+        events_path = os.path.join(self._directory, EVENTS_FILE)
+        if not os.path.exists(events_path):
+            return
+        replayed = 0
+        valid_end = 0
+        with open(events_path, "rb+") as handle:
+            for line in handle:
+                if not line.endswith(b"\n"):
+                    break  # Partial last line from an interrupted write
+                if valid_end < offset:
+                    # Covered by the snapshot: only remember where it is, for history
+                    self._archived_by_employee.setdefault(json.loads(line)["employee_id"], []).append(valid_end)
+                else:
+                    event = AwePointsEvent.model_validate_json(line)
+                    if event.sequence > self._sequence:
+                        self._apply(event)
+                        replayed += 1
+                    else:
+                        self._archived_by_employee.setdefault(event.employee_id, []).append(valid_end)
+                valid_end += len(line)
+            handle.truncate(valid_end)  # Drop the partial line so new events start on a fresh line
+        print(f"DEBUG: awe_points_ledger_service: restored {len(self._totals)} totals at sequence {self._sequence} ({replayed} events replayed)")
+
+
+# --- Module-level ledger; persisted when RTMS_AWE_LEDGER_DIR is set ---
+_ledger: Optional[AwePointsLedger] = None
+
+
+def get_ledger() -> AwePointsLedger:
+    global _ledger
+    if _ledger is None:
+        _ledger = AwePointsLedger(os.environ.get("RTMS_AWE_LEDGER_DIR") or None)
+    return _ledger
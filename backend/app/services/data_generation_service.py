@@ -1,21 +1,47 @@
+import os
 import random
+import threading
 import uuid
+from bisect import bisect_right
+from collections import deque
+from contextlib import ExitStack, contextmanager, nullcontext
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Deque, Iterator, Optional, Tuple
 
 from ..models.employee_models import Employee
-from ..models.energy_models import LightState, HvacStatus, ProjectorUsage, LaptopMode
-from ..models.seating_models import SeatStatus, Seat, SeatingZone
-
-# Configuration for mock data generation
-NUM_EMPLOYEES = 25  # Target around 10-25 for varied data, can show fewer in UI
-NUM_ZONES = 5       # For lighting and HVAC
+from ..models.energy_models import LightState, HvacStatus, ProjectorUsage, LaptopMode, LaptopUsageEvent
+from ..models.seating_models import SeatStatus, Seat, SeatingArrangement, SeatingZone
+from .leaderboard_index import RankedLeaderboard
+from .zone_occupancy_index import ZoneOccupancyCounters
+from .seat_spatial_index import SeatSpatialIndex
+from .zone_state_stream_service import zone_state_broadcaster
+from . import energy_summary_service
+from . import synthetic_data_service
+from . import seating_optimizer_service
+from . import seating_binary_codec
+from . import zone_energy_baseline_service
+from .energy_simulation_service import EnergySimulator
+from .seating_shard_service import merge_shard_occupancy, shard_of, shard_workers
+from .awe_points_ledger_service import get_ledger, REASON_DARK_MODE_USAGE
+
+# Configuration for mock data generation (sizes can be overridden through RTMS_* environment variables)
+_synthetic_config = synthetic_data_service.SyntheticConfig.from_env()
+NUM_EMPLOYEES = _synthetic_config.num_employees  # Target around 10-25 for varied data, can show fewer in UI
+NUM_ZONES = _synthetic_config.num_zones          # For lighting and HVAC
 # Aim for ~100 seats: 5 zones * (5 rows * 4 cols) = 100 seats
-SEATS_PER_ZONE_ROWS = 5
-SEATS_PER_ZONE_COLS = 4
+SEATS_PER_ZONE_ROWS = _synthetic_config.seat_rows
+SEATS_PER_ZONE_COLS = _synthetic_config.seat_cols
+NUM_BUILDINGS = int(os.environ.get("RTMS_NUM_BUILDINGS", "1")) # Above 1, zones are spread over buildings B1, B2, ... (one shard each)
 NUM_MEETING_ROOMS = 3
+# "random": the original per-object generator. "vectorized": seeded NumPy generator
+# (synthetic_data_service) for large, reproducible datasets; seed from RTMS_DATA_SEED.
+DATA_GENERATOR = os.environ.get("RTMS_DATA_GENERATOR", "random")
+
+MAX_AWE_POINTS = 500
+DARK_MODE_HOURS_PER_POINT = 0.5 # Reported Dark Mode usage earns one Awe Point per half hour
 
-USE_DATABASE_SWITCH = False
+SEATING_CHANGE_LOG_SIZE = int(os.environ.get("RTMS_SEATING_CHANGE_LOG_SIZE", "10000")) # Seat changes kept for /api/seating/changes/
+USE_DATABASE_SWITCH = os.environ.get("RTMS_USE_DATABASE", "").lower() in ("1", "true", "yes") # SQLite mode, see database_service
 
 # --- Helper Functions (Restoring original variety) ---
 def _random_name() -> str:
@@ -29,15 +55,185 @@ def _random_department() -> str:
 
 # --- Global variables for storing generated data ---
 _generated_employees: List[Employee] = []
+_employees_by_id: Dict[str, Employee] = {} # Hash index over _generated_employees, same objects
+_employee_ids_sorted: List[str] = [] # Sorted ids, the keyset for cursor pagination
 _employee_seat_map: Dict[str, str] = {}
 _generated_zones_seats: Dict[str, List[Seat]] = {}
+_zone_counters = ZoneOccupancyCounters() # Seats per zone and status, kept in step with _generated_zones_seats
+_seat_index = SeatSpatialIndex() # Free seats per zone by grid position, for nearest-seat and free-block queries
+_seats_by_id: Dict[str, Tuple[str, Seat]] = {} # seat id -> (zone id, seat), rebuilt with the layout
+# Seat updates lock only the zones they touch; replacing the whole layout holds every zone lock.
+# A zone's version rises with each change to its seats (for conditional updates).
+_zone_locks: Dict[str, threading.Lock] = {}
+_zone_versions: Dict[str, int] = {}
+_layout_version = 0 # Bumped each time the layout is replaced
+_layout_lock = threading.Lock()
+# Moves of one employee are serialized: taken before any zone lock, so two moves of an unseated
+# employee into different zones (which share no zone lock) cannot both seat them
+_employee_locks: Dict[str, threading.Lock] = {}
+# Change feed: every seat change gets the next seating version and is logged as (version, zone id, seat id).
+# Deltas can be served for any version from _change_log_floor on; older clients need a full snapshot.
+_seating_version = 0
+_change_log: Deque[Tuple[int, str, str]] = deque(maxlen=SEATING_CHANGE_LOG_SIZE)
+_change_log_floor = 0
+_change_lock = threading.Lock() # Held only to number and log a change, never while waiting on a zone
+# Shards (see seating_shard_service): zones per shard, and the last seating version that touched each,
+# so a shard's snapshot survives changes in other buildings
+_shard_zones: Dict[str, List[str]] = {}
+_shard_versions: Dict[str, int] = {}
+_arrangement_snapshots: Dict[Tuple[Optional[str], str], Tuple[int, bytes]] = {} # (shard or None, encoding) -> (version, serialized SeatingArrangement)
+_leaderboard = RankedLeaderboard() # Projection of the points ledger, kept in rank order
+_points_ledger = get_ledger() # Append-only Awe Points awards; the source of truth for points
+_synthetic_data: Optional[synthetic_data_service.SyntheticDataset] = None # Arrays behind the vectorized generator
+# Last reported lighting / HVAC state per zone; changes are pushed to stream subscribers
+_zone_lighting_state: Dict[str, Dict[str, Any]] = {}
+_zone_hvac_state: Dict[str, Dict[str, Any]] = {}
+# Latest reported laptop usage per employee and Dark Mode hours not yet converted to points
+_laptop_usage_reported: Dict[str, Dict[str, Any]] = {}
+_dark_mode_hours_pending: Dict[str, float] = {}
+# Called with a topic ("employees", "seating", "laptop_usage") whenever that part of the state changes
+_change_listeners: List[Callable[[str], None]] = []
+
+def add_change_listener(listener: Callable[[str], None]) -> None:
+    _change_listeners.append(listener)
+
+def remove_change_listener(listener: Callable[[str], None]) -> None:
+    if listener in _change_listeners:
+        _change_listeners.remove(listener)
+
+def _notify_changed(*topics: str) -> None:
+    for listener in _change_listeners:
+        for topic in topics:
+            listener(topic)
+
+def _rebuild_employee_index(overwrite_points: bool = False) -> None:
+    # The index holds references to the objects in _generated_employees, so in-place
+    # changes to points or seats are visible through it without extra bookkeeping.
+    # It only needs rebuilding when the list itself is replaced.
+    global _employees_by_id, _employee_ids_sorted
+    _employees_by_id = {emp.id: emp for emp in _generated_employees}
+    _employee_ids_sorted = sorted(_employees_by_id)
+    # Generated points are only opening balances: totals the ledger already holds
+    # (e.g. restored from disk) take precedence
+    totals = _points_ledger.set_opening_balances({emp.id: emp.awe_points for emp in _generated_employees}, overwrite=overwrite_points)
+    for emp in _generated_employees:
+        emp.awe_points = totals[emp.id]
+    _leaderboard.rebuild(totals)
 
 def _get_employee_by_id(emp_id: str) -> Optional[Employee]:
-    # This helper will search the current _generated_employees list
+    # O(1) lookup through the id index instead of scanning _generated_employees
+    return _employees_by_id.get(emp_id)
+
+def _record_zone_states(kind: str, current_states: Dict[str, Dict[str, Any]], new_states: List[Dict[str, Any]]) -> None:
+    # Remember the latest state of each zone and publish only the zones whose state changed
+    for state in new_states:
+        if current_states.get(state["zone_id"]) != state:
+            current_states[state["zone_id"]] = state
+            zone_state_broadcaster.publish({"type": kind, **state})
+
+def _zone_occupancy() -> Dict[str, int]:
+    # Occupied seat count per zone, read from the counters in O(zones) rather than scanning seats
+    return _zone_counters.occupied_by_zone()
+
+def _set_seat_state(zone_id: str, seat: Seat, status: SeatStatus, employee_id: Optional[str] = None) -> None:
+    # Single place that changes a seat after the layout is built, so the zone counters, the spatial
+    # index, the arrangement snapshot, the employee's current seat and change listeners all see the same update.
+    # Callers updating seats concurrently hold the zone's lock (see update_mock_seat).
+    if seat.employee_id and seat.employee_id != employee_id:
+        _assign_employee_seat(seat.employee_id, None)
+    _zone_counters.move(zone_id, seat.status, status)
+    seat.status = status
+    seat.employee_id = employee_id
+    _seat_index.update(zone_id, seat)
+    if employee_id is not None:
+        _assign_employee_seat(employee_id, seat.seat_id)
+    # Versioned last: a snapshot built while this update was in flight is stale as soon as it is stored
+    _zone_versions[zone_id] = _zone_versions.get(zone_id, 0) + 1
+    _log_seat_change(zone_id, seat.seat_id)
+    _notify_changed("seating")
+
+def _log_seat_change(zone_id: str, seat_id: str) -> None:
+    global _seating_version, _change_log_floor
+    with _change_lock:
+        _seating_version += 1
+        if len(_change_log) == _change_log.maxlen:
+            _change_log_floor = _change_log[0][0] # About to drop this entry
+        _change_log.append((_seating_version, zone_id, seat_id))
+        _shard_versions[shard_of(zone_id)] = _seating_version
+
+def _reset_change_log() -> None:
+    # A new layout: none of the logged seats mean anything any more
+    global _seating_version, _change_log_floor, _shard_versions
+    with _change_lock:
+        _seating_version += 1
+        _change_log.clear()
+        _change_log_floor = _seating_version
+        _shard_versions = dict.fromkeys(_shard_zones, _seating_version)
+
+@contextmanager
+def _all_zones_locked() -> Iterator[None]:
+    # No layout change or seat update is in flight while this is held
+    with _layout_lock, ExitStack() as held:
+        for zone_id in sorted(_zone_locks):
+            held.enter_context(_zone_locks[zone_id])
+        yield
+
+@contextmanager
+def _layout_change() -> Iterator[None]:
+    # Wrap any code that replaces _generated_zones_seats: waits for in-flight seat updates by
+    # holding every zone lock, then rebuilds the per-zone indexes and starts new locks and versions.
+    # Seats assigned inside are not notified one by one; listeners hear about the layout once, at the end.
+    global _seats_by_id, _zone_locks, _zone_versions, _layout_version, _shard_zones
+    with _all_zones_locked():
+        yield
+        shard_zones: Dict[str, List[str]] = {}
+        for zone_id in _generated_zones_seats:
+            shard_zones.setdefault(shard_of(zone_id), []).append(zone_id)
+        _shard_zones = shard_zones
+        _reset_change_log() # First, so the change feed never pairs the old log with the new seats
+        _zone_counters.rebuild(_generated_zones_seats)
+        _seat_index.rebuild(_generated_zones_seats)
+        _seats_by_id = {seat.seat_id: (zone_id, seat) for zone_id, seats in _generated_zones_seats.items() for seat in seats}
+        _zone_versions = dict.fromkeys(_generated_zones_seats, 0)
+        _zone_locks = {zone_id: threading.Lock() for zone_id in _generated_zones_seats}
+        _layout_version += 1 # Last: a reader that sees the new version also sees the new seats and locks
+    _notify_changed("employees", "seating")
+
+def _on_points_total(emp_id: str, total: int) -> None:
+    # Ledger listener: mirror the new total onto the employee and the ranked leaderboard (O(log n))
+    emp = _employees_by_id.get(emp_id)
+    if emp is not None:
+        emp.awe_points = total
+        _leaderboard.update(emp_id, total)
+        _notify_changed("employees")
+
+_points_ledger.add_listener(_on_points_total)
+
+def _simulate_laptop_usage_reports() -> None:
+    # Baseline usage shown until real reports arrive through the bulk ingestion endpoint.
+    # Reading usage never awards points; only applied usage events do.
+    _laptop_usage_reported.clear()
     for emp in _generated_employees:
-        if emp.id == emp_id:
-            return emp
-    return None
+        if emp.current_seat_id or random.random() < 0.6: # Higher chance if seated
+            _laptop_usage_reported[emp.id] = {
+                "employee_id": emp.id,
+                "hours_on": round(random.uniform(1.5, 8.5), 1),
+                "mode": random.choice(list(LaptopMode)).value,
+            }
+
+def _assign_employee_seat(emp_id: str, seat_id: Optional[str], notify: bool = True) -> None:
+    # Single place that keeps Employee.current_seat_id and _employee_seat_map in step.
+    # Layout builds pass notify=False: _layout_change notifies once for the whole layout.
+    emp = _employees_by_id.get(emp_id)
+    if emp is not None:
+        emp.current_seat_id = seat_id
+    if seat_id is None:
+        _employee_seat_map.pop(emp_id, None)
+    else:
+        _employee_seat_map[emp_id] = seat_id
+    if notify:
+        # After the write: a cache refilled on this notification must already see the new seat
+        _notify_changed("employees", "seating")
 
 # --- Enhanced Data Generation Functions ---
 
@@ -47,147 +243,354 @@ def get_mock_employees(refresh: bool = False) -> List[Employee]:
     # This prevents re-generating if already populated by module-level call
     if refresh or (not _generated_employees and not USE_DATABASE_SWITCH):
         print(f"DEBUG: data_generation_service: Generating {NUM_EMPLOYEES} mock employees...")
-        _generated_employees = [] # Clear before regenerating
-        for i in range(NUM_EMPLOYEES):
-            emp_id = f"emp{str(i+1).zfill(3)}"
-            awe_points = random.randint(50, 450) # More varied points
-            laptop_mode_for_points = random.choice(list(LaptopMode))
-            if laptop_mode_for_points == LaptopMode.DARK:
-                awe_points += random.randint(10, 50)
-
-            employee = Employee(
-                id=emp_id,
-                name=_random_name(),
-                department=_random_department(),
-                awe_points=min(awe_points, 500), # Cap points
-                current_seat_id=None
-            )
-            _generated_employees.append(employee)
+        if DATA_GENERATOR == "vectorized":
+            global _synthetic_data
+            _synthetic_data = synthetic_data_service.generate_dataset(_synthetic_config)
+            _generated_employees = synthetic_data_service.materialize_employees(_synthetic_data)
+        else:
+            _generated_employees = [] # Clear before regenerating
+            for i in range(NUM_EMPLOYEES):
+                emp_id = f"emp{str(i+1).zfill(3)}"
+                awe_points = random.randint(50, 450) # More varied points
+                laptop_mode_for_points = random.choice(list(LaptopMode))
+                if laptop_mode_for_points == LaptopMode.DARK:
+                    awe_points += random.randint(10, 50)
+
+                employee = Employee(
+                    id=emp_id,
+                    name=_random_name(),
+                    department=_random_department(),
+                    awe_points=min(awe_points, MAX_AWE_POINTS), # Cap points
+                    current_seat_id=None
+                )
+                _generated_employees.append(employee)
+        _rebuild_employee_index()
     return _generated_employees
 
-def get_mock_seating_arrangement_and_assign_employees(refresh: bool = False) -> Dict[str, Any]:
+def get_mock_employee_by_id(employee_id: str) -> Optional[Employee]:
+    if USE_DATABASE_SWITCH: return None
+
+    # Make sure the store (and therefore the index) is populated
+    get_mock_employees()
+    return _get_employee_by_id(employee_id)
+
+def get_mock_employees_page(cursor: Optional[str] = None, limit: int = 100) -> List[Employee]:
+    """Keyset page: up to `limit` employees ordered by id, starting after `cursor`."""
+    if USE_DATABASE_SWITCH: return []
+
+    get_mock_employees()
+    ids = _employee_ids_sorted
+    start = bisect_right(ids, cursor) if cursor is not None else 0
+    return [_employees_by_id[emp_id] for emp_id in ids[start:start + limit]]
+
+def iter_mock_employees(cursor: Optional[str] = None) -> Iterator[Employee]:
+    """Yield employees one at a time in id order, starting after `cursor`, without building a list."""
+    if USE_DATABASE_SWITCH: return
+
+    get_mock_employees()
+    ids = _employee_ids_sorted # Hold this snapshot even if the store is regenerated meanwhile
+    by_id = _employees_by_id
+    for position in range(bisect_right(ids, cursor) if cursor is not None else 0, len(ids)):
+        yield by_id[ids[position]]
+
+def _generate_seating_layout(current_employees: List[Employee]) -> Dict[str, Any]:
+    # Call inside _layout_change(), which indexes the new layout once it is in place
     global _generated_zones_seats, _employee_seat_map
+    print(f"DEBUG: data_generation_service: Generating seating arrangement (approx {NUM_ZONES*SEATS_PER_ZONE_ROWS*SEATS_PER_ZONE_COLS} seats)...")
+    # Release seats from the previous layout so no employee points at a seat that no longer exists
+    for emp_id in list(_employee_seat_map):
+        _assign_employee_seat(emp_id, None, notify=False)
+    _employee_seat_map = {}
+    _generated_zones_seats = {}
+
+    if DATA_GENERATOR == "vectorized":
+        return _seat_employees_from_synthetic_data()
+
+    all_seats_flat: List[Seat] = []
+    zones_detail = []
+
+    # Take a copy to pop from, so we don't modify the global _generated_employees list directly here
+    employees_to_seat = list(current_employees)
+    random.shuffle(employees_to_seat)
+
+    total_seats = 0
+    occupied_seats_count = 0
+
+    for i in range(NUM_ZONES):
+        zone_id = synthetic_data_service.zone_id_for(i, NUM_BUILDINGS) # Same ids as the vectorized generator
+        current_zone_seats = []
+        _generated_zones_seats[zone_id] = current_zone_seats
+
+        for r in range(SEATS_PER_ZONE_ROWS):
+            for c in range(SEATS_PER_ZONE_COLS):
+                seat_id = f"{zone_id}-R{r+1}C{c+1}"
+                status = SeatStatus.UNOCCUPIED
+                emp_id_on_seat = None
+
+                if employees_to_seat and random.random() < 0.7: # ~70% occupancy target
+                    try:
+                        emp_to_assign = employees_to_seat.pop()
+                        status = SeatStatus.OCCUPIED
+                        emp_id_on_seat = emp_to_assign.id
+
+                        # Update the authoritative employee record through the id index
+                        # This is important if get_mock_employees isn't called with refresh=True later
+                        # but other functions rely on current_seat_id being up-to-date
+                        _assign_employee_seat(emp_id_on_seat, seat_id, notify=False)
+                        occupied_seats_count += 1
+                    except IndexError:
+                        pass # No more employees to seat
+                elif random.random() < 0.05:
+                    status = random.choice([SeatStatus.RESERVED, SeatStatus.DISABLED])
+
+                current_zone_seats.append(Seat(seat_id=seat_id, status=status, employee_id=emp_id_on_seat, position=(r, c)))
+                all_seats_flat.append(current_zone_seats[-1])
+
+        zones_detail.append(SeatingZone(
+            zone_id=zone_id,
+            description=f"Area {synthetic_data_service.zone_id_for(i)[4:]} - {_random_department()} Department Focus",
+            grid_rows=SEATS_PER_ZONE_ROWS,
+            grid_cols=SEATS_PER_ZONE_COLS,
+            seats=current_zone_seats
+        ).model_dump()) # Use model_dump for Pydantic v2 if models require it
+        total_seats += SEATS_PER_ZONE_ROWS * SEATS_PER_ZONE_COLS
+
+    # This return structure is important for the SeatingArrangement model
+    return {
+        "zones": zones_detail,
+        "total_seats": total_seats,
+        "occupied_seats": occupied_seats_count,
+        "unoccupied_seats": total_seats - occupied_seats_count,
+    }
 
+
+def get_mock_seating_arrangement_and_assign_employees(refresh: bool = False) -> Dict[str, Any]:
     # Ensure employees are generated first if list is empty
     # Use the current _generated_employees list if populated by module call or previous direct call
     current_employees = get_mock_employees(refresh=refresh if not _generated_employees else False)
 
     # Regenerate seating if refresh is true or if it's empty
     if refresh or (not _generated_zones_seats and not USE_DATABASE_SWITCH):
-        print(f"DEBUG: data_generation_service: Generating seating arrangement (approx {NUM_ZONES*SEATS_PER_ZONE_ROWS*SEATS_PER_ZONE_COLS} seats)...")
-        _employee_seat_map = {}
-        _generated_zones_seats = {}
-
-        all_seats_flat: List[Seat] = []
-        zones_detail = []
-
-        # Take a copy to pop from, so we don't modify the global _generated_employees list directly here
-        employees_to_seat = list(current_employees)
-        random.shuffle(employees_to_seat)
-
-        total_seats = 0
-        occupied_seats_count = 0
-
-        for i in range(NUM_ZONES):
-            zone_id = f"Zone{chr(65+i)}"
-            current_zone_seats = []
-            _generated_zones_seats[zone_id] = current_zone_seats
-
-            for r in range(SEATS_PER_ZONE_ROWS):
-                for c in range(SEATS_PER_ZONE_COLS):
-                    seat_id = f"{zone_id}-R{r+1}C{c+1}"
-                    status = SeatStatus.UNOCCUPIED
-                    emp_id_on_seat = None
-
-                    if employees_to_seat and random.random() < 0.7: # ~70% occupancy target
-                        try:
-                            emp_to_assign = employees_to_seat.pop()
-                            status = SeatStatus.OCCUPIED
-                            emp_id_on_seat = emp_to_assign.id
-
-                            # Update the authoritative _generated_employees list
-                            # This is important if get_mock_employees isn't called with refresh=True later
-                            # but other functions rely on current_seat_id being up-to-date
-                            for emp_obj in _generated_employees:
-                                if emp_obj.id == emp_id_on_seat:
-                                    emp_obj.current_seat_id = seat_id
-                                    break
-                            _employee_seat_map[emp_id_on_seat] = seat_id
-                            occupied_seats_count += 1
-                        except IndexError:
-                            pass # No more employees to seat
-                    elif random.random() < 0.05:
-                        status = random.choice([SeatStatus.RESERVED, SeatStatus.DISABLED])
-
-                    current_zone_seats.append(Seat(seat_id=seat_id, status=status, employee_id=emp_id_on_seat))
-                    all_seats_flat.append(current_zone_seats[-1])
-
-            zones_detail.append(SeatingZone(
-                zone_id=zone_id,
-                description=f"Area {chr(65+i)} - {_random_department()} Department Focus",
-                grid_rows=SEATS_PER_ZONE_ROWS,
-                grid_cols=SEATS_PER_ZONE_COLS,
-                seats=current_zone_seats
-            ).model_dump()) # Use model_dump for Pydantic v2 if models require it
-            total_seats += SEATS_PER_ZONE_ROWS * SEATS_PER_ZONE_COLS
-
-        # This return structure is important for the SeatingArrangement model
-        return {
-            "zones": zones_detail,
-            "total_seats": total_seats,
-            "occupied_seats": occupied_seats_count,
-            "unoccupied_seats": total_seats - occupied_seats_count,
-        }
+        with _layout_change():
+            return _generate_seating_layout(current_employees)
     else: # Return existing generated data if not refreshing
-        # Reconstruct zones_detail from _generated_zones_seats for consistency
-        zones_detail_reconstructed = []
-        total_s = 0
-        occupied_s = 0
-        for zone_id, seats_list in _generated_zones_seats.items():
-            # Find original grid dimensions if stored, or infer, or use constants
-            # For simplicity, assume constants are reliable here if not storing full SeatingZone objects globally
-            zones_detail_reconstructed.append(SeatingZone(
-                zone_id=zone_id,
-                description=f"Area {zone_id[-1]} - Previously Generated", # Placeholder description
-                grid_rows=SEATS_PER_ZONE_ROWS, # Assuming constant for this zone
-                grid_cols=SEATS_PER_ZONE_COLS, # Assuming constant for this zone
-                seats=seats_list
-            ).model_dump())
-            total_s += len(seats_list)
-            occupied_s += sum(1 for s in seats_list if s.status == SeatStatus.OCCUPIED)
-
-        return {
-            "zones": zones_detail_reconstructed,
-            "total_seats": total_s,
-            "occupied_seats": occupied_s,
-            "unoccupied_seats": total_s - occupied_s,
-        }
+        return _zones_arrangement(list(_generated_zones_seats))
+
+def _zones_arrangement(zone_ids: List[str]) -> Dict[str, Any]:
+    # Reconstruct zones_detail from _generated_zones_seats for consistency
+    zones_detail_reconstructed = []
+    for zone_id in zone_ids:
+        # Find original grid dimensions if stored, or infer, or use constants
+        # For simplicity, assume constants are reliable here if not storing full SeatingZone objects globally
+        zones_detail_reconstructed.append(SeatingZone(
+            zone_id=zone_id,
+            description=f"Area {zone_id[-1]} - Previously Generated", # Placeholder description
+            grid_rows=SEATS_PER_ZONE_ROWS, # Assuming constant for this zone
+            grid_cols=SEATS_PER_ZONE_COLS, # Assuming constant for this zone
+            seats=_generated_zones_seats[zone_id],
+            version=_zone_versions.get(zone_id)
+        ).model_dump())
+
+    # Totals come from the zone counters, not from counting the seats again
+    total_s, occupied_s = _seat_totals(zone_ids)
+    return {
+        "zones": zones_detail_reconstructed,
+        "total_seats": total_s,
+        "occupied_seats": occupied_s,
+        "unoccupied_seats": total_s - occupied_s,
+    }
+
+def _seat_totals(zone_ids: List[str]) -> Tuple[int, int]:
+    # (all seats, occupied seats) over the given zones, from the counters in O(zones)
+    total = occupied = 0
+    for zone_id in zone_ids:
+        counts = _zone_counters.counts(zone_id) or {}
+        total += sum(counts.values())
+        occupied += counts.get(SeatStatus.OCCUPIED, 0)
+    return total, occupied
+
+
+def get_mock_seating_arrangement_snapshot(encoding: str = seating_binary_codec.ENCODING_JSON,
+                                          shard: Optional[str] = None) -> Optional[Tuple[int, bytes]]:
+    """
+    The current arrangement (of the whole campus, or of one shard) as (seating version, bytes),
+    as JSON or in the compact binary encoding (see seating_binary_codec). Each is built once
+    per version; a shard's snapshot is kept until a seat in that shard changes.
+    None for an unknown shard.
+    """
+    if not _generated_zones_seats: get_mock_seating_arrangement_and_assign_employees()
+    if shard is not None and shard not in _shard_zones:
+        return None
+    # Read before building: an update landing meanwhile bumps the version, so this snapshot is never reused
+    version = _seating_version if shard is None else _shard_versions[shard]
+    snapshot = _arrangement_snapshots.get((shard, encoding))
+    if snapshot is None or snapshot[0] != version:
+        if shard is None:
+            arrangement = get_mock_seating_arrangement_and_assign_employees()
+        else:
+            arrangement = _zones_arrangement(_shard_zones[shard])
+        if encoding == seating_binary_codec.ENCODING_BINARY:
+            body = seating_binary_codec.encode_arrangement({**arrangement, "version": version})
+        else:
+            body = SeatingArrangement(**arrangement, version=version).model_dump_json().encode()
+        snapshot = _arrangement_snapshots[(shard, encoding)] = (version, body)
+    return snapshot
+
+def get_mock_seating_changes(since: int, shard: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Seats changed after seating version `since` (only in `shard`, if given), each once in
+    its current state, and the version to ask from next time. If `since` is older than the change log (or from an
+    earlier layout), only `full_snapshot_required` is set and the client should refetch
+    the arrangement. Costs O(changes since `since`), not O(seats).
+    """
+    if not _generated_zones_seats: get_mock_seating_arrangement_and_assign_employees()
+    with _change_lock:
+        version = _seating_version
+        if since < _change_log_floor or since > version:
+            return {"version": version, "full_snapshot_required": True, "changes": []}
+        changed: Dict[str, str] = {}
+        for logged_version, zone_id, seat_id in reversed(_change_log):
+            if logged_version <= since:
+                break
+            if shard is None or shard_of(zone_id) == shard:
+                changed[seat_id] = zone_id
+        seats_by_id, zone_locks = _seats_by_id, _zone_locks # The layout the logged seats belong to
+    # Seats are read after `version`, so they may already include later changes; those are
+    # sent again on the next call, which is harmless since each entry is a seat's full state.
+    # Copies are taken under the zone lock so no half-applied move is reported.
+    by_zone: Dict[str, List[str]] = {}
+    for seat_id, zone_id in changed.items():
+        by_zone.setdefault(zone_id, []).append(seat_id)
+    changes = []
+    for zone_id, seat_ids in by_zone.items():
+        with zone_locks[zone_id]:
+            changes.extend({"zone_id": zone_id, "seat": seats_by_id[seat_id][1].model_copy()} for seat_id in seat_ids)
+    return {"version": version, "full_snapshot_required": False, "changes": changes}
+
+def get_mock_nearest_free_seats(zone_id: str, row: int, col: int, k: int = 5) -> Optional[List[Seat]]:
+    # Answered from the spatial index in O((k + rows visited) log seats), without scanning the zone
+    if not _generated_zones_seats: get_mock_seating_arrangement_and_assign_employees()
+    if zone_id not in _seat_index:
+        return None
+    return [seat.model_copy() for seat in _seat_index.nearest_free(zone_id, (row, col), k)]
+
+def get_mock_largest_free_block(zone_id: str) -> Optional[List[Seat]]:
+    if not _generated_zones_seats: get_mock_seating_arrangement_and_assign_employees()
+    if zone_id not in _seat_index:
+        return None
+    return [seat.model_copy() for seat in _seat_index.largest_free_block(zone_id)]
+
+class SeatConflictError(Exception):
+    """A seat update lost a race: the zone moved past the expected version, or the seat was taken."""
+
+def update_mock_seat(seat_id: str, status: SeatStatus, employee_id: Optional[str] = None,
+                     expected_zone_version: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """
+    Set a seat's status, seating `employee_id` there when occupied (and releasing their
+    previous seat). Only the employee and the zones involved are locked, zones always in sorted
+    order, so updates in different zones run in parallel and a move between two zones cannot deadlock.
+    Returns None for an unknown seat or employee; raises SeatConflictError on a lost race.
+    """
+    if (status == SeatStatus.OCCUPIED) != (employee_id is not None):
+        raise ValueError("employee_id is required for occupied seats and not allowed otherwise")
+    if not _generated_zones_seats: get_mock_seating_arrangement_and_assign_employees()
+    if employee_id is not None and _get_employee_by_id(employee_id) is None:
+        return None
+
+    with _employee_locks.setdefault(employee_id, threading.Lock()) if employee_id is not None else nullcontext():
+        return _update_mock_seat_locked(seat_id, status, employee_id, expected_zone_version)
+
+def _update_mock_seat_locked(seat_id: str, status: SeatStatus, employee_id: Optional[str],
+                             expected_zone_version: Optional[int]) -> Optional[Dict[str, Any]]:
+    # update_mock_seat once the employee (if any) is locked
+    while True:
+        # Read the version first: seats and locks read after it belong to that layout or a newer one,
+        # and a newer one is caught below (a lock missing from the pair, or the version re-check)
+        layout = _layout_version
+        seats_by_id, zone_locks = _seats_by_id, _zone_locks
+        located = seats_by_id.get(seat_id)
+        if located is None:
+            if layout != _layout_version:
+                continue
+            return None
+        zone_id, seat = located
+        old_seat_id = _employee_seat_map.get(employee_id) if employee_id is not None else None
+        old = seats_by_id.get(old_seat_id) if old_seat_id not in (None, seat_id) else None
+        zones = sorted({zone_id, old[0]} if old else {zone_id})
+        locks = [zone_locks.get(zone) for zone in zones]
+        if None in locks:
+            continue # Seats of a new layout paired with the old locks: the swap is still in progress
+        with ExitStack() as held:
+            for lock in locks:
+                held.enter_context(lock)
+            # Re-check under the locks: the layout may have been replaced, or the employee moved, while we waited
+            if layout != _layout_version or (employee_id is not None and _employee_seat_map.get(employee_id) != old_seat_id):
+                continue
+            if expected_zone_version is not None and _zone_versions[zone_id] != expected_zone_version:
+                raise SeatConflictError(f"Zone {zone_id} is at version {_zone_versions[zone_id]}, not {expected_zone_version}")
+            if employee_id is not None and seat.employee_id not in (None, employee_id):
+                raise SeatConflictError(f"Seat {seat_id} is occupied by another employee")
+            if old:
+                _set_seat_state(old[0], old[1], SeatStatus.UNOCCUPIED)
+            _set_seat_state(zone_id, seat, status, employee_id)
+            return {
+                "zone_id": zone_id,
+                "zone_version": _zone_versions[zone_id],
+                "seat": seat.model_copy(),
+                "vacated_seat_id": old[1].seat_id if old else None,
+            }
 
+def _seat_employees_from_synthetic_data() -> Dict[str, Any]:
+    # Vectorized mode: seats and assignments come from the same seeded arrays as the employees
+    global _generated_zones_seats, _synthetic_data
+    if _synthetic_data is None:
+        _synthetic_data = synthetic_data_service.generate_dataset(_synthetic_config)
+    zones, employee_seats, descriptions = synthetic_data_service.materialize_zones(_synthetic_data, NUM_BUILDINGS)
+    _generated_zones_seats = zones
+    for emp_id, seat_id in employee_seats.items():
+        _assign_employee_seat(emp_id, seat_id, notify=False)
+
+    total_seats = len(_synthetic_data.seat_status)
+    return {
+        "zones": [SeatingZone(zone_id=zone_id, description=descriptions[zone_id], grid_rows=SEATS_PER_ZONE_ROWS,
+                              grid_cols=SEATS_PER_ZONE_COLS, seats=seats).model_dump() for zone_id, seats in zones.items()],
+        "total_seats": total_seats,
+        "occupied_seats": len(employee_seats),
+        "unoccupied_seats": total_seats - len(employee_seats),
+    }
 
 def get_mock_laptop_usage() -> List[Dict[str, Any]]:
     if USE_DATABASE_SWITCH: return []
 
-    employees_for_laptop_usage = get_mock_employees() # Get current employee list
-    laptop_usage_data = []
-    for emp in employees_for_laptop_usage:
-        if emp.current_seat_id or random.random() < 0.6: # Higher chance if seated
-            mode = random.choice(list(LaptopMode))
-            hours = round(random.uniform(1.5, 8.5), 1)
-
-            # Simulate Awe points update based on laptop mode (more consistently)
-            # This change should be reflected if get_mock_employees() is called afterwards by leaderboard
-            original_points = emp.awe_points
-            if mode == LaptopMode.DARK:
-                emp.awe_points = min(emp.awe_points + random.randint(2,5), 500)
-
-            laptop_usage_data.append({
-                "employee_id": emp.id,
-                "hours_on": hours,
-                "mode": mode.value,
-            })
-    return laptop_usage_data
-
-def get_mock_lighting_status() -> List[Dict[str, Any]]:
+    # Latest reported usage per employee. Side-effect free: points are awarded when
+    # usage is applied (apply_laptop_usage_events), not when it is read.
+    return list(_laptop_usage_reported.values())
+
+def apply_laptop_usage_events(events: List[LaptopUsageEvent]) -> int:
+    """
+    Apply reported laptop usage (from the bulk ingestion consumer) to in-memory state:
+    latest usage per employee, Awe Points for Dark Mode hours and today's energy counters.
+    Returns the number of events applied; events for unknown employees are ignored.
+    """
+    applied = 0
+    for event in events:
+        emp = _employees_by_id.get(event.employee_id)
+        if emp is None:
+            continue
+        _laptop_usage_reported[emp.id] = {"employee_id": emp.id, "hours_on": event.hours_on, "mode": event.mode.value}
+        if event.mode == LaptopMode.DARK:
+            pending = _dark_mode_hours_pending.get(emp.id, 0.0) + event.hours_on
+            earned = int(pending // DARK_MODE_HOURS_PER_POINT)
+            _dark_mode_hours_pending[emp.id] = pending - earned * DARK_MODE_HOURS_PER_POINT
+            if earned:
+                _points_ledger.award(emp.id, earned, REASON_DARK_MODE_USAGE, timestamp=event.timestamp, cap=MAX_AWE_POINTS)
+        energy_summary_service.record_laptop_usage(event.hours_on, event.mode, event.timestamp.date() if event.timestamp else None)
+        applied += 1
+    if applied:
+        _notify_changed("laptop_usage")
+    return applied
+
+def get_mock_lighting_status(occupied_by_zone: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
     if USE_DATABASE_SWITCH: return []
 
     lighting_data = []
@@ -195,54 +598,77 @@ def get_mock_lighting_status() -> List[Dict[str, Any]]:
     # Call get_mock_seating_arrangement if it's not populated.
     if not _generated_zones_seats:
         get_mock_seating_arrangement_and_assign_employees() # This will use/generate employees too
+    if occupied_by_zone is None:
+        occupied_by_zone = _zone_occupancy()
 
-    for zone_id_key, seats_in_zone_list in _generated_zones_seats.items():
-        is_zone_occupied = any(seat.status == SeatStatus.OCCUPIED for seat in seats_in_zone_list)
-        status = LightState.OFF
-        if is_zone_occupied and random.random() < 0.9:
-            status = LightState.ON
-        elif not is_zone_occupied and random.random() < 0.1:
-             status = LightState.ON
-
-        lighting_data.append({
-            "zone_id": zone_id_key,
-            "status": status.value,
-        })
+    for zone_id_key in _generated_zones_seats:
+        lighting_data.append(lighting_state_for_zone(zone_id_key, occupied_by_zone.get(zone_id_key, 0)))
+    _record_zone_states("lighting", _zone_lighting_state, lighting_data)
     return lighting_data
 
-def get_mock_hvac_status() -> List[Dict[str, Any]]:
+def get_mock_hvac_status(occupied_by_zone: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
     if USE_DATABASE_SWITCH: return []
 
     hvac_data = []
     if not _generated_zones_seats:
         get_mock_seating_arrangement_and_assign_employees()
+    if occupied_by_zone is None:
+        occupied_by_zone = _zone_occupancy()
 
-    for zone_id_key, seats_in_zone_list in _generated_zones_seats.items():
-        is_zone_occupied = any(seat.status == SeatStatus.OCCUPIED for seat in seats_in_zone_list)
-        status = HvacStatus.OFF
-        current_temp = round(random.uniform(24.0, 28.0),1)
-        set_point = None
-
-        if is_zone_occupied and random.random() < 0.8:
-            status = random.choice([HvacStatus.ON, HvacStatus.ECO])
-            current_temp = round(random.uniform(20.5, 23.0), 1)
-            set_point = round(random.uniform(21.5, 23.5), 1)
-            if status == HvacStatus.ECO:
-                 set_point = round(random.uniform(22.5, 24.0), 1)
-                 current_temp = round(random.uniform(21.5, 23.5), 1)
-        elif not is_zone_occupied and random.random() < 0.05:
-            status = HvacStatus.ON # e.g. server room in this zone
-            current_temp = round(random.uniform(18.0, 22.0), 1)
-            set_point = round(random.uniform(20.0, 22.0), 1)
-
-        hvac_data.append({
-            "zone_id": zone_id_key,
-            "status": status.value,
-            "current_temp_celsius": current_temp,
-            "set_point_celsius": set_point,
-        })
+    for zone_id_key in _generated_zones_seats:
+        hvac_data.append(hvac_state_for_zone(zone_id_key, occupied_by_zone.get(zone_id_key, 0)))
+    _record_zone_states("hvac", _zone_hvac_state, hvac_data)
     return hvac_data
 
+def lighting_state_for_zone(zone_id: str, occupied: int) -> Dict[str, Any]:
+    # Simulated lighting reading for one zone; shared by mock and database modes
+    is_zone_occupied = occupied > 0
+    status = LightState.OFF
+    if is_zone_occupied and random.random() < 0.9:
+        status = LightState.ON
+    elif not is_zone_occupied and random.random() < 0.1:
+         status = LightState.ON
+    return {"zone_id": zone_id, "status": status.value}
+
+def hvac_state_for_zone(zone_id: str, occupied: int) -> Dict[str, Any]:
+    # Simulated HVAC reading for one zone; shared by mock and database modes
+    is_zone_occupied = occupied > 0
+    status = HvacStatus.OFF
+    current_temp = round(random.uniform(24.0, 28.0),1)
+    set_point = None
+
+    if is_zone_occupied and random.random() < 0.8:
+        status = random.choice([HvacStatus.ON, HvacStatus.ECO])
+        current_temp = round(random.uniform(20.5, 23.0), 1)
+        set_point = round(random.uniform(21.5, 23.5), 1)
+        if status == HvacStatus.ECO:
+             set_point = round(random.uniform(22.5, 24.0), 1)
+             current_temp = round(random.uniform(21.5, 23.5), 1)
+    elif not is_zone_occupied and random.random() < 0.05:
+        status = HvacStatus.ON # e.g. server room in this zone
+        current_temp = round(random.uniform(18.0, 22.0), 1)
+        set_point = round(random.uniform(20.0, 22.0), 1)
+
+    return {
+        "zone_id": zone_id,
+        "status": status.value,
+        "current_temp_celsius": current_temp,
+        "set_point_celsius": set_point,
+    }
+
+def get_mock_zone_state_snapshot() -> Dict[str, List[Dict[str, Any]]]:
+    # Full lighting/HVAC state as last reported, sent to stream subscribers on connect
+    if USE_DATABASE_SWITCH: return {"lighting": [], "hvac": []}
+
+    if not _zone_lighting_state: get_mock_lighting_status()
+    if not _zone_hvac_state: get_mock_hvac_status()
+    return {"lighting": list(_zone_lighting_state.values()), "hvac": list(_zone_hvac_state.values())}
+
+def refresh_mock_zone_states() -> None:
+    # Mock "sensor tick": re-sample lighting and HVAC, which publishes any zone changes
+    get_mock_lighting_status()
+    get_mock_hvac_status()
+
 def get_mock_projector_usage() -> List[ProjectorUsage]:
     if USE_DATABASE_SWITCH: return []
     projector_data = []
@@ -260,83 +686,222 @@ def get_mock_projector_usage() -> List[ProjectorUsage]:
         ))
     return projector_data
 
-def get_mock_leaderboard() -> List[Dict[str, Any]]:
+def _leaderboard_entry(rank: int, emp_id: str, points: int) -> Dict[str, Any]:
+    emp = _employees_by_id[emp_id]
+    return {
+        "rank": rank,
+        "employee_id": emp_id,
+        "name": emp.name,
+        "awe_points": points,
+        "department": emp.department
+    }
+
+def get_mock_leaderboard(limit: Optional[int] = None) -> List[Dict[str, Any]]:
     if USE_DATABASE_SWITCH: return []
 
-    # Use the current state of _generated_employees which might have updated points
-    # from other calls like get_mock_laptop_usage
-    employees_for_leaderboard = get_mock_employees() # This will return existing if not refresh
-
-    sorted_employees = sorted(employees_for_leaderboard, key=lambda emp: emp.awe_points, reverse=True)
-
-    leaderboard_entries = []
-    for i, emp in enumerate(sorted_employees):
-        leaderboard_entries.append({
-            "rank": i + 1,
-            "employee_id": emp.id,
-            "name": emp.name,
-            "awe_points": emp.awe_points,
-            "department": emp.department
-        })
-    return leaderboard_entries
-
-def get_mock_seating_suggestions() -> Dict[str, Any]:
+    # Make sure employees (and the ranked index built from them) exist
+    get_mock_employees()
+
+    # The ranked index is updated whenever points change, so reading the top N
+    # only walks N entries instead of sorting every employee on each call
+    return [_leaderboard_entry(rank, emp_id, points) for rank, emp_id, points in _leaderboard.top(limit)]
+
+def get_mock_employee_rank(employee_id: str, window: int = 5) -> Optional[Dict[str, Any]]:
+    if USE_DATABASE_SWITCH: return None
+
+    get_mock_employees()
+    rank = _leaderboard.rank_of(employee_id)
+    if rank is None:
+        return None
+
+    # One O(log n) descent to the first entry of the window, then a walk of 2*window+1 entries
+    first_rank = max(1, rank - window)
+    entries = [_leaderboard_entry(r, emp_id, points) for r, emp_id, points in _leaderboard.iter_from(first_rank, rank - first_rank + window + 1)]
+    own_index = rank - first_rank
+    return {
+        "employee_id": employee_id,
+        "rank": rank,
+        "awe_points": entries[own_index]["awe_points"],
+        "total_ranked": len(_leaderboard),
+        "above": entries[:own_index],
+        "below": entries[own_index + 1:],
+    }
+
+def get_mock_points_history(employee_id: str, limit: int = 50) -> Optional[List[Dict[str, Any]]]:
+    if USE_DATABASE_SWITCH: return None
+
+    get_mock_employees()
+    if employee_id not in _employees_by_id:
+        return None
+    return [event.model_dump() for event in _points_ledger.history(employee_id, limit)]
+
+def get_mock_seating_suggestions(objective: str = seating_optimizer_service.OBJECTIVE_ZONES, group_by_department: bool = False,
+                                 time_budget_ms: Optional[int] = None, shard: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Consolidation moves for one shard, or for every shard (moves never cross shards). Each
+    shard is planned on its own worker (see seating_shard_service) from a copy of its seats,
+    so a long run in one building neither blocks other buildings' plans nor any reads.
+    None for an unknown shard.
+    """
     # This function uses _get_employee_by_id and _generated_zones_seats,
     # so ensure they are populated by calling respective getters if empty.
     if USE_DATABASE_SWITCH: return {"message": "DB suggestions not ready.", "suggested_moves": []}
 
     if not _generated_employees: get_mock_employees(refresh=True)
     if not _generated_zones_seats: get_mock_seating_arrangement_and_assign_employees(refresh=True) # This will also call get_mock_employees
-
-    zone_occupancy = {}
-    for zone_id, seats_list in _generated_zones_seats.items():
-        occupied_count = sum(1 for seat in seats_list if seat.status == SeatStatus.OCCUPIED)
-        total_zone_seats = len(seats_list)
-        if total_zone_seats > 0:
-            zone_occupancy[zone_id] = {
-                "occupied": occupied_count, "total": total_zone_seats,
-                "density": occupied_count / total_zone_seats, "seats": seats_list
-            }
-
-    if not zone_occupancy: return {"message": "No zones for suggestions.", "suggested_moves": []}
-    sorted_zones = sorted(zone_occupancy.items(), key=lambda item: item[1]["density"])
-    source_candidates = [z for z in sorted_zones if z[1]["occupied"] > 0 and z[1]["density"] < 0.6]
-    target_candidates = [z for z in sorted_zones if z[1]["density"] < 0.9 and (z[1]["total"] - z[1]["occupied"]) > 0]
-
-    if not source_candidates or not target_candidates:
-        return {"message": "No suitable consolidation moves found.", "suggested_moves": []}
-
-    source_zone_id, source_data = source_candidates[0]
-    employee_to_move: Optional[Employee] = None
-    current_seat_obj: Optional[Seat] = None
-    for seat in source_data["seats"]:
-        if seat.employee_id:
-            emp = _get_employee_by_id(seat.employee_id)
-            if emp: employee_to_move, current_seat_obj = emp, seat; break
-
-    if not employee_to_move or not current_seat_obj:
-        return {"message": "Could not identify employee to move.", "suggested_moves": []}
-
-    new_seat_id_suggestion: Optional[str] = None
-    target_zone_id_for_move: Optional[str] = None
-    for tz_id, tz_data in reversed(target_candidates): # Prefer denser target zones
-        if tz_id == source_zone_id: continue
-        for seat in tz_data["seats"]:
-            if seat.status == SeatStatus.UNOCCUPIED:
-                new_seat_id_suggestion, target_zone_id_for_move = seat.seat_id, tz_id; break
-        if new_seat_id_suggestion: break
-
-    if employee_to_move and new_seat_id_suggestion and current_seat_obj.seat_id != new_seat_id_suggestion:
-        vacated_ac, vacated_lights = [], []
-        if source_data["occupied"] == 1: # Last person in zone
-            vacated_ac.append(source_zone_id); vacated_lights.append(source_zone_id)
+    if shard is not None and shard not in _shard_zones:
+        return None
+
+    time_budget_seconds = time_budget_ms / 1000 if time_budget_ms is not None else None
+    baselines = zone_energy_baseline_service.get_baselines()
+    jobs, seen, zone_kwh = [], {}, {}
+    for name in ([shard] if shard is not None else sorted(_shard_zones)):
+        zones_seats, departments = _shard_job_input(_shard_zones[name], group_by_department)
+        seen.update(zones_seats)
+        shard_kwh = baselines.zone_kwh(zones_seats)
+        zone_kwh.update(shard_kwh)
+        jobs.append(shard_workers.submit(name, seating_optimizer_service.plan_shard, zones_seats, objective, shard_kwh or None,
+                                         departments, time_budget_seconds))
+    plan = seating_optimizer_service.merge_plans([job.result() for job in jobs])
+    # Savings are simulated on the same copy of the seats the plans were made from
+    simulator = EnergySimulator.from_seats({zone_id: ((seat_id, emp_id) for seat_id, _, emp_id, _ in rows) for zone_id, rows in seen.items()})
+    return _suggestion_from_plan(plan, simulator, zone_kwh)
+
+def _shard_job_input(zone_ids: List[str], group_by_department: bool):
+    # Plain tuples copied under each zone's lock: the worker gets a consistent, picklable view
+    zones_seats: Dict[str, List[Tuple[str, SeatStatus, Optional[str], Optional[Tuple[int, int]]]]] = {}
+    for zone_id in zone_ids:
+        with _zone_locks[zone_id]:
+            zones_seats[zone_id] = [(seat.seat_id, seat.status, seat.employee_id, seat.position) for seat in _generated_zones_seats[zone_id]]
+    departments = None
+    if group_by_department:
+        departments = {}
+        for rows in zones_seats.values():
+            for _, _, emp_id, _ in rows:
+                employee = _get_employee_by_id(emp_id) if emp_id else None
+                if employee is not None:
+                    departments[emp_id] = employee.department
+    return zones_seats, departments
+
+def simulate_mock_seat_moves(plans: List[List[Tuple[str, str]]]) -> List[Dict[str, Any]]:
+    """
+    Projected zone kWh for a day with the current seating and with each plan of
+    (employee id, new seat id) moves applied. Raises ValueError for an unknown seat.
+    """
+    if not _generated_zones_seats: get_mock_seating_arrangement_and_assign_employees()
+    zones_seats = {}
+    for zone_id in list(_generated_zones_seats):
+        with _zone_locks[zone_id]:
+            zones_seats[zone_id] = [(seat.seat_id, seat.employee_id) for seat in _generated_zones_seats[zone_id]]
+    return [vars(result) for result in EnergySimulator.from_seats(zones_seats).simulate(plans)]
+
+def get_mock_campus_occupancy() -> Dict[str, Any]:
+    """Seat totals per shard from the zone counters, and campus totals merged from those."""
+    if not _generated_zones_seats: get_mock_seating_arrangement_and_assign_employees()
+    shards = []
+    for name in sorted(_shard_zones):
+        total, occupied = _seat_totals(_shard_zones[name])
+        shards.append({"shard": name, "zones": len(_shard_zones[name]), "total_seats": total,
+                       "occupied_seats": occupied, "unoccupied_seats": total - occupied})
+    return merge_shard_occupancy(shards)
+
+def consolidation_suggestion(zones_seats: Dict[str, List[Seat]], zone_counts: Optional[Dict[str, Tuple[int, int]]] = None,
+                             objective: str = seating_optimizer_service.OBJECTIVE_ZONES,
+                             department_of: Optional[Callable[[str], Optional[str]]] = None,
+                             time_budget_ms: Optional[int] = None,
+                             seat_index: Optional[SeatSpatialIndex] = None) -> Dict[str, Any]:
+    # Full set of moves that empties the most zones (or saves the most energy); shared by mock and database modes
+    if not zones_seats: return {"message": "No zones for suggestions.", "suggested_moves": []}
+
+    zone_kwh = zone_energy_baseline_service.get_baselines().zone_kwh(zones_seats)
+    plan = seating_optimizer_service.plan_consolidation(
+        zones_seats, zone_counts, objective=objective, zone_kwh=zone_kwh or None, department_of=department_of,
+        time_budget_seconds=time_budget_ms / 1000 if time_budget_ms is not None else None, seat_index=seat_index,
+    )
+    simulator = EnergySimulator.from_seats({zone_id: ((seat.seat_id, seat.employee_id) for seat in seats) for zone_id, seats in zones_seats.items()})
+    return _suggestion_from_plan(plan, simulator, zone_kwh)
+
+def _estimated_saving_kwh(plan: seating_optimizer_service.ConsolidationPlan, simulator: Optional[EnergySimulator],
+                          zone_kwh: Dict[str, float]) -> float:
+    # Zones with sensor history count their measured baseline (saved when vacated, spent when opened);
+    # the rest count the simulator's projection, or the optimizer's flat estimate without a simulator
+    if simulator is None:
+        return plan.energy_saving_kwh
+    saving = sum(zone_kwh[zone_id] for zone_id in plan.vacated_zones if zone_id in zone_kwh)
+    saving -= sum(zone_kwh[zone_id] for zone_id in plan.opened_zones if zone_id in zone_kwh)
+    saving += sum(kwh for zone_id, kwh in simulator.zone_saving_kwh(plan.moves).items() if zone_id not in zone_kwh)
+    return round(saving, 2)
+
+def _suggestion_from_plan(plan: seating_optimizer_service.ConsolidationPlan, simulator: Optional[EnergySimulator] = None,
+                          zone_kwh: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    if not plan.moves:
+        return {"message": "Office layout reasonably optimized.", "suggested_moves": []}
+
+    message = f"Move {len(plan.moves)} employee(s) to vacate {len(plan.vacated_zones)} zone(s): {', '.join(plan.vacated_zones)}."
+    if plan.opened_zones:
+        message += f" Employees move into currently empty {', '.join(plan.opened_zones)}."
+    if not plan.optimal:
+        message += " Best plan found within the time budget."
+    return {
+        "message": message,
+        "suggested_moves": plan.moves,
+        "estimated_energy_saving_kwh": _estimated_saving_kwh(plan, simulator, zone_kwh or {}),
+        "vacated_zones_lights_off": plan.vacated_zones, "vacated_zones_ac_off": plan.vacated_zones
+    }
+
+DASHBOARD_SECTIONS = ("leaderboard", "laptop_usage", "lighting", "hvac", "arrangement", "suggestions")
+
+def get_mock_dashboard(sections: Optional[List[str]] = None, leaderboard_limit: int = 10) -> Dict[str, Any]:
+    """
+    All dashboard widgets in one call. Lighting and HVAC share one read of the
+    per-zone occupancy counters, so they agree with each other.
+    Sections not requested are returned as None.
+    """
+    if USE_DATABASE_SWITCH: return {}
+
+    wanted = set(sections or DASHBOARD_SECTIONS)
+    # Only generates on first use; the arrangement it returns then doubles as the "arrangement" section
+    arrangement = get_mock_seating_arrangement_and_assign_employees() if not _generated_zones_seats else None
+    occupied_by_zone = _zone_occupancy() if wanted & {"lighting", "hvac"} else {}
+
+    builders = {
+        "leaderboard": lambda: get_mock_leaderboard(limit=leaderboard_limit),
+        "laptop_usage": get_mock_laptop_usage,
+        "lighting": lambda: get_mock_lighting_status(occupied_by_zone),
+        "hvac": lambda: get_mock_hvac_status(occupied_by_zone),
+        "arrangement": lambda: arrangement or get_mock_seating_arrangement_and_assign_employees(),
+        "suggestions": get_mock_seating_suggestions,
+    }
+    return {section: (builders[section]() if section in wanted else None) for section in DASHBOARD_SECTIONS}
+
+def export_mock_state() -> Dict[str, Any]:
+    """
+    Employees, seats and reported laptop usage as plain JSON-ready data (see load_mock_state).
+    Taken with every zone locked, so it never holds half of a seat move or of a layout load.
+    Must not be called from a change listener: the notifying writer may hold zone locks.
+    """
+    with _all_zones_locked():
         return {
-            "message": f"Consider moving {employee_to_move.name} from {current_seat_obj.seat_id} (in {source_zone_id}) to {new_seat_id_suggestion} (in {target_zone_id_for_move}) for energy efficiency.",
-            "suggested_moves": [(employee_to_move.id, new_seat_id_suggestion)],
-            "estimated_energy_saving_kwh": round(random.uniform(0.7, 2.8), 2),
-            "vacated_zones_lights_off": vacated_lights, "vacated_zones_ac_off": vacated_ac
+            "employees": [emp.model_dump() for emp in _generated_employees],
+            "zones": {zone_id: [seat.model_dump(mode="json") for seat in seats] for zone_id, seats in _generated_zones_seats.items()},
+            "laptop_usage": list(_laptop_usage_reported.values()),
         }
-    return {"message": "Office layout reasonably optimized.", "suggested_moves": []}
+
+def load_mock_state(state: Dict[str, Any]) -> None:
+    """Replace the in-memory employees, seats and reported usage with a previously exported state."""
+    global _generated_employees, _generated_zones_seats, _employee_seat_map
+    _generated_employees = [Employee(**emp) for emp in state["employees"]]
+    _rebuild_employee_index(overwrite_points=True)
+    with _layout_change():
+        _employee_seat_map = {}
+        _generated_zones_seats = {zone_id: [Seat(**seat) for seat in seats] for zone_id, seats in state["zones"].items()}
+        for seats in _generated_zones_seats.values():
+            for seat in seats:
+                if seat.employee_id:
+                    _assign_employee_seat(seat.employee_id, seat.seat_id, notify=False)
+    _laptop_usage_reported.clear()
+    _laptop_usage_reported.update({usage["employee_id"]: usage for usage in state.get("laptop_usage", [])})
+    _notify_changed("employees", "seating", "laptop_usage")
 
 # --- Re-enable initial data population calls at module level, with prints ---
 _initial_refresh = True
@@ -345,6 +910,9 @@ if not USE_DATABASE_SWITCH:
     get_mock_employees(refresh=_initial_refresh)
     print("DEBUG: data_generation_service: Module level populating seating (enhanced)...")
     get_mock_seating_arrangement_and_assign_employees(refresh=_initial_refresh)
+    _simulate_laptop_usage_reports()
+    refresh_mock_zone_states() # Prime zone state so the first stream snapshot has no backlog of "changes"
+    zone_state_broadcaster.set_producer(refresh_mock_zone_states)
     print("DEBUG: data_generation_service: Enhanced mock data population complete.")
 else:
     print("DEBUG: data_generation_service: USE_DATABASE_SWITCH is True, skipping module level population.")
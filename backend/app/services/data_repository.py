@@ -0,0 +1,528 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from ..models.employee_models import Employee
+from ..models.energy_models import LaptopUsageEvent
+from ..models.seating_models import Seat, SeatingArrangement, SeatStatus
+from . import data_generation_service, database_service, seating_binary_codec, usage_ingestion_service
+from .data_generation_service import SeatConflictError
+from .read_through_cache import ReadThroughCache
+from .seating_shard_service import DEFAULT_SHARD, merge_shard_occupancy, shard_of
+from .energy_simulation_service import EnergySimulator
+from .seat_spatial_index import SeatSpatialIndex
+
+ChangeListener = Callable[[str], None]
+
+# Which backend serves the API: "mock" (in-memory), "sqlite" or "file" (in-memory, saved to a JSON file).
+# Defaults to "sqlite" when USE_DATABASE_SWITCH is set.
+DATA_BACKEND = os.environ.get("RTMS_DATA_BACKEND") or ("sqlite" if data_generation_service.USE_DATABASE_SWITCH else "mock")
+DATA_FILE_PATH = os.environ.get("RTMS_DATA_FILE", "rtms_state.json")
+CACHE_MAX_ENTRIES = int(os.environ.get("RTMS_CACHE_MAX_ENTRIES", "1024"))
+# Part of every versioned ETag, so ETags handed out by an earlier process never match
+_ETAG_EPOCH = uuid.uuid4().hex[:8]
+
+# Read-through cache policy for every cached read: (TTL seconds, topics whose change invalidates it).
+# Lighting and HVAC are simulated sensor readings, so they only keep for a couple of seconds.
+CACHE_POLICY: Dict[str, Tuple[float, Tuple[str, ...]]] = {
+    "list_employees": (30.0, ("employees",)),
+    "employees_page": (30.0, ("employees",)),
+    "get_employee": (30.0, ("employees",)),
+    "employee_rank": (5.0, ("employees",)),
+    "points_history": (30.0, ("employees",)),
+    "leaderboard": (5.0, ("employees",)),
+    "laptop_usage": (30.0, ("laptop_usage",)),
+    "lighting_status": (2.0, ("seating",)),
+    "hvac_status": (2.0, ("seating",)),
+    "seating_arrangement": (10.0, ("seating",)),
+    "seating_arrangement_snapshot": (10.0, ("seating",)),
+    "nearest_free_seats": (2.0, ("seating",)),
+    "largest_free_block": (2.0, ("seating",)),
+    "seating_suggestions": (10.0, ("seating", "employees")),
+    "campus_occupancy": (2.0, ("seating",)),
+    "dashboard": (2.0, ("employees", "seating", "laptop_usage")),
+}
+
+
+class DataRepository:
+    """
+    Storage-independent access to employees, seating and energy data for the routes.
+    Implementations report writes to change listeners so caches in front can invalidate.
+    """
+
+    supports_zone_stream = False  # Whether lighting/HVAC changes are published for /api/energy/stream/
+    supports_seat_updates = False  # Whether seats are versioned: update_seat and seating_changes
+
+    def __init__(self):
+        self._change_listeners: List[ChangeListener] = []
+
+    def add_change_listener(self, listener: ChangeListener) -> None:
+        self._change_listeners.append(listener)
+
+    def _notify_changed(self, *topics: str) -> None:
+        for listener in self._change_listeners:
+            for topic in topics:
+                listener(topic)
+
+    async def list_employees(self, skip: int = 0, limit: int = 100) -> List[Employee]: raise NotImplementedError
+    async def employees_page(self, cursor: Optional[str], limit: int) -> List[Employee]: raise NotImplementedError
+    def iter_employees(self, cursor: Optional[str] = None) -> AsyncIterator[Employee]: raise NotImplementedError
+    async def get_employee(self, employee_id: str) -> Optional[Employee]: raise NotImplementedError
+    async def employee_rank(self, employee_id: str, window: int = 5) -> Optional[Dict[str, Any]]: raise NotImplementedError
+    async def points_history(self, employee_id: str, limit: int = 50) -> Optional[List[Dict[str, Any]]]: raise NotImplementedError
+    async def leaderboard(self, limit: Optional[int] = None) -> List[Dict[str, Any]]: raise NotImplementedError
+    async def laptop_usage(self) -> List[Dict[str, Any]]: raise NotImplementedError
+    async def lighting_status(self) -> List[Dict[str, Any]]: raise NotImplementedError
+    async def hvac_status(self) -> List[Dict[str, Any]]: raise NotImplementedError
+    async def zone_state_snapshot(self) -> Dict[str, List[Dict[str, Any]]]: raise NotImplementedError
+    async def seating_arrangement(self) -> Dict[str, Any]: raise NotImplementedError
+    async def seating_suggestions(self, objective: str = "zones", group_by_department: bool = False, time_budget_ms: Optional[int] = None,
+                                  shard: Optional[str] = None) -> Optional[Dict[str, Any]]: raise NotImplementedError
+
+    async def seating_arrangement_snapshot(self, encoding: str = seating_binary_codec.ENCODING_JSON,
+                                           shard: Optional[str] = None) -> Optional[Tuple[str, bytes]]:
+        """
+        The arrangement (of the campus, or of one shard) as (ETag, bytes) in JSON or the compact
+        binary encoding; None for an unknown shard. Backends without a seating version use a content hash.
+        """
+        arrangement = await self.seating_arrangement()
+        if shard is not None:
+            zones = [zone for zone in arrangement["zones"] if shard_of(zone["zone_id"]) == shard]
+            if not zones:
+                return None
+            seats = [seat for zone in zones for seat in zone["seats"]]
+            occupied = sum(Seat(**seat).status == SeatStatus.OCCUPIED for seat in seats)
+            arrangement = {"zones": zones, "total_seats": len(seats), "occupied_seats": occupied, "unoccupied_seats": len(seats) - occupied}
+        if encoding == seating_binary_codec.ENCODING_BINARY:
+            body = seating_binary_codec.encode_arrangement(arrangement)
+        else:
+            body = SeatingArrangement(**arrangement).model_dump_json().encode()
+        return f'"{hashlib.sha1(body).hexdigest()}"', body
+
+    async def nearest_free_seats(self, zone_id: str, row: int, col: int, k: int = 5) -> Optional[List[Seat]]:
+        """Up to k free seats nearest (row, col) in the zone, nearest first; None for an unknown zone."""
+        index = await self._seat_index()
+        return index.nearest_free(zone_id, (row, col), k) if zone_id in index else None
+
+    async def largest_free_block(self, zone_id: str) -> Optional[List[Seat]]:
+        """The longest run of adjacent free seats in one row of the zone; None for an unknown zone."""
+        index = await self._seat_index()
+        return index.largest_free_block(zone_id) if zone_id in index else None
+
+    async def update_seat(self, seat_id: str, status: SeatStatus, employee_id: Optional[str] = None,
+                          expected_zone_version: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Set a seat's status, moving `employee_id` onto it when occupied. Returns the seat with its
+        zone's new version, or None for an unknown seat or employee; raises SeatConflictError
+        when the zone moved past `expected_zone_version` or the seat belongs to someone else.
+        Only backends with `supports_seat_updates`.
+        """
+        raise NotImplementedError
+
+    async def seating_changes(self, since: int, shard: Optional[str] = None) -> Dict[str, Any]:
+        """Seats changed after seating version `since` (see SeatingChanges); only backends with `supports_seat_updates`."""
+        raise NotImplementedError
+
+    async def simulate_seat_moves(self, plans: List[List[Tuple[str, str]]]) -> List[Dict[str, Any]]:
+        """
+        Projected zone kWh for a day as seated now and with each plan of (employee id, new seat id)
+        moves applied (see energy_simulation_service). Raises ValueError for an unknown seat.
+        """
+        arrangement = await self.seating_arrangement()
+        simulator = EnergySimulator.from_seats({zone["zone_id"]: ((seat["seat_id"], seat["employee_id"]) for seat in zone["seats"])
+                                                for zone in arrangement["zones"]})
+        return [vars(result) for result in simulator.simulate(plans)]
+
+    async def campus_occupancy(self) -> Dict[str, Any]:
+        """Seat totals per shard (building or floor) and for the whole campus."""
+        shards: Dict[str, Dict[str, Any]] = {}
+        for zone in (await self.seating_arrangement())["zones"]:
+            name = shard_of(zone["zone_id"])
+            shard = shards.setdefault(name, {"shard": name, "zones": 0, "total_seats": 0, "occupied_seats": 0, "unoccupied_seats": 0})
+            occupied = sum(Seat(**seat).status == SeatStatus.OCCUPIED for seat in zone["seats"])
+            shard["zones"] += 1
+            shard["total_seats"] += len(zone["seats"])
+            shard["occupied_seats"] += occupied
+            shard["unoccupied_seats"] += len(zone["seats"]) - occupied
+        return merge_shard_occupancy([shards[name] for name in sorted(shards)])
+
+    async def _seat_index(self) -> SeatSpatialIndex:
+        # Backends without a live index build one from the current arrangement
+        index = SeatSpatialIndex()
+        for zone in (await self.seating_arrangement())["zones"]:
+            index.add_zone(zone["zone_id"], [Seat(**seat) for seat in zone["seats"]])
+        return index
+
+    async def dashboard(self, sections: Optional[List[str]] = None, leaderboard_limit: int = 10) -> Dict[str, Any]: raise NotImplementedError
+
+    async def ingest_laptop_usage(self, events: List[LaptopUsageEvent]) -> Optional[int]:
+        """Accept a validated batch. Returns the batches still pending, or None when the backend is saturated."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class MockDataRepository(DataRepository):
+    """In-memory state from data_generation_service (or a stand-in with the same functions)."""
+
+    supports_zone_stream = True
+    supports_seat_updates = True
+
+    def __init__(self, service=data_generation_service):
+        super().__init__()
+        self.service = service
+        if hasattr(service, "add_change_listener"):
+            service.add_change_listener(self._notify_changed)
+
+    def close(self) -> None:
+        # The service is module-global and outlives this repository
+        if hasattr(self.service, "remove_change_listener"):
+            self.service.remove_change_listener(self._notify_changed)
+
+    async def list_employees(self, skip: int = 0, limit: int = 100) -> List[Employee]:
+        return self.service.get_mock_employees()[skip : skip + limit]
+
+    async def employees_page(self, cursor: Optional[str], limit: int) -> List[Employee]:
+        return self.service.get_mock_employees_page(cursor, limit)
+
+    async def iter_employees(self, cursor: Optional[str] = None) -> AsyncIterator[Employee]:
+        for emp in self.service.iter_mock_employees(cursor):
+            yield emp
+
+    async def get_employee(self, employee_id: str) -> Optional[Employee]:
+        return self.service.get_mock_employee_by_id(employee_id)
+
+    async def employee_rank(self, employee_id: str, window: int = 5) -> Optional[Dict[str, Any]]:
+        return self.service.get_mock_employee_rank(employee_id, window=window)
+
+    async def points_history(self, employee_id: str, limit: int = 50) -> Optional[List[Dict[str, Any]]]:
+        return self.service.get_mock_points_history(employee_id, limit=limit)
+
+    async def leaderboard(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self.service.get_mock_leaderboard(limit=limit)
+
+    async def laptop_usage(self) -> List[Dict[str, Any]]:
+        return self.service.get_mock_laptop_usage()
+
+    async def lighting_status(self) -> List[Dict[str, Any]]:
+        return self.service.get_mock_lighting_status()
+
+    async def hvac_status(self) -> List[Dict[str, Any]]:
+        return self.service.get_mock_hvac_status()
+
+    async def zone_state_snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        return self.service.get_mock_zone_state_snapshot()
+
+    async def seating_arrangement(self) -> Dict[str, Any]:
+        return self.service.get_mock_seating_arrangement_and_assign_employees()
+
+    async def seating_suggestions(self, objective: str = "zones", group_by_department: bool = False, time_budget_ms: Optional[int] = None,
+                                  shard: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        # Off the event loop: waits for the shard workers to finish planning
+        return await asyncio.to_thread(self.service.get_mock_seating_suggestions, objective=objective,
+                                       group_by_department=group_by_department, time_budget_ms=time_budget_ms, shard=shard)
+
+    async def seating_arrangement_snapshot(self, encoding: str = seating_binary_codec.ENCODING_JSON,
+                                           shard: Optional[str] = None) -> Optional[Tuple[str, bytes]]:
+        snapshot = self.service.get_mock_seating_arrangement_snapshot(encoding, shard)
+        if snapshot is None:
+            return None
+        version, body = snapshot
+        scope = f"{shard}-" if shard is not None else "" # Shard versions share one sequence, so tell them apart
+        return f'"{_ETAG_EPOCH}-{scope}{version}-{encoding}"', body
+
+    async def nearest_free_seats(self, zone_id: str, row: int, col: int, k: int = 5) -> Optional[List[Seat]]:
+        return self.service.get_mock_nearest_free_seats(zone_id, row, col, k)
+
+    async def largest_free_block(self, zone_id: str) -> Optional[List[Seat]]:
+        return self.service.get_mock_largest_free_block(zone_id)
+
+    async def seating_changes(self, since: int, shard: Optional[str] = None) -> Dict[str, Any]:
+        return self.service.get_mock_seating_changes(since, shard)
+
+    async def campus_occupancy(self) -> Dict[str, Any]:
+        return self.service.get_mock_campus_occupancy()
+
+    async def simulate_seat_moves(self, plans: List[List[Tuple[str, str]]]) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.service.simulate_mock_seat_moves, plans)
+
+    async def update_seat(self, seat_id: str, status: SeatStatus, employee_id: Optional[str] = None,
+                          expected_zone_version: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        # Off the event loop: the service may wait on zone locks held by other writers
+        return await asyncio.to_thread(self.service.update_mock_seat, seat_id, status, employee_id, expected_zone_version)
+
+    async def dashboard(self, sections: Optional[List[str]] = None, leaderboard_limit: int = 10) -> Dict[str, Any]:
+        # Off the event loop, like seating_suggestions: the suggestions section waits on the shard workers
+        return await asyncio.to_thread(self.service.get_mock_dashboard, sections=sections, leaderboard_limit=leaderboard_limit)
+
+    async def ingest_laptop_usage(self, events: List[LaptopUsageEvent]) -> Optional[int]:
+        # Applied later by the background consumer, which reports the change when it lands
+        queue = usage_ingestion_service.laptop_usage_queue
+        if events and not queue.submit(events):
+            return None
+        return queue.pending_batches
+
+
+class SQLiteDataRepository(DataRepository):
+    """Persistent state in SQLite through database_service (or a stand-in with the same functions)."""
+
+    def __init__(self, db=database_service):
+        super().__init__()
+        self.db = db
+
+    async def list_employees(self, skip: int = 0, limit: int = 100) -> List[Employee]:
+        return await self.db.get_employees(skip, limit)
+
+    async def employees_page(self, cursor: Optional[str], limit: int) -> List[Employee]:
+        return await self.db.get_employees_page(cursor, limit)
+
+    def iter_employees(self, cursor: Optional[str] = None) -> AsyncIterator[Employee]:
+        return self.db.iter_employees(cursor)
+
+    async def get_employee(self, employee_id: str) -> Optional[Employee]:
+        return await self.db.get_employee_by_id(employee_id)
+
+    async def employee_rank(self, employee_id: str, window: int = 5) -> Optional[Dict[str, Any]]:
+        return await self.db.get_employee_rank(employee_id, window=window)
+
+    async def points_history(self, employee_id: str, limit: int = 50) -> Optional[List[Dict[str, Any]]]:
+        return await self.db.get_points_history(employee_id, limit=limit)
+
+    async def leaderboard(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        return await self.db.get_leaderboard(limit=limit)
+
+    async def laptop_usage(self) -> List[Dict[str, Any]]:
+        return await self.db.get_laptop_usage()
+
+    async def lighting_status(self) -> List[Dict[str, Any]]:
+        return await self.db.get_lighting_status()
+
+    async def hvac_status(self) -> List[Dict[str, Any]]:
+        return await self.db.get_hvac_status()
+
+    async def seating_arrangement(self) -> Dict[str, Any]:
+        return await self.db.get_seating_arrangement()
+
+    async def seating_suggestions(self, objective: str = "zones", group_by_department: bool = False, time_budget_ms: Optional[int] = None,
+                                  shard: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        if shard not in (None, DEFAULT_SHARD): # Database zones carry no shard prefix
+            return None
+        return await self.db.get_seating_suggestions(objective=objective, group_by_department=group_by_department, time_budget_ms=time_budget_ms)
+
+    async def dashboard(self, sections: Optional[List[str]] = None, leaderboard_limit: int = 10) -> Dict[str, Any]:
+        return await self.db.get_dashboard(sections=sections, leaderboard_limit=leaderboard_limit)
+
+    async def ingest_laptop_usage(self, events: List[LaptopUsageEvent]) -> Optional[int]:
+        # Written in one transaction before returning
+        if events:
+            await self.db.apply_laptop_usage_events(events)
+            self._notify_changed("laptop_usage", "employees")
+        return 0
+
+    def close(self) -> None:
+        self.db.close_pool()
+
+
+class FileDataRepository(MockDataRepository):
+    """
+    The in-memory mock state, loaded from a JSON file at start-up and written back
+    (atomically) after changes and on close. A change only marks the state dirty and
+    schedules a save on a timer thread, at most every `save_interval_seconds`, so
+    writers never wait on serialization and a burst of changes is saved once it ends.
+    """
+
+    def __init__(self, path: str = DATA_FILE_PATH, service=data_generation_service, save_interval_seconds: float = 5.0,
+                 clock: Callable[[], float] = time.monotonic, timer: Callable[..., threading.Timer] = threading.Timer):
+        super().__init__(service)
+        self.path = path
+        self.save_interval_seconds = save_interval_seconds
+        self._clock = clock
+        self._new_timer = timer
+        self._dirty = False
+        self._last_saved = 0.0
+        self._save_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._timer_lock = threading.Lock()
+        self._closed = False
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as handle:
+                service.load_mock_state(json.load(handle))
+            print(f"DEBUG: data_repository: loaded state from {path}")
+        else:
+            self.save()
+        self.add_change_listener(self._on_change)
+
+    def _on_change(self, topic: str) -> None:
+        # Runs on the writer's thread, possibly with zone locks held: never export from here
+        with self._timer_lock:
+            self._dirty = True
+            if self._timer is None and not self._closed:
+                delay = max(self.save_interval_seconds - (self._clock() - self._last_saved), 0.0)
+                self._timer = self._new_timer(delay, self._flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush(self) -> None:
+        with self._timer_lock:
+            self._timer = None  # Changes from here on schedule the next save
+        self.save()
+
+    def save(self) -> None:
+        with self._save_lock:
+            with self._timer_lock:
+                self._dirty = False
+            state = self.service.export_mock_state()  # Waits for in-flight writes to finish
+            with open(self.path + ".tmp", "w", encoding="utf-8") as handle:
+                json.dump(state, handle)
+            os.replace(self.path + ".tmp", self.path)
+            self._last_saved = self._clock()
+
+    def close(self) -> None:
+        with self._timer_lock:
+            self._closed = True
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        if self._dirty:
+            self.save()
+        super().close()
+
+
+class CachedDataRepository(DataRepository):
+    """
+    Read-through cache in front of another repository. Reads listed in CACHE_POLICY are
+    served from a TTL + LRU cache; a change reported by the backend invalidates the
+    topics it touches. Streams and writes pass straight through.
+    """
+
+    def __init__(self, backend: DataRepository, cache: Optional[ReadThroughCache] = None,
+                 policy: Dict[str, Tuple[float, Tuple[str, ...]]] = CACHE_POLICY):
+        super().__init__()
+        self.backend = backend
+        self.cache = cache if cache is not None else ReadThroughCache(CACHE_MAX_ENTRIES)
+        self.policy = policy
+        self.supports_zone_stream = backend.supports_zone_stream
+        self.supports_seat_updates = backend.supports_seat_updates
+        backend.add_change_listener(self.cache.invalidate)
+        backend.add_change_listener(self._notify_changed)
+
+    async def _read(self, method: str, *args) -> Any:
+        ttl_seconds, topics = self.policy[method]
+        full_key, entry = self.cache.lookup((method, args), topics)
+        if entry is not None:
+            return entry[1]
+        value = await getattr(self.backend, method)(*args)
+        self.cache.store(full_key, ttl_seconds, value)
+        return value
+
+    async def list_employees(self, skip: int = 0, limit: int = 100) -> List[Employee]:
+        return await self._read("list_employees", skip, limit)
+
+    async def employees_page(self, cursor: Optional[str], limit: int) -> List[Employee]:
+        return await self._read("employees_page", cursor, limit)
+
+    def iter_employees(self, cursor: Optional[str] = None) -> AsyncIterator[Employee]:
+        return self.backend.iter_employees(cursor)
+
+    async def get_employee(self, employee_id: str) -> Optional[Employee]:
+        return await self._read("get_employee", employee_id)
+
+    async def employee_rank(self, employee_id: str, window: int = 5) -> Optional[Dict[str, Any]]:
+        return await self._read("employee_rank", employee_id, window)
+
+    async def points_history(self, employee_id: str, limit: int = 50) -> Optional[List[Dict[str, Any]]]:
+        return await self._read("points_history", employee_id, limit)
+
+    async def leaderboard(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        return await self._read("leaderboard", limit)
+
+    async def laptop_usage(self) -> List[Dict[str, Any]]:
+        return await self._read("laptop_usage")
+
+    async def lighting_status(self) -> List[Dict[str, Any]]:
+        return await self._read("lighting_status")
+
+    async def hvac_status(self) -> List[Dict[str, Any]]:
+        return await self._read("hvac_status")
+
+    async def zone_state_snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        return await self.backend.zone_state_snapshot()
+
+    async def seating_arrangement(self) -> Dict[str, Any]:
+        return await self._read("seating_arrangement")
+
+    async def seating_suggestions(self, objective: str = "zones", group_by_department: bool = False, time_budget_ms: Optional[int] = None,
+                                  shard: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        return await self._read("seating_suggestions", objective, group_by_department, time_budget_ms, shard)
+
+    async def seating_arrangement_snapshot(self, encoding: str = seating_binary_codec.ENCODING_JSON,
+                                           shard: Optional[str] = None) -> Optional[Tuple[str, bytes]]:
+        return await self._read("seating_arrangement_snapshot", encoding, shard)
+
+    async def nearest_free_seats(self, zone_id: str, row: int, col: int, k: int = 5) -> Optional[List[Seat]]:
+        return await self._read("nearest_free_seats", zone_id, row, col, k)
+
+    async def largest_free_block(self, zone_id: str) -> Optional[List[Seat]]:
+        return await self._read("largest_free_block", zone_id)
+
+    async def seating_changes(self, since: int, shard: Optional[str] = None) -> Dict[str, Any]:
+        # Not cached: the answer is already proportional to the changes, and clients poll with ever newer versions
+        return await self.backend.seating_changes(since, shard)
+
+    async def campus_occupancy(self) -> Dict[str, Any]:
+        return await self._read("campus_occupancy")
+
+    async def simulate_seat_moves(self, plans: List[List[Tuple[str, str]]]) -> List[Dict[str, Any]]:
+        return await self.backend.simulate_seat_moves(plans)
+
+    async def update_seat(self, seat_id: str, status: SeatStatus, employee_id: Optional[str] = None,
+                          expected_zone_version: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        return await self.backend.update_seat(seat_id, status, employee_id, expected_zone_version)
+
+    async def dashboard(self, sections: Optional[List[str]] = None, leaderboard_limit: int = 10) -> Dict[str, Any]:
+        return await self._read("dashboard", tuple(sections) if sections else None, leaderboard_limit)
+
+    async def ingest_laptop_usage(self, events: List[LaptopUsageEvent]) -> Optional[int]:
+        return await self.backend.ingest_laptop_usage(events)
+
+    def close(self) -> None:
+        self.backend.close()
+
+
+def create_repository(backend: str = DATA_BACKEND) -> DataRepository:
+    if backend == "mock":
+        return MockDataRepository()
+    if backend == "sqlite":
+        database_service.get_pool()  # Open (and on first run seed) the database up front
+        return SQLiteDataRepository()
+    if backend == "file":
+        return FileDataRepository()
+    raise ValueError(f"Unknown data backend '{backend}'")
+
+
+# --- Module-level repository used by the routes ---
+_repository: Optional[DataRepository] = None
+_repository_lock = threading.Lock()
+
+
+def get_repository() -> DataRepository:
+    global _repository
+    with _repository_lock:
+        if _repository is None:
+            _repository = CachedDataRepository(create_repository())
+            print(f"DEBUG: data_repository: serving data from the '{DATA_BACKEND}' backend")
+    return _repository
+
+
+def close_repository() -> None:
+    global _repository
+    with _repository_lock:
+        if _repository is not None:
+            _repository.close()
+            _repository = None
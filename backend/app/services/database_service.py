@@ -0,0 +1,439 @@
+import asyncio
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+import numpy as np
+
+from ..models.employee_models import Employee
+from ..models.energy_models import LaptopMode, LaptopUsageEvent
+from ..models.seating_models import Seat, SeatStatus
+from . import data_generation_service, seating_optimizer_service, synthetic_data_service
+from .awe_points_ledger_service import REASON_DARK_MODE_USAGE
+from .seat_spatial_index import SeatSpatialIndex
+
+DATABASE_PATH = os.environ.get("RTMS_DATABASE_PATH", "rtms.sqlite3")
+POOL_SIZE = int(os.environ.get("RTMS_DATABASE_POOL_SIZE", "4"))
+ITER_PAGE_SIZE = 1_000  # Rows per keyset page when streaming every employee
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS employees (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    department TEXT,
+    awe_points INTEGER NOT NULL DEFAULT 0,
+    current_seat_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_employees_points ON employees (awe_points DESC, id);
+CREATE INDEX IF NOT EXISTS idx_employees_seat ON employees (current_seat_id);
+
+CREATE TABLE IF NOT EXISTS zones (
+    zone_id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    description TEXT,
+    grid_rows INTEGER NOT NULL,
+    grid_cols INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS seats (
+    seat_id TEXT PRIMARY KEY,
+    zone_id TEXT NOT NULL REFERENCES zones (zone_id),
+    position INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    employee_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_seats_zone ON seats (zone_id, position);
+CREATE INDEX IF NOT EXISTS idx_seats_employee ON seats (employee_id);
+
+CREATE TABLE IF NOT EXISTS laptop_usage (
+    employee_id TEXT PRIMARY KEY,
+    hours_on REAL NOT NULL,
+    mode TEXT NOT NULL,
+    dark_mode_hours_pending REAL NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS points_events (
+    sequence INTEGER PRIMARY KEY AUTOINCREMENT,
+    employee_id TEXT NOT NULL,
+    amount INTEGER NOT NULL,
+    reason TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_points_events_employee ON points_events (employee_id, sequence);
+"""
+
+# Every statement the endpoints run. The SQL text is fixed and values are bound as
+# parameters, so sqlite3's per-connection statement cache prepares each one once.
+_EMPLOYEE_COLUMNS = "id, name, department, awe_points, current_seat_id"
+SQL = {
+    "count_employees": "SELECT COUNT(*) FROM employees",
+    "employees_offset": f"SELECT {_EMPLOYEE_COLUMNS} FROM employees ORDER BY id LIMIT ? OFFSET ?",
+    "employees_after": f"SELECT {_EMPLOYEE_COLUMNS} FROM employees WHERE id > ? ORDER BY id LIMIT ?",
+    "employee_by_id": f"SELECT {_EMPLOYEE_COLUMNS} FROM employees WHERE id = ?",
+    "leaderboard": "SELECT id, name, department, awe_points FROM employees ORDER BY awe_points DESC, id LIMIT ?",
+    # Rank queries are split into "same points" and "other points" parts so each is a
+    # range scan on idx_employees_points rather than a full scan for an OR predicate
+    "rank_of": (
+        "SELECT (SELECT COUNT(*) FROM employees WHERE awe_points > ?) "
+        "+ (SELECT COUNT(*) FROM employees WHERE awe_points = ? AND id < ?) + 1"
+    ),
+    "tied_above": "SELECT id, name, department, awe_points FROM employees WHERE awe_points = ? AND id < ? ORDER BY id DESC LIMIT ?",
+    "ranked_above": "SELECT id, name, department, awe_points FROM employees WHERE awe_points > ? ORDER BY awe_points, id DESC LIMIT ?",
+    "tied_below": "SELECT id, name, department, awe_points FROM employees WHERE awe_points = ? AND id > ? ORDER BY id LIMIT ?",
+    "ranked_below": "SELECT id, name, department, awe_points FROM employees WHERE awe_points < ? ORDER BY awe_points DESC, id LIMIT ?",
+    "points_history": (
+        "SELECT sequence, employee_id, amount, reason, timestamp FROM points_events "
+        "WHERE employee_id = ? ORDER BY sequence DESC LIMIT ?"
+    ),
+    "laptop_usage": "SELECT employee_id, hours_on, mode FROM laptop_usage ORDER BY employee_id",
+    "pending_dark_hours": "SELECT dark_mode_hours_pending FROM laptop_usage WHERE employee_id = ?",
+    "upsert_usage": (
+        "INSERT INTO laptop_usage (employee_id, hours_on, mode, dark_mode_hours_pending) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT (employee_id) DO UPDATE SET hours_on = excluded.hours_on, mode = excluded.mode, "
+        "dark_mode_hours_pending = excluded.dark_mode_hours_pending"
+    ),
+    "points_of": "SELECT awe_points FROM employees WHERE id = ?",
+    "set_points": "UPDATE employees SET awe_points = ? WHERE id = ?",
+    "insert_points_event": "INSERT INTO points_events (employee_id, amount, reason, timestamp) VALUES (?, ?, ?, ?)",
+    "zone_occupancy": (
+        "SELECT z.zone_id, COUNT(s.employee_id) FROM zones z LEFT JOIN seats s "
+        "ON s.zone_id = z.zone_id AND s.status = 'occupied' GROUP BY z.zone_id ORDER BY z.position"
+    ),
+    "arrangement": (
+        "SELECT z.zone_id, z.description, z.grid_rows, z.grid_cols, s.seat_id, s.status, s.employee_id, s.position "
+        "FROM zones z JOIN seats s ON s.zone_id = z.zone_id ORDER BY z.position, s.position"
+    ),
+    "seated_departments": "SELECT id, department FROM employees WHERE current_seat_id IS NOT NULL",
+    "insert_employee": "INSERT INTO employees (id, name, department, awe_points, current_seat_id) VALUES (?, ?, ?, ?, ?)",
+    "insert_zone": "INSERT INTO zones (zone_id, position, description, grid_rows, grid_cols) VALUES (?, ?, ?, ?, ?)",
+    "insert_seat": "INSERT INTO seats (seat_id, zone_id, position, status, employee_id) VALUES (?, ?, ?, ?, ?)",
+    "insert_usage": "INSERT INTO laptop_usage (employee_id, hours_on, mode) VALUES (?, ?, ?)",
+}
+
+
+class SQLitePool:
+    """
+    A fixed set of worker threads, each holding its own SQLite connection.
+
+    Queries run on those threads through `run`, so awaiting a query never blocks the
+    event loop and connections are never shared between threads. WAL journaling lets
+    the readers proceed while one writer commits.
+    """
+
+    def __init__(self, path: str, size: int = POOL_SIZE):
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="rtms-sqlite")
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, cached_statements=len(SQL) * 2)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")  # Durable at checkpoints; safe with WAL
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _call(self, fn: Callable[..., Any], args: tuple) -> Any:
+        conn = self._connection()
+        try:
+            result = fn(conn, *args)
+            conn.commit()
+            return result
+        except Exception:
+            conn.rollback()
+            raise
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """Run `fn(connection, *args)` on a pool thread inside a transaction."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._call, fn, args)
+
+    def run_sync(self, fn: Callable[..., Any], *args) -> Any:
+        return self._executor.submit(self._call, fn, args).result()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+
+# --- Schema setup and seeding ---
+
+def _create_schema(conn: sqlite3.Connection) -> None:
+    conn.executescript(SCHEMA)
+
+
+def _seed_if_empty(conn: sqlite3.Connection, config: synthetic_data_service.SyntheticConfig) -> bool:
+    # First start on an empty database: seed it from the seeded synthetic generator
+    if conn.execute(SQL["count_employees"]).fetchone()[0]:
+        return False
+    dataset = synthetic_data_service.generate_dataset(config)
+    n = config.num_employees
+    employee_ids = [synthetic_data_service.employee_id_for(i, n) for i in range(n)]
+    seat_of_employee: Dict[int, str] = {}
+    zone_rows, seat_rows = [], []
+    zones, _, descriptions = synthetic_data_service.materialize_zones(dataset)
+    for position, (zone_id, seats) in enumerate(zones.items()):
+        zone_rows.append((zone_id, position, descriptions[zone_id], config.seat_rows, config.seat_cols))
+        for seat_position, seat in enumerate(seats):
+            seat_rows.append((seat.seat_id, zone_id, seat_position, seat.status.value, seat.employee_id))
+    for seat_index in np.flatnonzero(dataset.seat_employee >= 0).tolist():
+        seat_of_employee[int(dataset.seat_employee[seat_index])] = seat_rows[seat_index][0]
+
+    first = synthetic_data_service.FIRST_NAMES
+    last = synthetic_data_service.LAST_NAMES
+    departments = synthetic_data_service.DEPARTMENTS
+    conn.executemany(SQL["insert_employee"], (
+        (employee_ids[i], f"{first[f]} {last[l]}", departments[d], points, seat_of_employee.get(i))
+        for i, (f, l, d, points) in enumerate(zip(dataset.first_name_idx.tolist(), dataset.last_name_idx.tolist(),
+                                                  dataset.department_idx.tolist(), dataset.awe_points.tolist()))
+    ))
+    conn.executemany(SQL["insert_zone"], zone_rows)
+    conn.executemany(SQL["insert_seat"], seat_rows)
+
+    # Baseline laptop usage, as in mock mode: most seated employees and some others
+    rng = np.random.default_rng(config.seed)
+    reporting = [i for i in range(n) if i in seat_of_employee or rng.random() < 0.6]
+    hours = np.round(rng.uniform(1.5, 8.5, len(reporting)), 1).tolist()
+    modes = [mode.value for mode in LaptopMode]
+    mode_idx = rng.integers(0, len(modes), len(reporting)).tolist()
+    conn.executemany(SQL["insert_usage"], (
+        (employee_ids[i], hours[k], modes[mode_idx[k]]) for k, i in enumerate(reporting)
+    ))
+    return True
+
+
+# --- Module-level pool; opened on first use ---
+_pool: Optional[SQLitePool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> SQLitePool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            pool = SQLitePool(DATABASE_PATH)
+            pool.run_sync(_create_schema)
+            if pool.run_sync(_seed_if_empty, synthetic_data_service.SyntheticConfig.from_env()):
+                print(f"DEBUG: database_service: seeded {DATABASE_PATH}")
+            _pool = pool
+    return _pool
+
+
+def close_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+# --- Queries behind the endpoints ---
+
+def _employee(row: tuple) -> Employee:
+    return Employee(id=row[0], name=row[1], department=row[2], awe_points=row[3], current_seat_id=row[4])
+
+
+def _leaderboard_entry(rank: int, row: tuple) -> Dict[str, Any]:
+    return {"rank": rank, "employee_id": row[0], "name": row[1], "awe_points": row[3], "department": row[2]}
+
+
+async def get_employees(skip: int = 0, limit: int = 100) -> List[Employee]:
+    rows = await get_pool().run(lambda conn: conn.execute(SQL["employees_offset"], (limit, skip)).fetchall())
+    return [_employee(row) for row in rows]
+
+
+async def get_employees_page(cursor: Optional[str] = None, limit: int = 100) -> List[Employee]:
+    rows = await get_pool().run(lambda conn: conn.execute(SQL["employees_after"], (cursor or "", limit)).fetchall())
+    return [_employee(row) for row in rows]
+
+
+async def iter_employees(cursor: Optional[str] = None) -> AsyncIterator[Employee]:
+    # Keyset pages, so each query is an index range scan whatever the depth
+    while True:
+        page = await get_employees_page(cursor, ITER_PAGE_SIZE)
+        for emp in page:
+            yield emp
+        if len(page) < ITER_PAGE_SIZE:
+            return
+        cursor = page[-1].id
+
+
+async def get_employee_by_id(employee_id: str) -> Optional[Employee]:
+    row = await get_pool().run(lambda conn: conn.execute(SQL["employee_by_id"], (employee_id,)).fetchone())
+    return _employee(row) if row else None
+
+
+async def get_leaderboard(limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    rows = await get_pool().run(lambda conn: conn.execute(SQL["leaderboard"], (-1 if limit is None else limit,)).fetchall())
+    return [_leaderboard_entry(rank, row) for rank, row in enumerate(rows, start=1)]
+
+
+def _employee_rank(conn: sqlite3.Connection, employee_id: str, window: int) -> Optional[Dict[str, Any]]:
+    row = conn.execute(SQL["points_of"], (employee_id,)).fetchone()
+    if row is None:
+        return None
+    points = row[0]
+    rank = conn.execute(SQL["rank_of"], (points, points, employee_id)).fetchone()[0]
+    # Nearest first: ties on the same points, then the next points band
+    above = conn.execute(SQL["tied_above"], (points, employee_id, window)).fetchall()
+    if len(above) < window:
+        above += conn.execute(SQL["ranked_above"], (points, window - len(above))).fetchall()
+    above.reverse()
+    below = conn.execute(SQL["tied_below"], (points, employee_id, window)).fetchall()
+    if len(below) < window:
+        below += conn.execute(SQL["ranked_below"], (points, window - len(below))).fetchall()
+    return {
+        "employee_id": employee_id,
+        "rank": rank,
+        "awe_points": points,
+        "total_ranked": conn.execute(SQL["count_employees"]).fetchone()[0],
+        "above": [_leaderboard_entry(rank - len(above) + i, r) for i, r in enumerate(above)],
+        "below": [_leaderboard_entry(rank + 1 + i, r) for i, r in enumerate(below)],
+    }
+
+
+async def get_employee_rank(employee_id: str, window: int = 5) -> Optional[Dict[str, Any]]:
+    return await get_pool().run(_employee_rank, employee_id, window)
+
+
+async def get_points_history(employee_id: str, limit: int = 50) -> Optional[List[Dict[str, Any]]]:
+    def query(conn: sqlite3.Connection):
+        if conn.execute(SQL["points_of"], (employee_id,)).fetchone() is None:
+            return None
+        return conn.execute(SQL["points_history"], (employee_id, limit)).fetchall()
+
+    rows = await get_pool().run(query)
+    if rows is None:
+        return None
+    return [
+        {"sequence": r[0], "employee_id": r[1], "amount": r[2], "reason": r[3], "timestamp": datetime.fromisoformat(r[4])}
+        for r in rows
+    ]
+
+
+async def get_laptop_usage() -> List[Dict[str, Any]]:
+    rows = await get_pool().run(lambda conn: conn.execute(SQL["laptop_usage"]).fetchall())
+    return [{"employee_id": r[0], "hours_on": r[1], "mode": r[2]} for r in rows]
+
+
+def _apply_usage_events(conn: sqlite3.Connection, events: List[LaptopUsageEvent]) -> int:
+    # Same rules as the mock service: latest usage per employee, one Awe Point per
+    # DARK_MODE_HOURS_PER_POINT Dark Mode hours, capped at MAX_AWE_POINTS
+    per_point = data_generation_service.DARK_MODE_HOURS_PER_POINT
+    cap = data_generation_service.MAX_AWE_POINTS
+    applied = 0
+    for event in events:
+        points_row = conn.execute(SQL["points_of"], (event.employee_id,)).fetchone()
+        if points_row is None:
+            continue
+        pending_row = conn.execute(SQL["pending_dark_hours"], (event.employee_id,)).fetchone()
+        pending = pending_row[0] if pending_row else 0.0
+        if event.mode == LaptopMode.DARK:
+            pending += event.hours_on
+            whole_points = int(pending // per_point)
+            pending -= whole_points * per_point
+            earned = min(whole_points, cap - points_row[0])
+            if earned > 0:
+                timestamp = (event.timestamp or datetime.now(timezone.utc)).isoformat()
+                conn.execute(SQL["set_points"], (points_row[0] + earned, event.employee_id))
+                conn.execute(SQL["insert_points_event"], (event.employee_id, earned, REASON_DARK_MODE_USAGE, timestamp))
+        conn.execute(SQL["upsert_usage"], (event.employee_id, event.hours_on, event.mode.value, pending))
+        applied += 1
+    return applied
+
+
+async def apply_laptop_usage_events(events: List[LaptopUsageEvent]) -> int:
+    """Apply a batch of usage events in one transaction; unknown employees are ignored."""
+    return await get_pool().run(_apply_usage_events, events)
+
+
+async def get_zone_occupancy() -> Dict[str, int]:
+    rows = await get_pool().run(lambda conn: conn.execute(SQL["zone_occupancy"]).fetchall())
+    return dict(rows)
+
+
+async def get_lighting_status(occupied_by_zone: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+    occupied_by_zone = occupied_by_zone if occupied_by_zone is not None else await get_zone_occupancy()
+    return [data_generation_service.lighting_state_for_zone(zone_id, n) for zone_id, n in occupied_by_zone.items()]
+
+
+async def get_hvac_status(occupied_by_zone: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+    occupied_by_zone = occupied_by_zone if occupied_by_zone is not None else await get_zone_occupancy()
+    return [data_generation_service.hvac_state_for_zone(zone_id, n) for zone_id, n in occupied_by_zone.items()]
+
+
+async def get_seating_arrangement() -> Dict[str, Any]:
+    rows = await get_pool().run(lambda conn: conn.execute(SQL["arrangement"]).fetchall())
+    zones: Dict[str, Dict[str, Any]] = {}
+    occupied = 0
+    for zone_id, description, grid_rows, grid_cols, seat_id, status, employee_id, position in rows:
+        zone = zones.get(zone_id)
+        if zone is None:
+            zone = zones[zone_id] = {"zone_id": zone_id, "description": description, "grid_rows": grid_rows,
+                                     "grid_cols": grid_cols, "seats": []}
+        zone["seats"].append({"seat_id": seat_id, "status": status, "employee_id": employee_id,
+                              "position": divmod(position, grid_cols)})
+        occupied += status == SeatStatus.OCCUPIED.value
+    return {
+        "zones": list(zones.values()),
+        "total_seats": len(rows),
+        "occupied_seats": occupied,
+        "unoccupied_seats": len(rows) - occupied,
+    }
+
+
+def _suggest_moves(arrangement: Dict[str, Any], objective: str, departments: Optional[Dict[str, str]],
+                   time_budget_ms: Optional[int]) -> Dict[str, Any]:
+    # CPU only (seat models, spatial index, optimizer search): runs on a worker thread, not a pool connection
+    zones_seats = {zone["zone_id"]: [Seat(**seat) for seat in zone["seats"]] for zone in arrangement["zones"]}
+    seat_index = SeatSpatialIndex()
+    seat_index.rebuild(zones_seats)
+    return data_generation_service.consolidation_suggestion(zones_seats, objective=objective,
+                                                            department_of=departments.get if departments is not None else None,
+                                                            time_budget_ms=time_budget_ms, seat_index=seat_index)
+
+
+async def get_seating_suggestions(arrangement: Optional[Dict[str, Any]] = None,
+                                  objective: str = seating_optimizer_service.OBJECTIVE_ZONES,
+                                  group_by_department: bool = False, time_budget_ms: Optional[int] = None) -> Dict[str, Any]:
+    arrangement = arrangement if arrangement is not None else await get_seating_arrangement()
+    departments = None
+    if group_by_department:
+        # Departments of everyone seated, in one query rather than one lookup per employee
+        departments = dict(await get_pool().run(lambda conn: conn.execute(SQL["seated_departments"]).fetchall()))
+    # The search holds neither a pool connection nor the event loop for its time budget
+    return await asyncio.to_thread(_suggest_moves, arrangement, objective, departments, time_budget_ms)
+
+
+async def get_dashboard(sections: Optional[List[str]] = None, leaderboard_limit: int = 10) -> Dict[str, Any]:
+    wanted = set(sections or data_generation_service.DASHBOARD_SECTIONS)
+    result: Dict[str, Any] = dict.fromkeys(data_generation_service.DASHBOARD_SECTIONS)
+    if "leaderboard" in wanted:
+        result["leaderboard"] = await get_leaderboard(leaderboard_limit)
+    if "laptop_usage" in wanted:
+        result["laptop_usage"] = await get_laptop_usage()
+    if wanted & {"lighting", "hvac"}:
+        occupied_by_zone = await get_zone_occupancy()
+        if "lighting" in wanted:
+            result["lighting"] = await get_lighting_status(occupied_by_zone)
+        if "hvac" in wanted:
+            result["hvac"] = await get_hvac_status(occupied_by_zone)
+    if wanted & {"arrangement", "suggestions"}:
+        arrangement = await get_seating_arrangement()
+        if "arrangement" in wanted:
+            result["arrangement"] = arrangement
+        if "suggestions" in wanted:
+            result["suggestions"] = await get_seating_suggestions(arrangement)
+    return result
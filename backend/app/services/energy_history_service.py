@@ -0,0 +1,186 @@
+import csv
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Numeric columns of energy_usage_sample.csv, in the column order of EnergyHistoryStore.values
+HISTORY_METRICS = ("laptop_hours", "light_hours_on", "ac_hours_on", "projector_usage_hours", "awe_points_earned")
+AGGREGATIONS = ("sum", "mean", "max")
+
+DEFAULT_HISTORY_CSV = Path(__file__).resolve().parents[3] / "datasets" / "energy_usage_sample.csv"
+
+_TS_MIN = np.iinfo(np.int64).min
+_TS_MAX = np.iinfo(np.int64).max
+
+
+def _parse_timestamp(value: str) -> int:
+    # The dataset uses "2023-10-27T09:00:00Z"; fromisoformat only accepts "Z" from Python 3.11
+    parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def to_epoch_seconds(value: Optional[datetime]) -> Optional[int]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+class _GroupedColumns:
+    """
+    The store's rows re-ordered by (group, timestamp), so each group's history is one
+    contiguous, time-sorted block. Prefix sums over that order make sum/mean over any
+    time window O(log n) (two binary searches); max scans only the matching block.
+    """
+
+    def __init__(self, group_codes: np.ndarray, timestamps: np.ndarray, values: np.ndarray, num_groups: int):
+        order = np.lexsort((timestamps, group_codes))
+        self.timestamps = timestamps[order]
+        self.values = values[order]
+        self.prefix_sums = np.vstack([np.zeros((1, values.shape[1])), np.cumsum(self.values, axis=0)])
+        # Row offsets of each group's block: group g occupies [offsets[g], offsets[g + 1])
+        self.offsets = np.searchsorted(group_codes[order], np.arange(num_groups + 1))
+
+    def window(self, group: int, start: int, end: int) -> Tuple[int, int]:
+        lo, hi = int(self.offsets[group]), int(self.offsets[group + 1])
+        block = self.timestamps[lo:hi]
+        return lo + int(np.searchsorted(block, start, side="left")), lo + int(np.searchsorted(block, end, side="right"))
+
+    def aggregate(self, group: int, start: int, end: int, aggregation: str) -> Tuple[int, np.ndarray]:
+        lo, hi = self.window(group, start, end)
+        count = hi - lo
+        if count == 0:
+            return 0, np.full(self.values.shape[1], 0.0 if aggregation == "sum" else np.nan)
+        if aggregation == "max":
+            return count, self.values[lo:hi].max(axis=0)
+        totals = self.prefix_sums[hi] - self.prefix_sums[lo]
+        return count, totals / count if aggregation == "mean" else totals
+
+
+class EnergyHistoryStore:
+    """
+    Columnar, NumPy-backed store of per-employee daily usage records.
+
+    Rows are kept sorted by timestamp; `employee_codes` / `zone_codes` index into
+    `employee_ids` / `zone_ids`, and `values` holds one column per HISTORY_METRICS entry.
+    """
+
+    def __init__(self, timestamps: np.ndarray, employee_ids: List[str], employee_codes: np.ndarray,
+                 zone_ids: List[str], zone_codes: np.ndarray, values: np.ndarray):
+        order = np.argsort(timestamps, kind="stable")
+        self.timestamps = timestamps[order]
+        self.employee_codes = employee_codes[order]
+        self.zone_codes = zone_codes[order]
+        self.values = values[order]
+        self.employee_ids = employee_ids
+        self.zone_ids = zone_ids
+        self._employee_lookup = {emp_id: code for code, emp_id in enumerate(employee_ids)}
+        self._zone_lookup = {zone_id: code for code, zone_id in enumerate(zone_ids)}
+        self._by_employee = _GroupedColumns(self.employee_codes, self.timestamps, self.values, len(employee_ids))
+        self._by_zone = _GroupedColumns(self.zone_codes, self.timestamps, self.values, len(zone_ids))
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def empty(cls) -> "EnergyHistoryStore":
+        return cls(np.empty(0, dtype=np.int64), [], np.empty(0, dtype=np.int32),
+                   [], np.empty(0, dtype=np.int32), np.empty((0, len(HISTORY_METRICS))))
+
+    @classmethod
+    def from_csv(cls, path) -> "EnergyHistoryStore":
+        """Parse an energy_usage_sample.csv style file. Zones are taken from `light_zone_used`."""
+        timestamps: List[int] = []
+        employee_codes: List[int] = []
+        zone_codes: List[int] = []
+        rows: List[List[float]] = []
+        employee_lookup: Dict[str, int] = {}
+        zone_lookup: Dict[str, int] = {}
+
+        with open(path, newline="") as handle:
+            for record in csv.DictReader(handle):
+                timestamps.append(_parse_timestamp(record["timestamp"]))
+                employee_codes.append(employee_lookup.setdefault(record["employee_id"], len(employee_lookup)))
+                zone_codes.append(zone_lookup.setdefault(record["light_zone_used"], len(zone_lookup)))
+                rows.append([float(record[metric] or 0) for metric in HISTORY_METRICS])
+
+        return cls(
+            np.asarray(timestamps, dtype=np.int64),
+            list(employee_lookup),
+            np.asarray(employee_codes, dtype=np.int32),
+            list(zone_lookup),
+            np.asarray(zone_codes, dtype=np.int32),
+            np.asarray(rows, dtype=np.float64).reshape(len(rows), len(HISTORY_METRICS)),
+        )
+
+    def employee_aggregate(self, employee_id: str, start: Optional[int] = None, end: Optional[int] = None,
+                           aggregation: str = "sum") -> Optional[Dict]:
+        code = self._employee_lookup.get(employee_id)
+        if code is None:
+            return None
+        return self._aggregate(self._by_employee, code, start, end, aggregation)
+
+    def zone_aggregate(self, zone_id: str, start: Optional[int] = None, end: Optional[int] = None,
+                       aggregation: str = "sum") -> Optional[Dict]:
+        code = self._zone_lookup.get(zone_id)
+        if code is None:
+            return None
+        return self._aggregate(self._by_zone, code, start, end, aggregation)
+
+    def _aggregate(self, grouped: _GroupedColumns, code: int, start: Optional[int], end: Optional[int],
+                   aggregation: str) -> Dict:
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"Unsupported aggregation '{aggregation}'")
+        count, result = grouped.aggregate(code, _TS_MIN if start is None else start, _TS_MAX if end is None else end, aggregation)
+        return {
+            "record_count": count,
+            "values": {metric: (None if np.isnan(value) else round(float(value), 4)) for metric, value in zip(HISTORY_METRICS, result)},
+        }
+
+
+# --- Module-level store, loaded lazily on first use ---
+_history_store: Optional[EnergyHistoryStore] = None
+
+
+def load_history(path=None) -> EnergyHistoryStore:
+    """(Re)load the history store from `path`, RTMS_ENERGY_HISTORY_CSV or the bundled sample."""
+    global _history_store
+    path = Path(path or os.environ.get("RTMS_ENERGY_HISTORY_CSV") or DEFAULT_HISTORY_CSV)
+    if path.exists():
+        print(f"DEBUG: energy_history_service: Loading energy history from {path}")
+        _history_store = EnergyHistoryStore.from_csv(path)
+    else:
+        print(f"DEBUG: energy_history_service: {path} not found, starting with empty history")
+        _history_store = EnergyHistoryStore.empty()
+    return _history_store
+
+
+def get_history_store() -> EnergyHistoryStore:
+    if _history_store is None:
+        load_history()
+    return _history_store
+
+
+def _window_response(scope: str, key: str, start: Optional[datetime], end: Optional[datetime],
+                     aggregation: str, result: Optional[Dict]) -> Optional[Dict]:
+    if result is None:
+        return None
+    return {"scope": scope, "key": key, "start": start, "end": end, "aggregation": aggregation, **result}
+
+
+def get_employee_history_aggregate(employee_id: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                                   aggregation: str = "sum") -> Optional[Dict]:
+    result = get_history_store().employee_aggregate(employee_id, to_epoch_seconds(start), to_epoch_seconds(end), aggregation)
+    return _window_response("employee", employee_id, start, end, aggregation, result)
+
+
+def get_zone_history_aggregate(zone_id: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                               aggregation: str = "sum") -> Optional[Dict]:
+    result = get_history_store().zone_aggregate(zone_id, to_epoch_seconds(start), to_epoch_seconds(end), aggregation)
+    return _window_response("zone", zone_id, start, end, aggregation, result)
@@ -0,0 +1,141 @@
+"""
+What-if energy simulation for proposed seat moves.
+
+A day is replayed in STEP_MINUTES steps. Every seated employee is present for the
+share of the step given by PRESENCE_PROFILE (arrival, lunch, departure), so a zone
+holding n people has n * profile[t] people in it at step t. Lights are on while at
+least LIGHTS_ON_PRESENCE people are expected; HVAC runs while the lights are on and
+for PRECONDITION_STEPS before, plus a load per person present; base load never stops.
+
+Because presence depends only on how many people sit in a zone, the day is replayed
+once for every occupancy level 0..max seats as a (levels x steps) array, and combined
+with each zone's kW per step into a (zones x levels) kWh table. A plan then costs
+one table lookup per zone, so a batch of plans is a single (plans x zones) gather.
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+STEP_MINUTES = 15
+STEPS_PER_DAY = 24 * 60 // STEP_MINUTES
+STEP_HOURS = STEP_MINUTES / 60
+
+ZONE_LIGHTING_KW = 0.5        # Lights of one zone
+ZONE_HVAC_KW = 1.2            # HVAC of one zone while running
+HVAC_KW_PER_PERSON = 0.03     # Extra cooling for each person present
+ZONE_BASE_KW = 0.05           # Always-on equipment in one zone
+LIGHTS_ON_PRESENCE = 0.5      # Expected people present before the lights go on
+PRECONDITION_STEPS = 4        # HVAC starts this many steps before people arrive
+
+# Share of seated employees present, interpolated between (hour of day, share) points
+_PROFILE_POINTS = ((0, 0.0), (7, 0.0), (9.5, 0.9), (12, 0.9), (12.5, 0.6), (13.5, 0.6), (14, 0.9), (16.5, 0.9), (19, 0.0), (24, 0.0))
+PRESENCE_PROFILE = np.interp((np.arange(STEPS_PER_DAY) + 0.5) * STEP_HOURS, *zip(*_PROFILE_POINTS))
+
+SeatMove = Tuple[str, str]  # (employee id, new seat id)
+
+
+@dataclass
+class SimulationResult:
+    kwh_without_moves: float
+    kwh_with_moves: float
+    saving_kwh: float
+
+
+def replay_day(levels: np.ndarray, profile: np.ndarray = PRESENCE_PROFILE) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (people present, lights on, HVAC running) per step for zones holding `levels` people,
+    each shaped levels.shape + (steps,).
+    """
+    present = np.asarray(levels, dtype=np.float64)[..., None] * profile
+    lit = present >= LIGHTS_ON_PRESENCE
+    running = lit.copy()
+    for k in range(1, PRECONDITION_STEPS + 1):
+        running[..., :-k] |= lit[..., k:]
+    return present, lit, running
+
+
+def _per_step(values: Optional[Dict[str, float]], zone_ids: List[str], default: float) -> np.ndarray:
+    return np.array([(values or {}).get(zone_id, default) for zone_id in zone_ids], dtype=np.float64)[:, None].repeat(STEPS_PER_DAY, axis=1)
+
+
+class EnergySimulator:
+    """
+    Projects a day's zone energy (lighting, HVAC and base load) for the current seating and
+    for any number of move plans. Built once per seating state; `simulate` then evaluates
+    hundreds of plans per call. `lighting_kw` / `hvac_kw` override the per-zone draw.
+    """
+
+    def __init__(self, zone_employees: Dict[str, Tuple[int, List[str]]], seat_zone: Dict[str, str],
+                 lighting_kw: Optional[Dict[str, float]] = None, hvac_kw: Optional[Dict[str, float]] = None):
+        # zone_employees: zone id -> (seat count, ids of the employees seated there)
+        self.zone_ids = list(zone_employees)
+        self._zone_index = {zone_id: i for i, zone_id in enumerate(self.zone_ids)}
+        self._seat_zone = {seat_id: self._zone_index[zone_id] for seat_id, zone_id in seat_zone.items()}
+        self._employee_zone = {emp_id: self._zone_index[zone_id] for zone_id, (_, employees) in zone_employees.items() for emp_id in employees}
+        self.occupied = np.array([len(employees) for _, employees in zone_employees.values()], dtype=np.int64)
+
+        # Moves can fill a zone up to its seats (more only if a plan doubles up on seats; those are capped)
+        levels = np.arange(max((seats for seats, _ in zone_employees.values()), default=0) + 1)
+        present, lit, running = replay_day(levels)
+        light = _per_step(lighting_kw, self.zone_ids, ZONE_LIGHTING_KW)
+        hvac = _per_step(hvac_kw, self.zone_ids, ZONE_HVAC_KW)
+        self._kwh_table = STEP_HOURS * (
+            light @ lit.T.astype(np.float64)
+            + hvac @ running.T.astype(np.float64)
+            + (HVAC_KW_PER_PERSON * (present * running).sum(axis=1))[None, :]
+        ) + ZONE_BASE_KW * 24
+        self._zone_rows = np.arange(len(self.zone_ids))[None, :]
+        self.kwh_without_moves = float(self.day_kwh(self.occupied[None, :])[0])
+
+    @classmethod
+    def from_seats(cls, zones_seats: Dict[str, Iterable[Tuple[str, Optional[str]]]], **kwargs) -> "EnergySimulator":
+        """From (seat id, employee id or None) pairs per zone."""
+        zone_employees: Dict[str, Tuple[int, List[str]]] = {}
+        seat_zone: Dict[str, str] = {}
+        for zone_id, seats in zones_seats.items():
+            employees, count = [], 0
+            for seat_id, emp_id in seats:
+                seat_zone[seat_id] = zone_id
+                count += 1
+                if emp_id is not None:
+                    employees.append(emp_id)
+            zone_employees[zone_id] = (count, employees)
+        return cls(zone_employees, seat_zone, **kwargs)
+
+    def deltas(self, plans: Sequence[Sequence[SeatMove]]) -> np.ndarray:
+        """(plans x zones) change in occupancy. Raises ValueError for a seat outside the simulated zones."""
+        out = np.zeros((len(plans), len(self.zone_ids)), dtype=np.int64)
+        for p, moves in enumerate(plans):
+            moved: Dict[str, int] = {}
+            for emp_id, seat_id in moves:
+                target = self._seat_zone.get(seat_id)
+                if target is None:
+                    raise ValueError(f"Unknown seat {seat_id}")
+                source = moved.get(emp_id, self._employee_zone.get(emp_id))
+                if source is not None:
+                    out[p, source] -= 1
+                out[p, target] += 1
+                moved[emp_id] = target
+        return out
+
+    def zone_kwh(self, occupancy: np.ndarray) -> np.ndarray:
+        """Projected kWh per zone for each row of a (plans x zones) occupancy matrix."""
+        levels = np.clip(occupancy, 0, self._kwh_table.shape[1] - 1)
+        return self._kwh_table[self._zone_rows, levels]
+
+    def day_kwh(self, occupancy: np.ndarray) -> np.ndarray:
+        """Projected kWh for each row of a (plans x zones) occupancy matrix."""
+        return self.zone_kwh(occupancy).sum(axis=1)
+
+    def zone_saving_kwh(self, moves: Sequence[SeatMove]) -> Dict[str, float]:
+        """kWh each zone saves (negative: spends) under one plan."""
+        before = self.occupied[None, :]
+        saving = self.zone_kwh(before)[0] - self.zone_kwh(before + self.deltas([moves]))[0]
+        return dict(zip(self.zone_ids, saving.tolist()))
+
+    def simulate(self, plans: Sequence[Sequence[SeatMove]]) -> List[SimulationResult]:
+        with_moves = self.day_kwh(self.occupied[None, :] + self.deltas(plans))
+        return [SimulationResult(kwh_without_moves=round(self.kwh_without_moves, 2), kwh_with_moves=round(kwh, 2),
+                                 saving_kwh=round(self.kwh_without_moves - kwh, 2))
+                for kwh in with_moves.tolist()]
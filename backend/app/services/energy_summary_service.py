@@ -0,0 +1,129 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from ..models.energy_models import SensorReading, LaptopMode, LightState, HvacStatus
+from .sensor_ingestion_service import get_sensor_store
+
+COMPONENT_LAPTOPS = "Laptop Usage"
+COMPONENT_HVAC = "HVAC"
+COMPONENT_LIGHTING = "Lighting"
+COMPONENT_PROJECTORS = "Projectors"
+COMPONENT_BASE_LOAD = "Base Load"
+COMPONENTS = (COMPONENT_LAPTOPS, COMPONENT_HVAC, COMPONENT_LIGHTING, COMPONENT_PROJECTORS, COMPONENT_BASE_LOAD)
+
+# Average laptop draw per mode, used to turn reported hours into kWh
+LAPTOP_KW = {LaptopMode.LIGHT: 0.050, LaptopMode.DARK: 0.045}
+
+# A zone meter reports one kWh figure per hour. It is split across the systems that
+# were on during that reading using these relative weights; with nothing on it is base load.
+_METERED_SHARE = {COMPONENT_HVAC: 0.6, COMPONENT_LIGHTING: 0.3, COMPONENT_PROJECTORS: 0.1}
+
+_RECOMMENDATIONS = {
+    COMPONENT_LAPTOPS: "Encourage Dark Mode and shutting laptops down overnight.",
+    COMPONENT_HVAC: "Raise set points or switch idle zones to ECO.",
+    COMPONENT_LIGHTING: "Turn off lights in unoccupied zones.",
+    COMPONENT_PROJECTORS: "Switch projectors off after meetings.",
+    COMPONENT_BASE_LOAD: "Check for equipment left on in empty zones.",
+}
+
+_DAYS_KEPT = 8
+
+
+def _utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def split_metered_kwh(reading: SensorReading) -> Dict[str, float]:
+    """A zone reading's kWh by component: shared by the systems that were on, else all base load."""
+    systems_on = []
+    if reading.ac_status != HvacStatus.OFF:
+        systems_on.append(COMPONENT_HVAC)
+    if reading.light_status == LightState.ON:
+        systems_on.append(COMPONENT_LIGHTING)
+    if reading.projector_status == LightState.ON:
+        systems_on.append(COMPONENT_PROJECTORS)
+    if not systems_on:
+        return {COMPONENT_BASE_LOAD: reading.energy_consumption_kwh_hourly}
+    weight_total = sum(_METERED_SHARE[system] for system in systems_on)
+    return {system: reading.energy_consumption_kwh_hourly * _METERED_SHARE[system] / weight_total for system in systems_on}
+
+
+class EnergyCounters:
+    """
+    Running kWh totals per day and per component, updated as usage and sensor events
+    arrive. Producing the summary reads two small dicts (today and yesterday), so its
+    cost does not depend on how many employees or zones report.
+    """
+
+    def __init__(self):
+        self._daily: Dict[date, Dict[str, float]] = {}
+
+    def add(self, day: date, component: str, kwh: float) -> None:
+        totals = self._daily.get(day)
+        if totals is None:
+            totals = self._daily[day] = dict.fromkeys(COMPONENTS, 0.0)
+            if len(self._daily) > _DAYS_KEPT:
+                del self._daily[min(self._daily)]
+        totals[component] += kwh
+
+    def add_sensor_readings(self, readings: List[SensorReading]) -> None:
+        for reading in readings:
+            day = reading.timestamp.astimezone(timezone.utc).date()
+            for component, kwh in split_metered_kwh(reading).items():
+                self.add(day, component, kwh)
+
+    def add_laptop_usage(self, hours_on: float, mode: LaptopMode, day: Optional[date] = None) -> None:
+        self.add(day or _utc_today(), COMPONENT_LAPTOPS, hours_on * LAPTOP_KW[LaptopMode(mode)])
+
+    def summary(self, today: Optional[date] = None) -> Dict[str, Any]:
+        today = today or _utc_today()
+        empty = dict.fromkeys(COMPONENTS, 0.0)
+        current = self._daily.get(today, empty)
+        previous = self._daily.get(today - timedelta(days=1), empty)
+
+        total_today = sum(current.values())
+        total_yesterday = sum(previous.values())
+        comparison = (total_today - total_yesterday) / total_yesterday * 100 if total_yesterday else 0.0
+
+        contributors = []
+        for component in sorted(COMPONENTS, key=lambda c: current[c], reverse=True):
+            if current[component] <= 0:
+                continue
+            trend = "stable"
+            if current[component] > previous[component] * 1.05:
+                trend = "up"
+            elif current[component] < previous[component] * 0.95:
+                trend = "down"
+            contributors.append({
+                "component_name": component,
+                "usage_metric": "kWh",
+                "current_value": round(current[component], 3),
+                "trend": trend,
+                "recommendation": _RECOMMENDATIONS[component] if trend == "up" else None,
+            })
+
+        return {
+            "total_consumption_kwh_today": round(total_today, 3),
+            "comparison_yesterday_percentage": round(comparison, 1),
+            "main_contributors": contributors,
+        }
+
+
+# --- Module-level counters, fed by the sensor reading store ---
+_counters: Optional[EnergyCounters] = None
+
+
+def get_counters() -> EnergyCounters:
+    global _counters
+    if _counters is None:
+        _counters = EnergyCounters()
+        get_sensor_store().add_listener(_counters.add_sensor_readings)
+    return _counters
+
+
+def record_laptop_usage(hours_on: float, mode: LaptopMode, day: Optional[date] = None) -> None:
+    get_counters().add_laptop_usage(hours_on, mode, day)
+
+
+def get_energy_summary(today: Optional[date] = None) -> Dict[str, Any]:
+    return get_counters().summary(today)
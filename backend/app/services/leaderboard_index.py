@@ -0,0 +1,164 @@
+import math
+import random
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Ordering key for one employee: highest points first, ties broken by employee id
+# (the same order the old sort-per-request produced for the id-ordered employee list).
+_LeaderboardKey = Tuple[int, str]
+
+_MAX_LEVELS = 24  # Comfortable for tens of millions of entries
+_NIL_KEY = (math.inf, "")
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key, levels: int):
+        self.key = key
+        self.next: List["_Node"] = [None] * levels
+        # width[level] = number of level-0 hops from this node to next[level]
+        self.width: List[int] = [1] * levels
+
+
+class RankedLeaderboard:
+    """
+    Awe Points leaderboard kept permanently in rank order.
+
+    Backed by an indexable skip list, so changing one employee's points is
+    O(log n), reading the top N is O(log n + N) and finding an employee's rank
+    (or the entries around it) is O(log n). Nothing is re-sorted on read.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self._rng = random.Random(seed)  # Own RNG so mock data seeding is not disturbed
+        self._nil = _Node(_NIL_KEY, 0)
+        self._head = _Node(None, _MAX_LEVELS)
+        self._head.next = [self._nil] * _MAX_LEVELS
+        self._keys: Dict[str, _LeaderboardKey] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, employee_id: str) -> bool:
+        return employee_id in self._keys
+
+    def clear(self) -> None:
+        self._head.next = [self._nil] * _MAX_LEVELS
+        self._head.width = [1] * _MAX_LEVELS
+        self._keys = {}
+
+    def rebuild(self, points_by_employee: Dict[str, int]) -> None:
+        self.clear()
+        for employee_id, points in points_by_employee.items():
+            self.update(employee_id, points)
+
+    def update(self, employee_id: str, points: int) -> None:
+        """Insert the employee or move them to the position for their new points."""
+        new_key = (-points, employee_id)
+        old_key = self._keys.get(employee_id)
+        if old_key == new_key:
+            return
+        if old_key is not None:
+            self._remove_key(old_key)
+        self._insert_key(new_key)
+        self._keys[employee_id] = new_key
+
+    def remove(self, employee_id: str) -> None:
+        key = self._keys.pop(employee_id, None)
+        if key is not None:
+            self._remove_key(key)
+
+    def points_of(self, employee_id: str) -> Optional[int]:
+        key = self._keys.get(employee_id)
+        return -key[0] if key is not None else None
+
+    def top(self, limit: Optional[int] = None) -> List[Tuple[int, str, int]]:
+        """Return (rank, employee_id, points) for the best `limit` entries (all if None)."""
+        return list(self.iter_from(1, limit))
+
+    def iter_from(self, rank: int, limit: Optional[int] = None) -> Iterator[Tuple[int, str, int]]:
+        """Yield (rank, employee_id, points) starting at the 1-based `rank`."""
+        if rank < 1:
+            rank = 1
+        if rank > len(self._keys) or (limit is not None and limit <= 0):
+            return
+        node = self._node_at(rank)
+        remaining = limit
+        while node is not self._nil and (remaining is None or remaining > 0):
+            yield rank, node.key[1], -node.key[0]
+            node = node.next[0]
+            rank += 1
+            if remaining is not None:
+                remaining -= 1
+
+    def rank_of(self, employee_id: str) -> Optional[int]:
+        """1-based rank of the employee, or None if they are not on the board."""
+        key = self._keys.get(employee_id)
+        if key is None:
+            return None
+        node = self._head
+        position = 0
+        for level in reversed(range(_MAX_LEVELS)):
+            while node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+        return position + 1
+
+    # --- skip list internals ---
+
+    def _node_at(self, rank: int) -> _Node:
+        node = self._head
+        remaining = rank
+        for level in reversed(range(_MAX_LEVELS)):
+            while node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+        return node
+
+    def _random_level(self) -> int:
+        level = 1
+        while level < _MAX_LEVELS and self._rng.random() < 0.5:
+            level += 1
+        return level
+
+    def _insert_key(self, key: _LeaderboardKey) -> None:
+        chain: List[_Node] = [None] * _MAX_LEVELS
+        steps_at_level = [0] * _MAX_LEVELS
+        node = self._head
+        for level in reversed(range(_MAX_LEVELS)):
+            while node.next[level].key <= key:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+
+        levels = self._random_level()
+        new_node = _Node(key, levels)
+        steps = 0
+        for level in range(levels):
+            prev = chain[level]
+            new_node.next[level] = prev.next[level]
+            prev.next[level] = new_node
+            new_node.width[level] = prev.width[level] - steps
+            prev.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(levels, _MAX_LEVELS):
+            chain[level].width[level] += 1
+
+    def _remove_key(self, key: _LeaderboardKey) -> None:
+        chain: List[_Node] = [None] * _MAX_LEVELS
+        node = self._head
+        for level in reversed(range(_MAX_LEVELS)):
+            while node.next[level].key < key:
+                node = node.next[level]
+            chain[level] = node
+
+        target = chain[0].next[0]
+        if target.key != key:
+            raise KeyError(key)
+        levels = len(target.next)
+        for level in range(levels):
+            prev = chain[level]
+            prev.width[level] += target.width[level] - 1
+            prev.next[level] = target.next[level]
+        for level in range(levels, _MAX_LEVELS):
+            chain[level].width[level] -= 1
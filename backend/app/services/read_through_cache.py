@@ -0,0 +1,64 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+DEFAULT_MAX_ENTRIES = 1_024
+
+
+class ReadThroughCache:
+    """
+    Size-bounded LRU cache whose entries also expire after a per-call TTL.
+
+    Entries are tagged with the topics they depend on ("employees", "seating", ...).
+    `invalidate(topic)` bumps that topic's version, which makes every entry stored
+    under an older version unreachable in O(1); such entries then age out of the LRU.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()  # key -> (expires at, value)
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _key(self, key: Hashable, topics: Iterable[str]) -> Hashable:
+        return key, tuple(self._versions.get(topic, 0) for topic in topics)
+
+    def lookup(self, key: Hashable, topics: Tuple[str, ...]) -> Tuple[Hashable, Optional[Tuple[float, Any]]]:
+        """
+        Return (versioned key, live (expires at, value) entry or None). On a miss the caller
+        loads the value itself (possibly awaiting) and hands it to `store` with that key.
+        """
+        with self._lock:
+            full_key = self._key(key, topics)
+            entry = self._entries.get(full_key)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(full_key)
+                self.hits += 1
+                return full_key, entry
+            self.misses += 1
+            return full_key, None
+
+    def store(self, full_key: Hashable, ttl_seconds: float, value: Any) -> None:
+        # A write that bumped a topic while the value was loading makes full_key stale
+        # already, so this entry can never be returned; it just ages out.
+        with self._lock:
+            self._entries[full_key] = (self._clock() + ttl_seconds, value)
+            self._entries.move_to_end(full_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *topics: str) -> None:
+        with self._lock:
+            for topic in topics:
+                self._versions[topic] = self._versions.get(topic, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,270 @@
+import heapq
+import math
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..models.seating_models import Seat, SeatStatus
+
+_SEAT_ID_POSITION = re.compile(r"-R(\d+)C(\d+)$")  # "ZoneA-R2C3" -> row 1, col 2
+
+_OTHER, _FREE, _OCCUPIED = 0, 1, 2  # Cell states; reserved and disabled seats count as "other"
+
+
+def position_from_seat_id(seat_id: str) -> Optional[Tuple[int, int]]:
+    match = _SEAT_ID_POSITION.search(seat_id)
+    return (int(match.group(1)) - 1, int(match.group(2)) - 1) if match else None
+
+
+def grid_position(seat: Seat) -> Optional[Tuple[int, int]]:
+    """(row, col) of a seat, from its position or, for older data, from an "R<row>C<col>" seat id."""
+    if seat.position is not None:
+        return seat.position
+    return position_from_seat_id(seat.seat_id)
+
+
+class _RunTree:
+    """
+    Segment tree over one line of cells that are free or not. Setting a cell, finding
+    the nearest free cell on either side of an index, and reading the longest run of
+    adjacent free cells are all O(log n).
+    """
+
+    def __init__(self, n: int):
+        self.n = n
+        self.size = 1 << max(0, (n - 1).bit_length())
+        size2 = 2 * self.size
+        self.count = [0] * size2
+        self.prefix = [0] * size2  # Free cells at the start of the node's range
+        self.suffix = [0] * size2  # Free cells at the end of the node's range
+        self.best = [0] * size2  # Longest free run inside the range
+        self.best_start = [0] * size2
+        self.span = [0] * size2
+        self.start = [0] * size2
+        for i in range(self.size):
+            self.span[self.size + i] = 1
+            self.start[self.size + i] = i
+        for node in range(self.size - 1, 0, -1):
+            self.span[node] = 2 * self.span[2 * node]
+            self.start[node] = self.start[2 * node]
+
+    def set(self, i: int, free: bool) -> None:
+        node = self.size + i
+        value = 1 if free else 0
+        if self.count[node] == value:
+            return
+        self.count[node] = self.prefix[node] = self.suffix[node] = self.best[node] = value
+        self.best_start[node] = i
+        node >>= 1
+        while node:
+            self._pull(node)
+            node >>= 1
+
+    def _pull(self, node: int) -> None:
+        left, right = 2 * node, 2 * node + 1
+        span = self.span[left]
+        self.count[node] = self.count[left] + self.count[right]
+        self.prefix[node] = self.prefix[left] if self.prefix[left] < span else span + self.prefix[right]
+        self.suffix[node] = self.suffix[right] if self.suffix[right] < span else span + self.suffix[left]
+        # Leftmost longest run: in the left half, across the middle, or in the right half
+        best, best_start = self.best[left], self.best_start[left]
+        across = self.suffix[left] + self.prefix[right]
+        if across > best:
+            best, best_start = across, self.start[right] - self.suffix[left]
+        if self.best[right] > best:
+            best, best_start = self.best[right], self.best_start[right]
+        self.best[node], self.best_start[node] = best, best_start
+
+    def next_free(self, i: int) -> int:
+        """Smallest free index >= i, or -1."""
+        if i >= self.n or self.count[1] == 0:
+            return -1
+        node = self.size + max(i, 0)
+        if not self.count[node]:
+            while node > 1 and (node & 1 or not self.count[node + 1]):
+                node >>= 1
+            if node == 1:
+                return -1
+            node += 1
+            while node < self.size:
+                node = 2 * node if self.count[2 * node] else 2 * node + 1
+        return node - self.size
+
+    def prev_free(self, i: int) -> int:
+        """Largest free index <= i, or -1."""
+        if i < 0 or self.count[1] == 0:
+            return -1
+        node = self.size + min(i, self.n - 1)
+        if not self.count[node]:
+            while node > 1 and (not node & 1 or not self.count[node - 1]):
+                node >>= 1
+            if node == 1:
+                return -1
+            node -= 1
+            while node < self.size:
+                node = 2 * node + 1 if self.count[2 * node + 1] else 2 * node
+        return node - self.size
+
+    def longest_run(self) -> Tuple[int, int]:
+        """(length, start) of the leftmost longest run of free cells."""
+        return self.best[1], self.best_start[1]
+
+
+class ZoneSeatGrid:
+    """
+    Seats of one zone laid out on its rows x cols grid.
+
+    Each row has a _RunTree of its free seats, and one more _RunTree over the rows
+    marks which rows have any free seat, so searches skip full rows in O(log rows).
+    The longest free run of each row is kept in a max segment tree over the rows.
+    """
+
+    def __init__(self, rows: int, cols: int):
+        self.rows, self.cols = rows, cols
+        self._seats: List[Optional[Seat]] = [None] * (rows * cols)
+        self._state = bytearray(rows * cols)
+        self._row_trees = [_RunTree(cols) for _ in range(rows)]
+        self._rows_with_free = _RunTree(rows)
+        self._row_size = 1 << max(0, (rows - 1).bit_length())
+        self._row_best: List[Tuple[int, int]] = [(0, 0)] * (2 * self._row_size)  # (run length, -row)
+        self.free_count = 0
+        self._occupied = [0, 0, 0]  # count, sum of rows, sum of cols
+
+    def place(self, row: int, col: int, seat: Seat) -> None:
+        self._seats[row * self.cols + col] = seat
+        self.update(row, col, seat.status)
+
+    def update(self, row: int, col: int, status: SeatStatus) -> None:
+        cell = row * self.cols + col
+        old = self._state[cell]
+        new = _FREE if status == SeatStatus.UNOCCUPIED else _OCCUPIED if status == SeatStatus.OCCUPIED else _OTHER
+        if old == new:
+            return
+        self._state[cell] = new
+        for state, sign in ((old, -1), (new, 1)):
+            if state == _OCCUPIED:
+                self._occupied[0] += sign
+                self._occupied[1] += sign * row
+                self._occupied[2] += sign * col
+        if _FREE in (old, new):
+            self.free_count += 1 if new == _FREE else -1
+            tree = self._row_trees[row]
+            tree.set(col, new == _FREE)
+            self._rows_with_free.set(row, tree.count[1] > 0)
+            node = self._row_size + row
+            self._row_best[node] = (tree.best[1], -row)
+            node >>= 1
+            while node:
+                self._row_best[node] = max(self._row_best[2 * node], self._row_best[2 * node + 1])
+                node >>= 1
+
+    def occupied_centroid(self) -> Optional[Tuple[float, float]]:
+        count, row_sum, col_sum = self._occupied
+        return (row_sum / count, col_sum / count) if count else None
+
+    def nearest_free(self, row: float, col: float, k: int) -> List[Seat]:
+        """
+        The k free seats closest to (row, col) by straight-line distance, nearest first.
+        Rows are visited outwards from `row`; in each row the nearest free seats left and
+        right of `col` come from its tree, and a heap merges the candidates.
+        """
+        if k <= 0 or not self.free_count:
+            return []
+        heap: List[Tuple[float, int, int, int]] = []  # (squared distance, row, col, direction)
+        split = math.ceil(col)
+
+        def push(r: int, c: int, direction: int) -> None:
+            if c >= 0:
+                heapq.heappush(heap, ((r - row) ** 2 + (c - col) ** 2, r, c, direction))
+
+        def open_row(r: int) -> None:
+            tree = self._row_trees[r]
+            push(r, tree.next_free(split), 1)
+            push(r, tree.prev_free(split - 1), -1)
+
+        below = self._rows_with_free.next_free(math.ceil(row))
+        above = self._rows_with_free.prev_free(math.ceil(row) - 1)
+        result: List[Seat] = []
+        while len(result) < k:
+            # Open rows until none left unopened could beat the best candidate
+            while True:
+                gaps = [(abs(r - row), r) for r in (above, below) if r >= 0]
+                if not gaps:
+                    break
+                gap, r = min(gaps)
+                if heap and heap[0][0] <= gap * gap:
+                    break
+                open_row(r)
+                if r == below:
+                    below = self._rows_with_free.next_free(r + 1)
+                else:
+                    above = self._rows_with_free.prev_free(r - 1)
+            if not heap:
+                break
+            _, r, c, direction = heapq.heappop(heap)
+            result.append(self._seats[r * self.cols + c])
+            tree = self._row_trees[r]
+            push(r, tree.next_free(c + 1) if direction > 0 else tree.prev_free(c - 1), direction)
+        return result
+
+    def largest_free_block(self) -> List[Seat]:
+        """The longest run of adjacent free seats in one row (topmost, then leftmost)."""
+        length, neg_row = self._row_best[1]
+        if not length:
+            return []
+        row = -neg_row
+        _, start = self._row_trees[row].longest_run()
+        return self._seats[row * self.cols + start: row * self.cols + start + length]
+
+
+class SeatSpatialIndex:
+    """A ZoneSeatGrid per zone, kept current as seats change state."""
+
+    def __init__(self):
+        self._zones: Dict[str, ZoneSeatGrid] = {}
+
+    def __contains__(self, zone_id: str) -> bool:
+        return zone_id in self._zones
+
+    def clear(self) -> None:
+        self._zones = {}
+
+    def rebuild(self, zones_seats: Dict[str, List[Seat]]) -> None:
+        rebuilt = SeatSpatialIndex()
+        for zone_id, seats in zones_seats.items():
+            rebuilt.add_zone(zone_id, seats)
+        self._zones = rebuilt._zones
+
+    def add_zone(self, zone_id: str, seats: Iterable[Seat]) -> None:
+        placed = [(grid_position(seat), seat) for seat in seats]
+        placed = [(position, seat) for position, seat in placed if position is not None]
+        rows = max((r for (r, _), _ in placed), default=-1) + 1
+        cols = max((c for (_, c), _ in placed), default=-1) + 1
+        grid = self._zones[zone_id] = ZoneSeatGrid(rows, cols)
+        for (r, c), seat in placed:
+            grid.place(r, c, seat)
+
+    def update(self, zone_id: str, seat: Seat) -> None:
+        """Record the seat's current status (call after changing it)."""
+        grid, position = self._zones.get(zone_id), grid_position(seat)
+        if grid is not None and position is not None:
+            grid.update(position[0], position[1], seat.status)
+
+    def free_count(self, zone_id: str) -> int:
+        grid = self._zones.get(zone_id)
+        return grid.free_count if grid is not None else 0
+
+    def occupied_centroid(self, zone_id: str) -> Optional[Tuple[float, float]]:
+        grid = self._zones.get(zone_id)
+        return grid.occupied_centroid() if grid is not None else None
+
+    def nearest_free(self, zone_id: str, near: Optional[Tuple[float, float]], k: int) -> List[Seat]:
+        """k free seats in the zone closest to `near` (the zone's middle when None)."""
+        grid = self._zones.get(zone_id)
+        if grid is None:
+            return []
+        row, col = near if near is not None else ((grid.rows - 1) / 2, (grid.cols - 1) / 2)
+        return grid.nearest_free(row, col, k)
+
+    def largest_free_block(self, zone_id: str) -> List[Seat]:
+        grid = self._zones.get(zone_id)
+        return grid.largest_free_block() if grid is not None else []
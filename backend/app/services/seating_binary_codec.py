@@ -0,0 +1,205 @@
+"""
+Compact binary encoding of a SeatingArrangement, served instead of JSON when the
+client sends `Accept: application/vnd.rtms.seating+binary`.
+
+Each zone is a grid of one byte per cell in row-major order, so the id, status and
+position of a regular seat cost nothing beyond that byte. Employee ids are stored
+once in a shared dictionary and referenced by index. All integers are little-endian;
+strings are a u16 byte length followed by UTF-8.
+
+    header   b"RTSA" | u8 format | i64 version (-1: none) | u32 total, occupied, unoccupied seats
+             | u8 ref width (2 or 4) | u32 employee count, employee ids | u16 zone count
+    zone     zone id | description (length 0xFFFF: none) | u16 rows, cols | i64 version (-1: none)
+             | rows * cols cell bytes | one employee ref per cell with HAS_EMPLOYEE, in cell order
+             | u32 count, (u32 cell, seat id) for seats whose id is not "<zone>-R<row>C<col>"
+             | u32 count, (seat id, u8 cell byte, [ref], [i32 row, col]) for seats off the grid
+
+A cell byte holds the status index + 1 (0: no seat) in its low three bits, plus the
+HAS_EMPLOYEE and HAS_POSITION flags. Seats without an explicit position are placed
+by their seat id; HAS_POSITION keeps the round trip exact for both kinds.
+"""
+import struct
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from .seat_spatial_index import position_from_seat_id
+from .synthetic_data_service import SEAT_STATUS_CODES
+
+MEDIA_TYPE = "application/vnd.rtms.seating+binary"
+ENCODING_JSON, ENCODING_BINARY = "json", "binary"
+
+_MAGIC = b"RTSA"
+_FORMAT = 1
+_STATUS_MASK = 0x07
+_HAS_EMPLOYEE = 0x08
+_HAS_POSITION = 0x10
+_NO_DESCRIPTION = 0xFFFF
+_HEADER = struct.Struct("<BqIIIBI")
+_ZONE = struct.Struct("<HHq")
+
+# Accept SeatStatus members and their plain string values (as read back from the database)
+_STATUS_INDEX: Dict[Any, int] = {}
+for _index, _status in enumerate(SEAT_STATUS_CODES):
+    _STATUS_INDEX[_status] = _STATUS_INDEX[_status.value] = _index
+
+
+def _fields(seat: Any) -> Dict[str, Any]:
+    # Seats arrive as model_dump() dicts or as Seat models
+    return seat if isinstance(seat, dict) else seat.__dict__
+
+
+def _pack_str(out: bytearray, value: str) -> None:
+    data = value.encode()
+    out += struct.pack("<H", len(data))
+    out += data
+
+
+def encode_arrangement(arrangement: Dict[str, Any]) -> bytes:
+    """Encode a SeatingArrangement-shaped dict (seats as dicts or Seat models, optional `version`)."""
+    zones = arrangement["zones"]
+    employee_refs: Dict[str, int] = {}
+    for zone in zones:
+        for seat in zone["seats"]:
+            emp_id = _fields(seat)["employee_id"]
+            if emp_id is not None and emp_id not in employee_refs:
+                employee_refs[emp_id] = len(employee_refs)
+    ref_dtype = np.dtype("<u2" if len(employee_refs) <= 0xFFFF else "<u4")
+
+    out = bytearray(_MAGIC)
+    version = arrangement.get("version")
+    out += _HEADER.pack(_FORMAT, -1 if version is None else version, arrangement["total_seats"], arrangement["occupied_seats"],
+                        arrangement["unoccupied_seats"], ref_dtype.itemsize, len(employee_refs))
+    for emp_id in employee_refs:
+        _pack_str(out, emp_id)
+    out += struct.pack("<H", len(zones))
+
+    for zone in zones:
+        zone_id, rows, cols = zone["zone_id"], zone["grid_rows"], zone["grid_cols"]
+        _pack_str(out, zone_id)
+        if zone.get("description") is None:
+            out += struct.pack("<H", _NO_DESCRIPTION)
+        else:
+            _pack_str(out, zone["description"])
+        zone_version = zone.get("version")
+        out += _ZONE.pack(rows, cols, -1 if zone_version is None else zone_version)
+
+        cells = bytearray(rows * cols)
+        cell_refs: Dict[int, int] = {}
+        renamed: List[Tuple[int, str]] = []
+        unplaced: List[Tuple[Dict[str, Any], int]] = []
+        for seat in zone["seats"]:
+            fields = _fields(seat)
+            seat_id, emp_id, position = fields["seat_id"], fields["employee_id"], fields.get("position")
+            code = _STATUS_INDEX[fields["status"]] + 1
+            if emp_id is not None:
+                code |= _HAS_EMPLOYEE
+            if position is not None:
+                code |= _HAS_POSITION
+            else:
+                position = position_from_seat_id(seat_id)
+            if position is None or not (0 <= position[0] < rows and 0 <= position[1] < cols) or cells[position[0] * cols + position[1]]:
+                unplaced.append((fields, code))
+                continue
+            cell = position[0] * cols + position[1]
+            cells[cell] = code
+            if emp_id is not None:
+                cell_refs[cell] = employee_refs[emp_id]
+            if seat_id != f"{zone_id}-R{position[0] + 1}C{position[1] + 1}":
+                renamed.append((cell, seat_id))
+
+        out += cells
+        out += np.fromiter((cell_refs[cell] for cell in sorted(cell_refs)), dtype=ref_dtype, count=len(cell_refs)).tobytes()
+        out += struct.pack("<I", len(renamed))
+        for cell, seat_id in renamed:
+            out += struct.pack("<I", cell)
+            _pack_str(out, seat_id)
+        out += struct.pack("<I", len(unplaced))
+        for fields, code in unplaced:
+            _pack_str(out, fields["seat_id"])
+            out += struct.pack("<B", code)
+            if code & _HAS_EMPLOYEE:
+                out += np.array([employee_refs[fields["employee_id"]]], dtype=ref_dtype).tobytes()
+            if code & _HAS_POSITION:
+                out += struct.pack("<ii", *fields["position"])
+    return bytes(out)
+
+
+class _Reader:
+    def __init__(self, data: bytes):
+        self.data = memoryview(data)
+        self.offset = 0
+
+    def take(self, size: int) -> memoryview:
+        chunk = self.data[self.offset:self.offset + size]
+        if len(chunk) != size:
+            raise ValueError("Truncated seating payload")
+        self.offset += size
+        return chunk
+
+    def unpack(self, fmt: struct.Struct) -> Tuple[Any, ...]:
+        return fmt.unpack(self.take(fmt.size))
+
+    def u16(self) -> int:
+        return struct.unpack("<H", self.take(2))[0]
+
+    def u32(self) -> int:
+        return struct.unpack("<I", self.take(4))[0]
+
+    def string(self, length: int = -1) -> str:
+        return str(self.take(self.u16() if length < 0 else length), "utf-8")
+
+
+def decode_arrangement(data: bytes) -> Dict[str, Any]:
+    """
+    Decode back to a SeatingArrangement-shaped dict with seats as plain dicts. Grid seats
+    come out in row-major order, followed by any seats that are not on the grid.
+    """
+    reader = _Reader(data)
+    if bytes(reader.take(4)) != _MAGIC:
+        raise ValueError("Not a seating payload")
+    fmt, version, total, occupied, unoccupied, ref_width, num_employees = reader.unpack(_HEADER)
+    if fmt != _FORMAT:
+        raise ValueError(f"Unsupported seating payload format {fmt}")
+    ref_dtype = np.dtype("<u2" if ref_width == 2 else "<u4")
+    employee_ids = [reader.string() for _ in range(num_employees)]
+    statuses = [None] + list(SEAT_STATUS_CODES)
+
+    zones = []
+    for _ in range(reader.u16()):
+        zone_id = reader.string()
+        length = reader.u16()
+        description = None if length == _NO_DESCRIPTION else reader.string(length)
+        rows, cols, zone_version = reader.unpack(_ZONE)
+        cells = np.frombuffer(reader.take(rows * cols), dtype=np.uint8)
+        filled = np.flatnonzero(cells)
+        with_employee = filled[(cells[filled] & _HAS_EMPLOYEE) != 0]
+        refs = np.frombuffer(reader.take(len(with_employee) * ref_dtype.itemsize), dtype=ref_dtype)
+        employee_at = dict(zip(with_employee.tolist(), refs.tolist()))
+        renamed = {}
+        for _ in range(reader.u32()):
+            cell = reader.u32()
+            renamed[cell] = reader.string()
+
+        seats: List[Dict[str, Any]] = []
+        for cell, code in zip(filled.tolist(), cells[filled].tolist()):
+            row, col = divmod(cell, cols)
+            ref = employee_at.get(cell)
+            seats.append({
+                "seat_id": renamed.get(cell) or f"{zone_id}-R{row + 1}C{col + 1}",
+                "status": statuses[code & _STATUS_MASK],
+                "employee_id": employee_ids[ref] if ref is not None else None,
+                "position": (row, col) if code & _HAS_POSITION else None,
+            })
+        for _ in range(reader.u32()):
+            seat_id = reader.string()
+            code = reader.take(1)[0]
+            ref = int(np.frombuffer(reader.take(ref_dtype.itemsize), dtype=ref_dtype)[0]) if code & _HAS_EMPLOYEE else None
+            position = struct.unpack("<ii", reader.take(8)) if code & _HAS_POSITION else None
+            seats.append({"seat_id": seat_id, "status": statuses[code & _STATUS_MASK],
+                          "employee_id": employee_ids[ref] if ref is not None else None, "position": position})
+
+        zones.append({"zone_id": zone_id, "description": description, "grid_rows": rows, "grid_cols": cols,
+                      "seats": seats, "version": None if zone_version < 0 else zone_version})
+    return {"zones": zones, "total_seats": total, "occupied_seats": occupied, "unoccupied_seats": unoccupied,
+            "version": None if version < 0 else version}
@@ -0,0 +1,261 @@
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from ..models.seating_models import Seat, SeatStatus
+from .seat_spatial_index import SeatSpatialIndex, grid_position
+
+OBJECTIVE_ZONES = "zones"    # Vacate as many zones as possible
+OBJECTIVE_ENERGY = "energy"  # Save as much zone energy (lighting + HVAC) as possible
+OBJECTIVES = (OBJECTIVE_ZONES, OBJECTIVE_ENERGY)
+
+DEFAULT_ZONE_KWH_PER_DAY = 15.0  # Lighting plus HVAC for one zone over a working day, when no per-zone figure is known
+DEFAULT_TIME_BUDGET_SECONDS = float(os.environ.get("RTMS_OPTIMIZER_TIME_BUDGET_MS", "200")) / 1000
+DP_CELL_LIMIT = 20_000_000  # Largest zones x spare-seats table solved exactly; bigger floors use the greedy search
+
+
+@dataclass
+class ConsolidationPlan:
+    moves: List[Tuple[str, str]] = field(default_factory=list)  # (employee id, new seat id)
+    vacated_zones: List[str] = field(default_factory=list)  # Occupied now, empty once the moves are done
+    opened_zones: List[str] = field(default_factory=list)  # Empty now, receiving employees
+    energy_saving_kwh: float = 0.0
+    optimal: bool = True  # False when the plan comes from the greedy search (table too large or out of time)
+
+
+def plan_consolidation(
+    zones_seats: Dict[str, List[Seat]],
+    zone_counts: Optional[Dict[str, Tuple[int, int]]] = None,
+    objective: str = OBJECTIVE_ZONES,
+    zone_kwh: Optional[Dict[str, float]] = None,
+    department_of: Optional[Callable[[str], Optional[str]]] = None,
+    time_budget_seconds: Optional[float] = None,
+    seat_index: Optional[SeatSpatialIndex] = None,
+) -> ConsolidationPlan:
+    """
+    Move employees so that whole zones end up empty.
+
+    Everyone currently seated is kept seated, so the zones left in use must hold them
+    all. Choosing which zones to close is a 0/1 knapsack over the spare seats: each
+    closed zone "costs" its usable seats and is worth one zone (or its daily kWh for
+    the energy objective), minus a small penalty per employee moved so the fewest
+    moves win among equally good plans. It is solved exactly by dynamic programming
+    when the table fits in DP_CELL_LIMIT, otherwise by a greedy pass improved with
+    zone swaps until the time budget runs out.
+
+    `zone_counts` gives (occupied, unoccupied) seats per zone when the caller already
+    tracks them; only the seats of zones touched by the plan are then read. With
+    `department_of`, movers are placed next to colleagues from the same department.
+    With a `seat_index`, movers get the free seats nearest the people they join
+    rather than the first free seats in layout order.
+    """
+    deadline = time.perf_counter() + (DEFAULT_TIME_BUDGET_SECONDS if time_budget_seconds is None else time_budget_seconds)
+    if zone_counts is None:
+        zone_counts = {
+            zone_id: (sum(seat.status == SeatStatus.OCCUPIED for seat in seats), sum(seat.status == SeatStatus.UNOCCUPIED for seat in seats))
+            for zone_id, seats in zones_seats.items()
+        }
+    zone_ids = [zone_id for zone_id, (occupied, free) in zone_counts.items() if occupied + free > 0]
+    occupied = np.array([zone_counts[z][0] for z in zone_ids], dtype=np.int64)
+    capacity = occupied + np.array([zone_counts[z][1] for z in zone_ids], dtype=np.int64)
+    kwh = np.array([(zone_kwh or {}).get(z, DEFAULT_ZONE_KWH_PER_DAY) for z in zone_ids], dtype=np.float64)
+    if not zone_ids or not occupied.any():
+        return ConsolidationPlan()
+
+    weight = kwh if objective == OBJECTIVE_ENERGY else np.ones(len(zone_ids))
+    positive = weight[weight > 0]
+    move_penalty = (positive.min() if positive.size else 1.0) / (occupied.sum() + 1)
+    value = weight - move_penalty * occupied
+    spare = int(capacity.sum() - occupied.sum())
+
+    if len(zone_ids) * (spare + 1) <= DP_CELL_LIMIT:
+        closed, optimal = _knapsack_exact(capacity, value, spare, deadline)
+    else:
+        closed, optimal = None, False
+    if closed is None:
+        closed = _knapsack_greedy(capacity, value, spare, deadline)
+
+    closed_ids = [zone_ids[i] for i in sorted(closed)]
+    kept_ids = [zone_ids[i] for i in range(len(zone_ids)) if i not in closed]
+    counts = dict(zip(zone_ids, occupied.tolist()))
+    placements = _assign_seats(zones_seats, closed_ids, kept_ids, counts, department_of, seat_index)
+
+    target_zones = {zone_id for _, _, zone_id in placements}
+    vacated = [zone_id for zone_id in closed_ids if counts[zone_id] > 0]
+    opened = [zone_id for zone_id in kept_ids if counts[zone_id] == 0 and zone_id in target_zones]
+    kwh_by_zone = dict(zip(zone_ids, kwh.tolist()))
+    saving = sum(kwh_by_zone[z] for z in vacated) - sum(kwh_by_zone[z] for z in opened)
+    return ConsolidationPlan(
+        moves=[(emp_id, seat_id) for emp_id, seat_id, _ in placements],
+        vacated_zones=vacated,
+        opened_zones=opened,
+        energy_saving_kwh=round(saving, 2),
+        optimal=optimal,
+    )
+
+
+def plan_shard(
+    zones_seats: Dict[str, List[Tuple[str, SeatStatus, Optional[str], Optional[Tuple[int, int]]]]],
+    objective: str = OBJECTIVE_ZONES,
+    zone_kwh: Optional[Dict[str, float]] = None,
+    departments: Optional[Dict[str, str]] = None,
+    time_budget_seconds: Optional[float] = None,
+) -> ConsolidationPlan:
+    """
+    plan_consolidation for one shard, as a picklable job for a worker process: seats come
+    in as (seat id, status, employee id, position) tuples and departments as a plain dict.
+    The seat index is rebuilt here, on the worker.
+    """
+    seats = {
+        zone_id: [Seat(seat_id=seat_id, status=status, employee_id=emp_id, position=position) for seat_id, status, emp_id, position in rows]
+        for zone_id, rows in zones_seats.items()
+    }
+    seat_index = SeatSpatialIndex()
+    seat_index.rebuild(seats)
+    return plan_consolidation(seats, objective=objective, zone_kwh=zone_kwh,
+                              department_of=departments.get if departments is not None else None,
+                              time_budget_seconds=time_budget_seconds, seat_index=seat_index)
+
+
+def merge_plans(plans: List[ConsolidationPlan]) -> ConsolidationPlan:
+    """Combine independent per-shard plans into one campus-wide plan."""
+    merged = ConsolidationPlan()
+    for plan in plans:
+        merged.moves.extend(plan.moves)
+        merged.vacated_zones.extend(plan.vacated_zones)
+        merged.opened_zones.extend(plan.opened_zones)
+        merged.energy_saving_kwh += plan.energy_saving_kwh
+        merged.optimal = merged.optimal and plan.optimal
+    merged.energy_saving_kwh = round(merged.energy_saving_kwh, 2)
+    return merged
+
+
+def _knapsack_exact(capacity: np.ndarray, value: np.ndarray, spare: int, deadline: float) -> Tuple[Optional[Set[int]], bool]:
+    # best[c] = highest value of a set of closed zones holding at most c seats; one
+    # vectorized pass per zone, keeping which cells took the zone for the walk back
+    best = np.zeros(spare + 1)
+    took = np.zeros((len(capacity), spare + 1), dtype=bool)
+    for i, (seats, worth) in enumerate(zip(capacity.tolist(), value.tolist())):
+        if time.perf_counter() > deadline:
+            return None, False
+        if seats > spare or worth <= 0:
+            continue
+        with_zone = best[: spare + 1 - seats] + worth
+        better = with_zone > best[seats:]
+        took[i, seats:] = better
+        best[seats:] = np.where(better, with_zone, best[seats:])
+    closed, c = set(), spare
+    for i in range(len(capacity) - 1, -1, -1):
+        if took[i, c]:
+            closed.add(i)
+            c -= int(capacity[i])
+    return closed, True
+
+
+def _knapsack_greedy(capacity: np.ndarray, value: np.ndarray, spare: int, deadline: float) -> Set[int]:
+    # Close zones in order of value per seat while they fit, then try swapping one
+    # closed zone for one or two kept ones while that improves the plan and time remains
+    order = np.argsort(-(value / capacity), kind="stable")
+    closed, used = set(), 0
+    for i in order.tolist():
+        if value[i] > 0 and used + capacity[i] <= spare:
+            closed.add(i)
+            used += int(capacity[i])
+
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        kept = [i for i in order.tolist() if i not in closed and value[i] > 0]
+        for out in sorted(closed, key=lambda i: value[i]):
+            room = spare - used + int(capacity[out])
+            gain, swap_in = 0.0, []
+            for a in kept:
+                if capacity[a] <= room and value[a] - value[out] > gain:
+                    gain, swap_in = value[a] - value[out], [a]
+            for x, a in enumerate(kept):
+                if time.perf_counter() > deadline:
+                    break
+                if capacity[a] >= room:
+                    continue
+                for b in kept[x + 1:]:
+                    if capacity[a] + capacity[b] <= room and value[a] + value[b] - value[out] > gain:
+                        gain, swap_in = value[a] + value[b] - value[out], [a, b]
+            if swap_in:
+                closed.discard(out)
+                closed.update(swap_in)
+                used = used - int(capacity[out]) + sum(int(capacity[i]) for i in swap_in)
+                improved = True
+                break
+    return closed
+
+
+def _assign_seats(zones_seats: Dict[str, List[Seat]], closed_ids: List[str], kept_ids: List[str], counts: Dict[str, int],
+                  department_of: Optional[Callable[[str], Optional[str]]], seat_index: Optional[SeatSpatialIndex]) -> List[Tuple[str, str, str]]:
+    # Returns (employee id, new seat id, new seat's zone id) for everyone in a closed zone
+    movers = [seat.employee_id for zone_id in closed_ids for seat in zones_seats[zone_id]
+              if seat.status == SeatStatus.OCCUPIED and seat.employee_id]
+    if not movers:
+        return []
+    # Fill the busiest kept zones first so the remaining layout stays compact
+    targets = sorted(kept_ids, key=lambda zone_id: -counts[zone_id])
+    taken: Set[str] = set()
+    taken_in: Dict[str, int] = {}
+
+    def free_seats(zone_id: str, near: Optional[Tuple[float, float]], n: int) -> List[str]:
+        # Up to n free seats not handed out yet; with the spatial index, the ones nearest `near`
+        if seat_index is not None and zone_id in seat_index:
+            found = seat_index.nearest_free(zone_id, near, n + taken_in.get(zone_id, 0))
+        else:
+            found = [seat for seat in zones_seats[zone_id] if seat.status == SeatStatus.UNOCCUPIED]
+        seat_ids = [seat.seat_id for seat in found if seat.seat_id not in taken][:n]
+        taken.update(seat_ids)
+        taken_in[zone_id] = taken_in.get(zone_id, 0) + len(seat_ids)
+        return seat_ids
+
+    placements = []
+    if department_of is None:
+        # Seat movers next to the people already in the zone
+        for zone_id in targets:
+            if not movers:
+                break
+            near = seat_index.occupied_centroid(zone_id) if seat_index is not None else None
+            for seat_id in free_seats(zone_id, near, len(movers)):
+                placements.append((movers.pop(), seat_id, zone_id))
+        return placements
+
+    # Department grouping: each department's movers go to the zones where most of its
+    # people already sit (next to them), largest departments choosing first
+    colleagues: Dict[str, Dict[Optional[str], List[int]]] = {}  # zone -> department -> [count, row sum, col sum]
+    for zone_id in targets:
+        departments = colleagues[zone_id] = {}
+        for seat in zones_seats[zone_id]:
+            if seat.status == SeatStatus.OCCUPIED and seat.employee_id:
+                stats = departments.setdefault(department_of(seat.employee_id), [0, 0, 0])
+                position = grid_position(seat) or (0, 0)
+                stats[0] += 1
+                stats[1] += position[0]
+                stats[2] += position[1]
+
+    by_department: Dict[Optional[str], List[str]] = {}
+    for emp_id in movers:
+        by_department.setdefault(department_of(emp_id), []).append(emp_id)
+
+    for department, employees in sorted(by_department.items(), key=lambda item: -len(item[1])):
+        preferred = sorted(targets, key=lambda zone_id: (-colleagues[zone_id].get(department, [0])[0], -counts[zone_id]))
+        for zone_id in preferred:
+            if not employees:
+                break
+            stats = colleagues[zone_id].get(department)
+            if stats and stats[0]:
+                near = (stats[1] / stats[0], stats[2] / stats[0])
+            else:
+                near = seat_index.occupied_centroid(zone_id) if seat_index is not None else None
+            seat_ids = free_seats(zone_id, near, len(employees))
+            for seat_id in seat_ids:
+                placements.append((employees.pop(), seat_id, zone_id))
+            if seat_ids:
+                colleagues[zone_id].setdefault(department, [0, 0, 0])[0] += len(seat_ids)
+    return placements
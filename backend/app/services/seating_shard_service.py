@@ -0,0 +1,60 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+# Zones are grouped into shards (one per building or floor) by a "<shard>/" prefix on the zone id,
+# e.g. "HQ-F2/ZoneA". Zones without a prefix all belong to DEFAULT_SHARD.
+SHARD_SEPARATOR = "/"
+DEFAULT_SHARD = "main"
+# "process" runs shard jobs in worker processes (off the server's GIL); "thread" keeps them in this process
+SHARD_WORKERS = os.environ.get("RTMS_SHARD_WORKERS", "process")
+
+
+def shard_of(zone_id: str) -> str:
+    shard, separator, _ = zone_id.partition(SHARD_SEPARATOR)
+    return shard if separator else DEFAULT_SHARD
+
+
+def merge_shard_occupancy(shards: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Campus-wide seat totals as sums of per-shard aggregates, never a rescan of seats."""
+    total = sum(shard["total_seats"] for shard in shards)
+    occupied = sum(shard["occupied_seats"] for shard in shards)
+    return {"shards": shards, "total_seats": total, "occupied_seats": occupied, "unoccupied_seats": total - occupied}
+
+
+class ShardWorkers:
+    """
+    One single-worker pool per shard for CPU-heavy jobs such as optimizer runs.
+    A long job in one building only queues that building's later jobs; other
+    shards run theirs in parallel, and reads never wait on any of them.
+    """
+
+    def __init__(self, mode: str = SHARD_WORKERS):
+        self.mode = mode
+        self._pools: Dict[str, Executor] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, shard: str, fn: Callable[..., Any], *args: Any) -> Future:
+        """Run fn(*args) on the shard's worker. With process workers, fn and args must be picklable."""
+        with self._lock:
+            pool = self._pools.get(shard)
+            if pool is None:
+                pool = self._pools[shard] = self._new_pool(shard)
+        return pool.submit(fn, *args)
+
+    def _new_pool(self, shard: str) -> Executor:
+        if self.mode == "process":
+            # Spawned, not forked: workers start clean instead of copying the server's threads and locks
+            return ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"shard-{shard}")
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+shard_workers = ShardWorkers()
@@ -0,0 +1,229 @@
+import json
+import math
+import os
+import sys
+import time
+from array import array
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO
+
+from pydantic import TypeAdapter, ValidationError
+
+from ..models.energy_models import SensorReading, IngestionReport, LightState, HvacStatus
+
+DEFAULT_SENSOR_JSON = Path(__file__).resolve().parents[3] / "datasets" / "mock_sensor_data.json"
+
+READ_CHUNK_CHARS = 64 * 1024
+VALIDATION_BATCH_SIZE = 1000
+
+_HVAC_CODES = {HvacStatus.OFF: 0, HvacStatus.ON: 1, HvacStatus.ECO: 2}
+
+SensorBatchListener = Callable[[List[SensorReading]], None]
+
+
+class SensorReadingStore:
+    """
+    Append-only, columnar in-process store of zone sensor snapshots.
+
+    Each field lives in a typed `array` column (8 bytes per float, 1 byte per status),
+    so memory grows with the number of readings rather than with Python object overhead.
+    Components that keep derived state (rollups, counters, baselines) register a listener
+    and are handed every validated batch as it is appended.
+    """
+
+    def __init__(self):
+        self.zone_ids: List[str] = []
+        self._zone_lookup: Dict[str, int] = {}
+        self.timestamps = array("q")  # Epoch seconds
+        self.zone_codes = array("i")
+        self.temperature_celsius = array("d")  # NaN when not reported
+        self.humidity_percent = array("d")
+        self.light_on = array("b")
+        self.ac_status = array("b")  # 0 = OFF, 1 = ON, 2 = ECO
+        self.projector_on = array("b")
+        self.energy_kwh = array("d")
+        self._listeners: List[SensorBatchListener] = []
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def add_listener(self, listener: SensorBatchListener, replay: bool = True,
+                     batch_size: int = VALIDATION_BATCH_SIZE) -> None:
+        """
+        Register a callback for appended batches; `replay` feeds it the readings already stored,
+        `batch_size` at a time so only one batch of them is ever rebuilt as objects.
+        """
+        self._listeners.append(listener)
+        if replay:
+            readings = self.iter_readings()
+            for _ in range(0, len(self), batch_size):
+                listener(list(islice(readings, batch_size)))
+
+    def zone_code(self, zone_id: str) -> int:
+        code = self._zone_lookup.get(zone_id)
+        if code is None:
+            code = self._zone_lookup[zone_id] = len(self.zone_ids)
+            self.zone_ids.append(zone_id)
+        return code
+
+    def append_batch(self, readings: List[SensorReading]) -> None:
+        for reading in readings:
+            self.timestamps.append(int(reading.timestamp.timestamp()))
+            self.zone_codes.append(self.zone_code(reading.office_zone))
+            self.temperature_celsius.append(math.nan if reading.temperature_celsius is None else reading.temperature_celsius)
+            self.humidity_percent.append(math.nan if reading.humidity_percent is None else reading.humidity_percent)
+            self.light_on.append(reading.light_status == LightState.ON)
+            self.ac_status.append(_HVAC_CODES[reading.ac_status])
+            self.projector_on.append(reading.projector_status == LightState.ON)
+            self.energy_kwh.append(reading.energy_consumption_kwh_hourly)
+        for listener in self._listeners:
+            listener(readings)
+
+    def iter_readings(self) -> Iterator[SensorReading]:
+        """Rebuild readings from the columns (used to replay history into new listeners)."""
+        hvac_by_code = {code: status for status, code in _HVAC_CODES.items()}
+        for i in range(len(self)):
+            yield SensorReading(
+                timestamp=datetime.fromtimestamp(self.timestamps[i], tz=timezone.utc),
+                office_zone=self.zone_ids[self.zone_codes[i]],
+                temperature_celsius=None if math.isnan(self.temperature_celsius[i]) else self.temperature_celsius[i],
+                humidity_percent=None if math.isnan(self.humidity_percent[i]) else self.humidity_percent[i],
+                light_status=LightState.ON if self.light_on[i] else LightState.OFF,
+                ac_status=hvac_by_code[self.ac_status[i]],
+                projector_status=LightState.ON if self.projector_on[i] else LightState.OFF,
+                energy_consumption_kwh_hourly=self.energy_kwh[i],
+            )
+
+
+def iter_json_array(handle: TextIO, chunk_chars: int = READ_CHUNK_CHARS) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array one at a time.
+
+    Only the current read chunk plus the element being decoded are held in memory,
+    so arbitrarily large files can be processed with a flat footprint.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    started = False
+    eof = False
+
+    while True:
+        # Skip whitespace and separators between elements
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+
+        if position < len(buffer):
+            if not started:
+                if buffer[position] != "[":
+                    raise ValueError("Sensor dump must be a JSON array")
+                started = True
+                position += 1
+                continue
+            if buffer[position] == "]":
+                return
+            try:
+                element, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # Element is split across chunks: fall through and read more
+            else:
+                # A bare number may be cut short by the chunk boundary ("3." of "3.25"),
+                # so only accept an element once the delimiter after it has been read
+                if eof or (end < len(buffer) and buffer[end] in " \t\r\n,]"):
+                    yield element
+                    position = end
+                    continue
+
+        if eof:
+            raise ValueError("Unexpected end of sensor dump (missing closing ']')")
+        chunk = handle.read(chunk_chars)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+_reading_batch_adapter = TypeAdapter(List[SensorReading])
+
+
+def _validate_batch(batch: List[Dict[str, Any]]) -> List[SensorReading]:
+    # Validate the whole batch in one call. If some records fail, the error locations
+    # name their indices, so drop those and validate the remainder in one more call.
+    try:
+        return _reading_batch_adapter.validate_python(batch)
+    except ValidationError as exc:
+        rejected = {error["loc"][0] for error in exc.errors() if error["loc"]}
+        if not rejected:
+            return []
+        remainder = [record for index, record in enumerate(batch) if index not in rejected]
+        return _validate_batch(remainder) if remainder else []
+
+
+def ingest_sensor_stream(handle: TextIO, store: "SensorReadingStore", source: str = "<stream>",
+                         batch_size: int = VALIDATION_BATCH_SIZE) -> IngestionReport:
+    started = time.perf_counter()
+    read = ingested = skipped = 0
+    batch: List[Dict[str, Any]] = []
+
+    def flush() -> int:
+        readings = _validate_batch(batch)
+        if readings:
+            store.append_batch(readings)
+        count = len(readings)
+        batch.clear()
+        return count
+
+    for record in iter_json_array(handle):
+        read += 1
+        if not isinstance(record, dict) or "office_zone" not in record:
+            skipped += 1
+            continue
+        batch.append(record)
+        if len(batch) >= batch_size:
+            ingested += flush()
+    if batch:
+        ingested += flush()
+
+    elapsed = time.perf_counter() - started
+    return IngestionReport(
+        source=source,
+        records_read=read,
+        records_ingested=ingested,
+        records_rejected=read - skipped - ingested,
+        records_skipped=skipped,
+        elapsed_seconds=round(elapsed, 6),
+        records_per_second=round(read / elapsed, 1) if elapsed > 0 else float(read),
+    )
+
+
+# --- Module-level store, populated lazily from the bundled dump on first use ---
+_sensor_store: Optional[SensorReadingStore] = None
+
+
+def ingest_sensor_file(path, store: Optional[SensorReadingStore] = None,
+                       batch_size: int = VALIDATION_BATCH_SIZE) -> IngestionReport:
+    store = store if store is not None else get_sensor_store()
+    with open(path, encoding="utf-8") as handle:
+        report = ingest_sensor_stream(handle, store, source=str(path), batch_size=batch_size)
+    print(f"DEBUG: sensor_ingestion_service: Ingested {report.records_ingested}/{report.records_read} records "
+          f"from {path} ({report.records_per_second} records/sec)")
+    return report
+
+
+def get_sensor_store() -> SensorReadingStore:
+    global _sensor_store
+    if _sensor_store is None:
+        _sensor_store = SensorReadingStore()
+        path = Path(os.environ.get("RTMS_SENSOR_DUMP_JSON") or DEFAULT_SENSOR_JSON)
+        if path.exists():
+            ingest_sensor_file(path, _sensor_store)
+    return _sensor_store
+
+
+if __name__ == "__main__":
+    # e.g. python -m app.services.sensor_ingestion_service /data/sensors-2024-05.json
+    for dump_path in sys.argv[1:]:
+        print(ingest_sensor_file(dump_path, SensorReadingStore()).model_dump_json(indent=2))
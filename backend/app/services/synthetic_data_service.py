@@ -0,0 +1,199 @@
+import argparse
+import hashlib
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..models.employee_models import Employee
+from ..models.seating_models import SeatStatus, Seat
+
+FIRST_NAMES = ["Alice", "Bob", "Charlie", "Diana", "Edward", "Fiona", "George", "Hannah", "Ian", "Julia", "Kevin", "Laura", "Michael", "Nora", "Oscar", "Pam", "Quincy", "Rita", "Samuel", "Tina", "Uma", "Victor", "Wendy", "Xavier", "Yvonne", "Zach"]
+LAST_NAMES = ["Smith", "Jones", "Williams", "Brown", "Davis", "Miller", "Wilson", "Moore", "Taylor", "Anderson", "Thomas", "Jackson", "White", "Harris", "Martin", "Garcia", "Martinez", "Robinson", "Clark", "Rodriguez", "Lewis", "Lee", "Walker", "Hall", "Allen"]
+DEPARTMENTS = ["Engineering", "Marketing", "Sales", "Human Resources", "Product Management", "Support", "Finance & Accounting", "Operations", "Research & Development", "Legal", "Design"]
+
+# Seat status codes used in the generated arrays
+SEAT_STATUS_CODES = (SeatStatus.UNOCCUPIED, SeatStatus.OCCUPIED, SeatStatus.RESERVED, SeatStatus.DISABLED)
+UNOCCUPIED, OCCUPIED, RESERVED, DISABLED = range(4)
+
+
+def _env_int(name: str, default: Optional[int]) -> Optional[int]:
+    value = os.environ.get(name)
+    return int(value) if value not in (None, "") else default
+
+
+@dataclass(frozen=True)
+class SyntheticConfig:
+    num_employees: int = 25
+    num_zones: int = 5
+    seat_rows: int = 5
+    seat_cols: int = 4
+    seed: Optional[int] = None
+    occupancy: float = 0.7  # Chance that a seat gets an employee (while employees remain)
+    reserved_or_disabled: float = 0.05  # Chance that an empty seat is reserved/disabled
+
+    @classmethod
+    def from_env(cls, **defaults) -> "SyntheticConfig":
+        """Read RTMS_NUM_EMPLOYEES, RTMS_NUM_ZONES, RTMS_SEAT_ROWS, RTMS_SEAT_COLS and RTMS_DATA_SEED."""
+        base = cls(**defaults)
+        return cls(
+            num_employees=_env_int("RTMS_NUM_EMPLOYEES", base.num_employees),
+            num_zones=_env_int("RTMS_NUM_ZONES", base.num_zones),
+            seat_rows=_env_int("RTMS_SEAT_ROWS", base.seat_rows),
+            seat_cols=_env_int("RTMS_SEAT_COLS", base.seat_cols),
+            seed=_env_int("RTMS_DATA_SEED", base.seed),
+            occupancy=base.occupancy,
+            reserved_or_disabled=base.reserved_or_disabled,
+        )
+
+
+@dataclass
+class SyntheticDataset:
+    """
+    Employees and seats as flat NumPy arrays. Seat `i` is in zone `i // seats_per_zone`
+    at row-major position `i % seats_per_zone`; `seat_employee` holds an employee index or -1.
+    """
+    config: SyntheticConfig
+    first_name_idx: np.ndarray
+    last_name_idx: np.ndarray
+    department_idx: np.ndarray
+    awe_points: np.ndarray
+    seat_status: np.ndarray
+    seat_employee: np.ndarray
+    zone_department_idx: np.ndarray
+
+    @property
+    def seats_per_zone(self) -> int:
+        return self.config.seat_rows * self.config.seat_cols
+
+    def checksum(self) -> str:
+        digest = hashlib.sha256()
+        for column in (self.first_name_idx, self.last_name_idx, self.department_idx, self.awe_points,
+                       self.seat_status, self.seat_employee, self.zone_department_idx):
+            digest.update(np.ascontiguousarray(column).tobytes())
+        return digest.hexdigest()[:16]
+
+
+def zone_id_for(index: int, num_buildings: int = 1) -> str:
+    """
+    ZoneA..ZoneZ, then ZoneAA, ZoneAB, ... (bijective base 26) so any zone count gets unique ids.
+    With more than one building, zones are dealt round robin to B1/, B2/, ... (one shard each).
+    """
+    letters = ""
+    rest = index + 1
+    while rest:
+        rest, remainder = divmod(rest - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return f"Zone{letters}" if num_buildings <= 1 else f"B{index % num_buildings + 1}/Zone{letters}"
+
+
+def employee_id_for(index: int, num_employees: int) -> str:
+    # emp001..emp999 like the random generator, widening only when there are more employees
+    return f"emp{index + 1:0{max(3, len(str(num_employees)))}d}"
+
+
+def generate_dataset(config: SyntheticConfig) -> SyntheticDataset:
+    """Generate employees and seat assignments with vectorized NumPy; same config + seed => same arrays."""
+    rng = np.random.default_rng(config.seed)
+    n = config.num_employees
+
+    first_name_idx = rng.integers(0, len(FIRST_NAMES), n, dtype=np.int8)
+    last_name_idx = rng.integers(0, len(LAST_NAMES), n, dtype=np.int8)
+    department_idx = rng.integers(0, len(DEPARTMENTS), n, dtype=np.int8)
+    awe_points = rng.integers(50, 451, n, dtype=np.int32)
+    dark_mode = rng.random(n) < 0.5
+    awe_points = np.minimum(awe_points + dark_mode * rng.integers(10, 51, n, dtype=np.int32), 500).astype(np.int16)
+
+    total_seats = config.num_zones * config.seat_rows * config.seat_cols
+    wants_employee = rng.random(total_seats) < config.occupancy
+    # Fill the first len(employees) "wanting" seats with a random permutation of employees
+    occupied_positions = np.flatnonzero(wants_employee)[:n]
+    seat_employee = np.full(total_seats, -1, dtype=np.int32)
+    seat_employee[occupied_positions] = rng.permutation(n)[:len(occupied_positions)]
+
+    seat_status = np.full(total_seats, UNOCCUPIED, dtype=np.uint8)
+    seat_status[occupied_positions] = OCCUPIED
+    special = (seat_status == UNOCCUPIED) & ~wants_employee & (rng.random(total_seats) < config.reserved_or_disabled)
+    seat_status[special] = np.where(rng.random(int(special.sum())) < 0.5, RESERVED, DISABLED)
+
+    return SyntheticDataset(
+        config=config,
+        first_name_idx=first_name_idx,
+        last_name_idx=last_name_idx,
+        department_idx=department_idx,
+        awe_points=awe_points,
+        seat_status=seat_status,
+        seat_employee=seat_employee,
+        zone_department_idx=rng.integers(0, len(DEPARTMENTS), config.num_zones, dtype=np.int8),
+    )
+
+
+def materialize_employees(dataset: SyntheticDataset) -> List[Employee]:
+    """Turn the employee arrays into Employee objects (seats are assigned separately)."""
+    n = dataset.config.num_employees
+    first = np.asarray(FIRST_NAMES, dtype=object)[dataset.first_name_idx]
+    last = np.asarray(LAST_NAMES, dtype=object)[dataset.last_name_idx]
+    departments = np.asarray(DEPARTMENTS, dtype=object)[dataset.department_idx].tolist()
+    points = dataset.awe_points.tolist()
+    return [
+        Employee(id=employee_id_for(i, n), name=f"{first_name} {last_name}", department=departments[i],
+                  awe_points=points[i], current_seat_id=None)
+        for i, (first_name, last_name) in enumerate(zip(first.tolist(), last.tolist()))
+    ]
+
+
+def materialize_zones(dataset: SyntheticDataset, num_buildings: int = 1) -> Tuple[Dict[str, List[Seat]], Dict[str, str], Dict[str, str]]:
+    """
+    Build Seat objects per zone, with zone ids spread over `num_buildings` (see zone_id_for).
+    Returns (seats by zone id, employee id -> seat id, zone id -> description).
+    """
+    config = dataset.config
+    n = config.num_employees
+    per_zone = dataset.seats_per_zone
+    statuses = [SEAT_STATUS_CODES[code] for code in dataset.seat_status.tolist()]
+    seat_employee = dataset.seat_employee.tolist()
+
+    zones: Dict[str, List[Seat]] = {}
+    employee_seats: Dict[str, str] = {}
+    descriptions: Dict[str, str] = {}
+    for z in range(config.num_zones):
+        zone_id = zone_id_for(z, num_buildings)
+        descriptions[zone_id] = f"Area {zone_id_for(z)[4:]} - {DEPARTMENTS[dataset.zone_department_idx[z]]} Department Focus"
+        seats = []
+        base = z * per_zone
+        for offset in range(per_zone):
+            seat_id = f"{zone_id}-R{offset // config.seat_cols + 1}C{offset % config.seat_cols + 1}"
+            emp_index = seat_employee[base + offset]
+            emp_id = employee_id_for(emp_index, n) if emp_index >= 0 else None
+            if emp_id is not None:
+                employee_seats[emp_id] = seat_id
+            seats.append(Seat(seat_id=seat_id, status=statuses[base + offset], employee_id=emp_id,
+                              position=divmod(offset, config.seat_cols)))
+        zones[zone_id] = seats
+    return zones, employee_seats, descriptions
+
+
+if __name__ == "__main__":
+    # e.g. python -m app.services.synthetic_data_service --employees 1000000 --zones 2000 --seed 42
+    parser = argparse.ArgumentParser(description="Generate a synthetic RTMS dataset and report timings.")
+    parser.add_argument("--employees", type=int, default=1_000_000)
+    parser.add_argument("--zones", type=int, default=2_000)
+    parser.add_argument("--rows", type=int, default=25)
+    parser.add_argument("--cols", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--materialize", action="store_true", help="Also build Employee/Seat objects")
+    args = parser.parse_args()
+
+    cfg = SyntheticConfig(num_employees=args.employees, num_zones=args.zones, seat_rows=args.rows,
+                          seat_cols=args.cols, seed=args.seed)
+    started = time.perf_counter()
+    data = generate_dataset(cfg)
+    print(f"generated {cfg.num_employees} employees / {len(data.seat_status)} seats "
+          f"in {time.perf_counter() - started:.3f}s (checksum {data.checksum()})")
+    if args.materialize:
+        started = time.perf_counter()
+        materialize_employees(data)
+        materialize_zones(data)
+        print(f"materialized objects in {time.perf_counter() - started:.3f}s")
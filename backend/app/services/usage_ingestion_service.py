@@ -0,0 +1,104 @@
+import asyncio
+from typing import Callable, List, Optional
+
+from pydantic import TypeAdapter
+
+from ..models.energy_models import LaptopUsageEvent
+from . import data_generation_service
+
+MAX_EVENTS_PER_REQUEST = 50_000
+MAX_BODY_BYTES = MAX_EVENTS_PER_REQUEST * 512  # Generous per-event allowance; larger bodies are refused unread
+QUEUE_MAX_BATCHES = 64  # Backpressure threshold: ~3M events at the request cap
+APPLY_CHUNK_EVENTS = 2_000  # Yield to the event loop between chunks while applying
+
+_event_list_adapter = TypeAdapter(List[LaptopUsageEvent])
+
+
+def parse_usage_events(body: bytes, ndjson: bool = False) -> List[LaptopUsageEvent]:
+    """
+    Validate a whole request body in one pass. NDJSON lines are joined into a single
+    JSON array so both formats go through one pydantic-core parse+validate call.
+    Raises pydantic.ValidationError on any invalid event.
+    """
+    if ndjson:
+        lines = [line for line in body.splitlines() if line.strip()]
+        body = b"[" + b",".join(lines) + b"]"
+    return _event_list_adapter.validate_json(body)
+
+
+def count_usage_events(body: bytes) -> int:
+    """
+    Events in a body, counted without parsing it: every event carries an "employee_id" key.
+    Cheap enough to refuse oversized batches before paying for validation.
+    """
+    return body.count(b'"employee_id"')
+
+
+class UsageEventQueue:
+    """
+    Bounded queue of validated laptop usage batches with one background consumer.
+
+    `submit` never waits: when the queue is full it returns False and the caller
+    answers with backpressure (HTTP 503 + Retry-After) instead of buffering more.
+    """
+
+    def __init__(self, apply_events: Callable[[List[LaptopUsageEvent]], None], max_batches: int = QUEUE_MAX_BATCHES):
+        self._apply_events = apply_events
+        self._max_batches = max_batches
+        self._queue: Optional[asyncio.Queue] = None
+        self._consumer: Optional[asyncio.Task] = None
+        self.events_accepted = 0
+        self.events_applied = 0
+
+    @property
+    def running(self) -> bool:
+        return self._consumer is not None and not self._consumer.done()
+
+    @property
+    def pending_batches(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self._max_batches)
+        self._consumer = asyncio.get_running_loop().create_task(self._consume())
+
+    async def stop(self) -> None:
+        """Apply what is already queued, then stop the consumer."""
+        if not self.running:
+            return
+        await self._queue.join()
+        self._consumer.cancel()
+        try:
+            await self._consumer
+        except asyncio.CancelledError:
+            pass
+        self._consumer = None
+
+    def submit(self, events: List[LaptopUsageEvent]) -> bool:
+        if not self.running:
+            return False
+        try:
+            self._queue.put_nowait(events)
+        except asyncio.QueueFull:
+            return False
+        self.events_accepted += len(events)
+        return True
+
+    async def _consume(self) -> None:
+        while True:
+            events = await self._queue.get()
+            try:
+                for start in range(0, len(events), APPLY_CHUNK_EVENTS):
+                    chunk = events[start:start + APPLY_CHUNK_EVENTS]
+                    self._apply_events(chunk)
+                    self.events_applied += len(chunk)
+                    await asyncio.sleep(0)
+            except Exception as exc:
+                print(f"DEBUG: usage_ingestion_service: failed to apply usage batch: {exc!r}")
+            finally:
+                self._queue.task_done()
+
+
+laptop_usage_queue = UsageEventQueue(lambda events: data_generation_service.apply_laptop_usage_events(events))
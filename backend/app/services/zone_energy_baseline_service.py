@@ -0,0 +1,128 @@
+import json
+import os
+import re
+from datetime import timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ..models.energy_models import LightState, SensorReading
+from .energy_summary_service import COMPONENT_HVAC, COMPONENT_LIGHTING, split_metered_kwh
+from .sensor_ingestion_service import get_sensor_store
+
+# Readings carry no head count, so a zone counts as occupied in a reading when its lights
+# are on (lights follow occupancy; see lighting_state_for_zone) and as vacant otherwise
+VACANT, OCCUPIED = 0, 1
+_LIGHTING, _HVAC = 0, 1
+
+# Sensors name zones their own way ("A1", "B2"); seating uses "ZoneA" or, with buildings, "B1/ZoneA".
+# RTMS_SENSOR_ZONE_MAP (a JSON object, sensor zone -> seating zone) says which is which; sensor zones
+# it does not list map by convention, letters then a number ("A1") belonging to the zone with those letters
+SENSOR_ZONE_MAP: Dict[str, str] = json.loads(os.environ.get("RTMS_SENSOR_ZONE_MAP") or "{}")
+_SENSOR_ZONE_PATTERN = re.compile(r"([A-Z]+)\d+")
+
+
+def seating_zone_for(sensor_zone: str, zone_map: Optional[Dict[str, str]] = None) -> str:
+    """The seating zone id a sensor zone id belongs to; seating zone ids map to themselves."""
+    zone_map = SENSOR_ZONE_MAP if zone_map is None else zone_map
+    if sensor_zone in zone_map:
+        return zone_map[sensor_zone]
+    match = _SENSOR_ZONE_PATTERN.fullmatch(sensor_zone)
+    return f"Zone{match.group(1)}" if match else sensor_zone
+
+
+def _zone_key(zone_id: str, zone_map: Dict[str, str]) -> str:
+    # Zone letters are unique across buildings, so "B1/ZoneA" and "ZoneA" share a baseline
+    return seating_zone_for(zone_id, zone_map).rsplit("/", 1)[-1]
+
+
+class _ZoneBaseline:
+    """Running lighting and HVAC kWh sums and reading counts by (hour of day, occupancy level)."""
+
+    def __init__(self):
+        self.kwh = np.zeros((24, 2, 2))  # hour, level, (lighting, HVAC)
+        self.readings = np.zeros((24, 2), dtype=np.int64)
+
+    def add(self, hour: int, level: int, lighting_kwh: float, hvac_kwh: float) -> None:
+        self.kwh[hour, level, _LIGHTING] += lighting_kwh
+        self.kwh[hour, level, _HVAC] += hvac_kwh
+        self.readings[hour, level] += 1
+
+    def vacating_saving_kwh(self) -> float:
+        # Per hour: how often the zone is in use times how much more it draws in use than empty.
+        # Hours never seen empty compare against the zone's average empty draw (none seen: zero).
+        mean = self.kwh.sum(axis=2) / np.maximum(self.readings, 1)
+        seen_vacant = self.readings[:, VACANT].sum()
+        vacant_default = self.kwh[:, VACANT].sum() / seen_vacant if seen_vacant else 0.0
+        vacant = np.where(self.readings[:, VACANT] > 0, mean[:, VACANT], vacant_default)
+        in_use = self.readings[:, OCCUPIED] / np.maximum(self.readings.sum(axis=1), 1)
+        return float((in_use * np.maximum(mean[:, OCCUPIED] - vacant, 0.0)).sum())
+
+
+class ZoneEnergyBaselines:
+    """
+    Per-zone baseline lighting and HVAC draw by hour of day (UTC) and occupancy level,
+    learned from zone sensor readings and updated as each batch arrives. Every zone a
+    batch touches gets its daily vacating saving recomputed (a fixed 24-hour pass), so
+    reading it back for a seating plan is a dict lookup.
+
+    Readings are filed under the seating zone their sensor zone belongs to (see
+    seating_zone_for), so zones can be looked up by sensor or seating id alike.
+    """
+
+    def __init__(self, zone_map: Optional[Dict[str, str]] = None):
+        self._zone_map = SENSOR_ZONE_MAP if zone_map is None else zone_map
+        self._zones: Dict[str, _ZoneBaseline] = {}
+        self._saving: Dict[str, float] = {}
+
+    def add_readings(self, readings: List[SensorReading]) -> None:
+        touched = set()
+        for reading in readings:
+            key = _zone_key(reading.office_zone, self._zone_map)
+            baseline = self._zones.get(key)
+            if baseline is None:
+                baseline = self._zones[key] = _ZoneBaseline()
+            split = split_metered_kwh(reading)
+            level = OCCUPIED if reading.light_status == LightState.ON else VACANT
+            baseline.add(reading.timestamp.astimezone(timezone.utc).hour, level,
+                         split.get(COMPONENT_LIGHTING, 0.0), split.get(COMPONENT_HVAC, 0.0))
+            touched.add(key)
+        for key in touched:
+            self._saving[key] = self._zones[key].vacating_saving_kwh()
+
+    def __contains__(self, zone_id: str) -> bool:
+        return _zone_key(zone_id, self._zone_map) in self._zones
+
+    def draw_kwh(self, zone_id: str, hour: int, occupied: bool) -> Optional[Tuple[float, float]]:
+        """Average (lighting, HVAC) kWh in that hour of day at that occupancy; None without such readings."""
+        baseline = self._zones.get(_zone_key(zone_id, self._zone_map))
+        level = OCCUPIED if occupied else VACANT
+        if baseline is None or not baseline.readings[hour, level]:
+            return None
+        lighting, hvac = baseline.kwh[hour, level] / baseline.readings[hour, level]
+        return float(lighting), float(hvac)
+
+    def vacating_saving_kwh(self, zone_id: str) -> Optional[float]:
+        """Lighting and HVAC kWh a day saved by emptying the zone (spent by filling it); None without history."""
+        return self._saving.get(_zone_key(zone_id, self._zone_map))
+
+    def zone_kwh(self, zone_ids: Iterable[str]) -> Dict[str, float]:
+        """vacating_saving_kwh for those of the zones that have sensor history, keyed as given."""
+        savings = {}
+        for zone_id in zone_ids:
+            saving = self._saving.get(_zone_key(zone_id, self._zone_map))
+            if saving is not None:
+                savings[zone_id] = saving
+        return savings
+
+
+# --- Module-level baselines, fed by the sensor reading store ---
+_baselines: Optional[ZoneEnergyBaselines] = None
+
+
+def get_baselines() -> ZoneEnergyBaselines:
+    global _baselines
+    if _baselines is None:
+        _baselines = ZoneEnergyBaselines()
+        get_sensor_store().add_listener(_baselines.add_readings)  # Replays what is already stored
+    return _baselines
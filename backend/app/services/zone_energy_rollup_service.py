@@ -0,0 +1,130 @@
+from bisect import bisect_left, insort
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from ..models.energy_models import SensorReading
+from .energy_history_service import to_epoch_seconds
+from .sensor_ingestion_service import get_sensor_store
+
+# Tiers from finest to coarsest
+RESOLUTIONS = ("hour", "day", "month")
+_FIXED_BUCKET_SECONDS = {"hour": 3600, "day": 86400}
+
+
+def bucket_start(resolution: str, epoch_seconds: int) -> int:
+    """Start (epoch seconds, UTC) of the bucket containing `epoch_seconds`."""
+    if resolution == "month":
+        moment = datetime.fromtimestamp(epoch_seconds, tz=timezone.utc)
+        return int(datetime(moment.year, moment.month, 1, tzinfo=timezone.utc).timestamp())
+    size = _FIXED_BUCKET_SECONDS[resolution]
+    return epoch_seconds - epoch_seconds % size
+
+
+class _Tier:
+    """kWh and reading counts per (zone, bucket), with each zone's bucket starts kept sorted."""
+
+    def __init__(self, resolution: str):
+        self.resolution = resolution
+        self.buckets: Dict[str, Dict[int, List[float]]] = {}  # zone -> bucket start -> [kwh, readings]
+        self.sorted_starts: Dict[str, List[int]] = {}
+
+    def add(self, zone_id: str, epoch_seconds: int, kwh: float) -> None:
+        start = bucket_start(self.resolution, epoch_seconds)
+        zone_buckets = self.buckets.setdefault(zone_id, {})
+        bucket = zone_buckets.get(start)
+        if bucket is None:
+            bucket = zone_buckets[start] = [0.0, 0]
+            starts = self.sorted_starts.setdefault(zone_id, [])
+            if not starts or start > starts[-1]:
+                starts.append(start)  # Readings usually arrive in time order
+            else:
+                insort(starts, start)
+        bucket[0] += kwh
+        bucket[1] += 1
+
+    def range(self, zone_id: str, start: Optional[int], end: Optional[int]) -> List[Tuple[int, float, int]]:
+        starts = self.sorted_starts.get(zone_id, [])
+        lo = 0 if start is None else bisect_left(starts, start)
+        hi = len(starts) if end is None else bisect_left(starts, end)
+        zone_buckets = self.buckets[zone_id] if starts else {}
+        return [(s, zone_buckets[s][0], zone_buckets[s][1]) for s in starts[lo:hi]]
+
+
+class ZoneEnergyRollups:
+    """
+    Pre-aggregated hourly, daily and monthly kWh per zone, updated as readings arrive.
+
+    A query reads the coarsest tier that is no coarser than the requested resolution
+    and whose bucket edges line up with the requested window, so a year at monthly
+    resolution touches 12 buckets rather than ~8760 hourly readings.
+    """
+
+    def __init__(self):
+        self.tiers = {resolution: _Tier(resolution) for resolution in RESOLUTIONS}
+
+    def add_readings(self, readings: List[SensorReading]) -> None:
+        for reading in readings:
+            epoch_seconds = int(reading.timestamp.timestamp())
+            for tier in self.tiers.values():
+                tier.add(reading.office_zone, epoch_seconds, reading.energy_consumption_kwh_hourly)
+
+    def zone_ids(self) -> List[str]:
+        return list(self.tiers["hour"].buckets)
+
+    def pick_tier(self, resolution: str, start: Optional[int], end: Optional[int]) -> str:
+        candidates = RESOLUTIONS[:RESOLUTIONS.index(resolution) + 1]
+        for tier_resolution in reversed(candidates):
+            if all(edge is None or bucket_start(tier_resolution, edge) == edge for edge in (start, end)):
+                return tier_resolution
+        return "hour"
+
+    def series(self, zone_id: str, resolution: str, start: Optional[int] = None,
+               end: Optional[int] = None) -> Tuple[str, List[Tuple[int, float, int]]]:
+        """Return (tier used, [(bucket start, kWh, readings)]) for buckets in [start, end)."""
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unsupported resolution '{resolution}'")
+        tier_resolution = self.pick_tier(resolution, start, end)
+        rows = self.tiers[tier_resolution].range(zone_id, start, end)
+        if tier_resolution == resolution:
+            return tier_resolution, rows
+
+        # Finer tier (unaligned window edges): fold its buckets into the requested resolution
+        merged: Dict[int, List[float]] = {}
+        for row_start, kwh, readings in rows:
+            bucket = merged.setdefault(bucket_start(resolution, row_start), [0.0, 0])
+            bucket[0] += kwh
+            bucket[1] += readings
+        return tier_resolution, [(s, kwh, readings) for s, (kwh, readings) in merged.items()]
+
+
+# --- Module-level rollups, fed by the sensor reading store ---
+_rollups: Optional[ZoneEnergyRollups] = None
+
+
+def get_rollups() -> ZoneEnergyRollups:
+    global _rollups
+    if _rollups is None:
+        _rollups = ZoneEnergyRollups()
+        get_sensor_store().add_listener(_rollups.add_readings)  # Replays what is already stored
+    return _rollups
+
+
+def get_zone_energy_series(zone_id: str, resolution: str = "day", start: Optional[datetime] = None,
+                           end: Optional[datetime] = None) -> Optional[Dict]:
+    rollups = get_rollups()
+    if zone_id not in rollups.tiers["hour"].buckets:
+        return None
+    tier, rows = rollups.series(zone_id, resolution, to_epoch_seconds(start), to_epoch_seconds(end))
+    points = [
+        {"bucket_start": datetime.fromtimestamp(s, tz=timezone.utc), "kwh": round(kwh, 4), "readings": readings}
+        for s, kwh, readings in rows
+    ]
+    return {
+        "zone_id": zone_id,
+        "resolution": resolution,
+        "tier_used": tier,
+        "start": start,
+        "end": end,
+        "total_kwh": round(sum(kwh for _, kwh, _ in rows), 4),
+        "points": points,
+    }
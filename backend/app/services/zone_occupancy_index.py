@@ -0,0 +1,69 @@
+from typing import Dict, Iterable, List, Optional
+
+from ..models.seating_models import Seat, SeatStatus
+
+
+def _empty_counts() -> Dict[SeatStatus, int]:
+    return {status: 0 for status in SeatStatus}
+
+
+class ZoneOccupancyCounters:
+    """
+    Seat counts per zone and status (occupied, unoccupied, reserved, disabled).
+
+    Built once from the seat layout, then kept current by reporting each seat
+    state change through `move`, so readers get per-zone occupancy in O(zones)
+    (or a single zone in O(1)) instead of rescanning every seat. A move only
+    touches its own zone's counts, so updates to different zones can run in
+    parallel under per-zone locks.
+    """
+
+    def __init__(self):
+        self._counts: Dict[str, Dict[SeatStatus, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __contains__(self, zone_id: str) -> bool:
+        return zone_id in self._counts
+
+    def clear(self) -> None:
+        self._counts = {}
+
+    def rebuild(self, zones_seats: Dict[str, List[Seat]]) -> None:
+        """Recount from scratch; only needed when the whole layout is replaced."""
+        # Built aside and swapped in, so readers never see a half-built set of counts
+        rebuilt = ZoneOccupancyCounters()
+        for zone_id, seats in zones_seats.items():
+            rebuilt.add_seats(zone_id, (seat.status for seat in seats))
+        self._counts = rebuilt._counts
+
+    def add_seats(self, zone_id: str, statuses: Iterable[SeatStatus]) -> None:
+        counts = self._counts.setdefault(zone_id, _empty_counts())
+        for status in statuses:
+            counts[status] += 1
+
+    def move(self, zone_id: str, old_status: SeatStatus, new_status: SeatStatus) -> None:
+        """Record one seat in `zone_id` changing from `old_status` to `new_status`."""
+        if old_status == new_status:
+            return
+        counts = self._counts[zone_id]
+        counts[old_status] -= 1
+        counts[new_status] += 1
+
+    def counts(self, zone_id: str) -> Optional[Dict[SeatStatus, int]]:
+        counts = self._counts.get(zone_id)
+        return dict(counts) if counts is not None else None
+
+    def occupied(self, zone_id: str) -> int:
+        counts = self._counts.get(zone_id)
+        return counts[SeatStatus.OCCUPIED] if counts is not None else 0
+
+    def occupied_by_zone(self) -> Dict[str, int]:
+        return {zone_id: counts[SeatStatus.OCCUPIED] for zone_id, counts in self._counts.items()}
+
+    def total(self, status: Optional[SeatStatus] = None) -> int:
+        """Seats with `status` across all zones, or all seats when no status is given (O(zones))."""
+        if status is None:
+            return sum(sum(counts.values()) for counts in self._counts.values())
+        return sum(counts[status] for counts in self._counts.values())
@@ -0,0 +1,83 @@
+import asyncio
+import os
+from typing import Any, Callable, Dict, Optional, Set
+
+SUBSCRIBER_QUEUE_SIZE = 256
+PRODUCER_INTERVAL_SECONDS = float(os.environ.get("RTMS_ZONE_SIM_INTERVAL_SECONDS", "5"))
+
+# Sent to a subscriber whose queue overflowed: it must re-read the full snapshot
+RESYNC_EVENT: Dict[str, Any] = {"type": "resync"}
+
+
+class ZoneStateBroadcaster:
+    """
+    Fans out zone-level lighting/HVAC changes to connected dashboards.
+
+    Every subscriber has its own bounded queue. A slow subscriber never blocks the
+    publisher: when its queue is full the backlog is dropped and it is told to resync.
+    An optional producer (the mock sensor simulation) runs only while someone listens.
+    """
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self._queue_size = queue_size
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._producer: Optional[Callable[[], Any]] = None
+        self._producer_interval = PRODUCER_INTERVAL_SECONDS
+        self._producer_task: Optional[asyncio.Task] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def set_producer(self, producer: Optional[Callable[[], Any]], interval_seconds: float = PRODUCER_INTERVAL_SECONDS) -> None:
+        self._producer = producer
+        self._producer_interval = interval_seconds
+
+    def subscribe(self) -> asyncio.Queue:
+        """Must be called from the event loop that will consume the queue."""
+        self._loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        self._subscribers.add(queue)
+        if self._producer is not None and (self._producer_task is None or self._producer_task.done()):
+            self._producer_task = self._loop.create_task(self._run_producer())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+        if not self._subscribers and self._producer_task is not None:
+            self._producer_task.cancel()
+            self._producer_task = None
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        if not self._subscribers or self._loop is None:
+            return
+        try:
+            in_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            in_loop = False
+        if in_loop:
+            self._deliver(event)
+        else:
+            # Published from a worker thread (e.g. a sync route run in the threadpool)
+            self._loop.call_soon_threadsafe(self._deliver, event)
+
+    def _deliver(self, event: Dict[str, Any]) -> None:
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC_EVENT)
+
+    async def _run_producer(self) -> None:
+        while self._subscribers:
+            await asyncio.sleep(self._producer_interval)
+            try:
+                self._producer()
+            except Exception as exc:
+                print(f"DEBUG: zone_state_stream_service: producer failed: {exc!r}")
+
+
+zone_state_broadcaster = ZoneStateBroadcaster()
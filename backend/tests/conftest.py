@@ -7,6 +7,12 @@ from unittest.mock import patch, MagicMock
 from ..app.main import app
 # Import the service that will be mocked
 from ..app.services import data_generation_service as actual_data_service
+from ..app.services import energy_history_service as actual_history_service
+from ..app.services import zone_energy_rollup_service as actual_rollup_service
+from ..app.services import energy_summary_service as actual_summary_service
+from ..app.services import database_service as actual_database_service
+from ..app.services.data_repository import get_repository, MockDataRepository, SQLiteDataRepository
+from ..app.services.seating_binary_codec import encode_arrangement
 from ..app.models.employee_models import Employee, LeaderboardEntry
 from ..app.models.energy_models import LightingZone, LightState, HvacZone, HvacStatus, LaptopUsage, LaptopMode
 from ..app.models.seating_models import SeatingArrangement, SeatingSuggestion, SeatingZone, Seat, SeatStatus
@@ -36,6 +42,9 @@ def mock_data_service():
         Employee(id="emp001", name="Test User One", department="Testing", awe_points=100, current_seat_id="A1-R1C1"),
         Employee(id="emp002", name="Test User Two", department="Testing", awe_points=200, current_seat_id="A1-R1C2"),
     ]
+    mock_service.get_mock_employee_by_id.side_effect = lambda employee_id: next(
+        (emp for emp in mock_service.get_mock_employees.return_value if emp.id == employee_id), None
+    )
     mock_service.get_mock_leaderboard.return_value = [
         {"rank": 1, "employee_id": "emp002", "name": "Test User Two", "awe_points": 200, "department": "Testing"},
         {"rank": 2, "employee_id": "emp001", "name": "Test User One", "awe_points": 100, "department": "Testing"},
@@ -63,6 +72,11 @@ def mock_data_service():
         "occupied_seats": 1,
         "unoccupied_seats": 1,
     }
+    # Like the real service, the snapshot serializes whatever the arrangement mock returns
+    mock_service.get_mock_seating_arrangement_snapshot.side_effect = lambda encoding="json", shard=None: (
+        1, SeatingArrangement(**mock_service.get_mock_seating_arrangement_and_assign_employees()).model_dump_json().encode()
+        if encoding == "json" else encode_arrangement(mock_service.get_mock_seating_arrangement_and_assign_employees())
+    )
     mock_service.get_mock_seating_suggestions.return_value = {
         "message": "Consider moving Test User One from A1-R1C1 to A1-R1C2.",
         "suggested_moves": [("emp001", "A1-R1C2")],
@@ -75,27 +89,54 @@ def mock_data_service():
     ]
 
 
-    # Patch the actual service module where it's imported in your route files.
-    # This requires knowing how the service is imported in those route modules.
-    # If routes import 'from ..services import data_generation_service', this should work.
-    # If they import 'from ..services.data_generation_service import get_mock_employees',
-    # then individual functions might need patching.
-    # Assuming 'from ..services import data_generation_service as service' or similar in routes.
+    # Routes get their data through the get_repository dependency; serve it from an
+    # uncached MockDataRepository over this mock so every request reaches the mock.
+    repository = MockDataRepository(mock_service)
+    app.dependency_overrides[get_repository] = lambda: repository
 
-    # The patch target string should be the path to where the object is *looked up*,
-    # not where it's defined. So, if your routes do `from ..services import data_generation_service`,
-    # then you patch `your_app.routes.some_route_module.data_generation_service`.
+    yield mock_service # The test function will receive this mock_service
 
-    patches = [
-        patch('backend.app.routes.employees_routes.data_generation_service', mock_service),
-        patch('backend.app.routes.energy_routes.data_generation_service', mock_service),
-        patch('backend.app.routes.seating_routes.data_generation_service', mock_service)
-    ]
+    app.dependency_overrides.pop(get_repository, None)
 
-    for p in patches:
-        p.start()
 
-    yield mock_service # The test function will receive this mock_service
+@pytest.fixture(scope="function")
+def mock_history_service():
+    """
+    Patches the energy history service used by the energy routes with a MagicMock.
+    """
+    mock_service = MagicMock(spec=actual_history_service)
+    with patch('backend.app.routes.energy_routes.energy_history_service', mock_service):
+        yield mock_service
+
+
+@pytest.fixture(scope="function")
+def mock_rollup_service():
+    """
+    Patches the zone energy rollup service used by the energy routes with a MagicMock.
+    """
+    mock_service = MagicMock(spec=actual_rollup_service)
+    with patch('backend.app.routes.energy_routes.zone_energy_rollup_service', mock_service):
+        yield mock_service
+
+
+@pytest.fixture(scope="function")
+def mock_summary_service():
+    """
+    Patches the energy summary service used by the energy routes with a MagicMock.
+    """
+    mock_service = MagicMock(spec=actual_summary_service)
+    with patch('backend.app.routes.energy_routes.energy_summary_service', mock_service):
+        yield mock_service
+
 
-    for p in patches:
-        p.stop()
+@pytest.fixture(scope="function")
+def mock_database_service():
+    """
+    Serves the routes from an SQLiteDataRepository over a MagicMock of the SQLite
+    database service. Its async query functions become AsyncMocks.
+    """
+    mock_service = MagicMock(spec=actual_database_service)
+    repository = SQLiteDataRepository(mock_service)
+    app.dependency_overrides[get_repository] = lambda: repository
+    yield mock_service
+    app.dependency_overrides.pop(get_repository, None)
@@ -0,0 +1,51 @@
+from ..app.services.awe_points_ledger_service import AwePointsLedger, EVENTS_FILE
+
+
+def test_award_caps_total_and_notifies_listeners():
+    ledger = AwePointsLedger()
+    ledger.set_opening_balances({"emp001": 495})
+    totals = []
+    ledger.add_listener(lambda emp_id, total: totals.append((emp_id, total)))
+
+    event = ledger.award("emp001", 10, "dark_mode_usage", cap=500)
+
+    assert event.amount == 5  # Only what fits under the cap is recorded
+    assert ledger.award("emp001", 1, "dark_mode_usage", cap=500) is None
+    assert totals == [("emp001", 500)]
+    assert [e.sequence for e in ledger.history("emp001")] == [1]
+
+
+def test_restart_restores_snapshot_and_replays_tail(tmp_path):
+    ledger = AwePointsLedger(str(tmp_path), snapshot_every=3)
+    ledger.set_opening_balances({"emp001": 100, "emp002": 50})
+    for amount in (1, 2, 3, 4):  # Snapshot after the third, the fourth is only in the log
+        ledger.award("emp001", amount, "dark_mode_usage")
+    ledger.award("emp002", 7, "dark_mode_usage")
+    ledger._log.close()  # Simulate a crash: no closing snapshot
+    with open(tmp_path / EVENTS_FILE, "a") as handle:
+        handle.write('{"sequence": 99, "employee_id": "emp0')  # Interrupted write
+
+    restored = AwePointsLedger(str(tmp_path))
+
+    assert restored.sequence == 5
+    assert restored.set_opening_balances({"emp001": 0, "emp002": 0, "emp003": 20}) == {"emp001": 110, "emp002": 57, "emp003": 20}
+    assert [e.amount for e in restored.history("emp002")] == [7]
+    # History spans the snapshot: the first three awards come from the log, not from memory
+    assert [e.amount for e in restored.history("emp001")] == [4, 3, 2, 1]
+    assert [e.amount for e in restored.history("emp001", limit=3)] == [4, 3, 2]
+    assert [e.amount for e in restored.history("emp001", limit=1)] == [4]
+    restored.award("emp003", 1, "dark_mode_usage")
+    restored.close()
+    reopened = AwePointsLedger(str(tmp_path))
+    assert reopened.total_of("emp003") == 21
+    assert [e.amount for e in reopened.history("emp001")] == [4, 3, 2, 1]
+    assert [e.sequence for e in reopened.history("emp003")] == [6]
+
+
+def test_reading_laptop_usage_does_not_change_points():
+    from ..app.services import data_generation_service
+
+    before = data_generation_service.get_mock_leaderboard()
+    data_generation_service.get_mock_laptop_usage()
+    data_generation_service.get_mock_laptop_usage()
+    assert data_generation_service.get_mock_leaderboard() == before
@@ -0,0 +1,63 @@
+from fastapi.testclient import TestClient
+from unittest.mock import MagicMock, patch
+
+from ..app.services import data_generation_service
+
+# Fixtures 'client' and 'mock_data_service' are from conftest.py
+
+def _dashboard_payload(mock_data_service: MagicMock) -> dict:
+    return {
+        "leaderboard": mock_data_service.get_mock_leaderboard.return_value,
+        "laptop_usage": mock_data_service.get_mock_laptop_usage.return_value,
+        "lighting": mock_data_service.get_mock_lighting_status.return_value,
+        "hvac": mock_data_service.get_mock_hvac_status.return_value,
+        "arrangement": mock_data_service.get_mock_seating_arrangement_and_assign_employees.return_value,
+        "suggestions": mock_data_service.get_mock_seating_suggestions.return_value,
+    }
+
+def test_get_dashboard_all_sections(client: TestClient, mock_data_service: MagicMock):
+    """All widgets are returned from a single service call."""
+    mock_data_service.get_mock_dashboard.return_value = _dashboard_payload(mock_data_service)
+    response = client.get("/api/dashboard/")
+    assert response.status_code == 200
+    json_response = response.json()
+    assert json_response["leaderboard"][0]["employee_id"] == "emp002"
+    assert json_response["lighting"][0]["zone_id"] == "ZoneA"
+    assert json_response["arrangement"]["total_seats"] == 2
+    assert json_response["suggestions"]["suggested_moves"] == [["emp001", "A1-R1C2"]]
+    mock_data_service.get_mock_dashboard.assert_called_once_with(sections=None, leaderboard_limit=10)
+    mock_data_service.get_mock_lighting_status.assert_not_called()
+
+def test_get_dashboard_selected_sections(client: TestClient, mock_data_service: MagicMock):
+    payload = dict.fromkeys(_dashboard_payload(mock_data_service))
+    payload["hvac"] = mock_data_service.get_mock_hvac_status.return_value
+    mock_data_service.get_mock_dashboard.return_value = payload
+    response = client.get("/api/dashboard/?sections=hvac&leaderboard_limit=3")
+    assert response.status_code == 200
+    json_response = response.json()
+    assert json_response["hvac"][0]["status"] == "ON"
+    assert json_response["leaderboard"] is None
+    mock_data_service.get_mock_dashboard.assert_called_once_with(sections=["hvac"], leaderboard_limit=3)
+
+def test_get_dashboard_rejects_unknown_section(client: TestClient, mock_data_service: MagicMock):
+    response = client.get("/api/dashboard/?sections=weather")
+    assert response.status_code == 422
+    mock_data_service.get_mock_dashboard.assert_not_called()
+
+def test_get_dashboard_db_switch_scenario(client: TestClient, mock_data_service: MagicMock, mock_database_service: MagicMock):
+    mock_database_service.get_dashboard.return_value = {"leaderboard": mock_data_service.get_mock_leaderboard.return_value}
+    response = client.get("/api/dashboard/?sections=leaderboard&leaderboard_limit=2")
+    assert response.status_code == 200
+    assert response.json()["leaderboard"][0]["employee_id"] == "emp002"
+    mock_database_service.get_dashboard.assert_awaited_once_with(sections=["leaderboard"], leaderboard_limit=2)
+    mock_data_service.get_mock_dashboard.assert_not_called()
+
+def test_dashboard_builds_the_arrangement_only_for_its_section():
+    """The real service: a leaderboard-only dashboard never rebuilds the seating arrangement."""
+    data_generation_service.get_mock_seating_arrangement_and_assign_employees()
+    with patch.object(data_generation_service, "_zones_arrangement", wraps=data_generation_service._zones_arrangement) as built:
+        dashboard = data_generation_service.get_mock_dashboard(sections=["leaderboard"])
+        assert dashboard["leaderboard"] and dashboard["arrangement"] is None
+        assert built.call_count == 0
+        assert data_generation_service.get_mock_dashboard(sections=["arrangement"])["arrangement"]["total_seats"] > 0
+        assert built.call_count == 1
@@ -0,0 +1,134 @@
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+from ..app.services import data_generation_service as actual_data_service
+from ..app.services.data_repository import CachedDataRepository, FileDataRepository, MockDataRepository
+from ..app.services.read_through_cache import ReadThroughCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _mock_backend():
+    service = MagicMock(spec=actual_data_service)
+    service.get_mock_leaderboard.return_value = [{"rank": 1, "employee_id": "emp001"}]
+    service.get_mock_laptop_usage.return_value = []
+    backend = MockDataRepository(service)
+    # The repository subscribed to the service's change notifications; grab that callback
+    notify_service_change = service.add_change_listener.call_args[0][0]
+    return service, backend, notify_service_change
+
+
+def test_cached_reads_hit_until_ttl_or_invalidation():
+    service, backend, notify_service_change = _mock_backend()
+    clock = FakeClock()
+    repo = CachedDataRepository(backend, ReadThroughCache(clock=clock), policy={"leaderboard": (5.0, ("employees",))})
+
+    for _ in range(3):
+        asyncio.run(repo.leaderboard(10))
+    assert service.get_mock_leaderboard.call_count == 1
+
+    notify_service_change("laptop_usage")  # Unrelated topic: still cached
+    asyncio.run(repo.leaderboard(10))
+    assert service.get_mock_leaderboard.call_count == 1
+
+    notify_service_change("employees")
+    asyncio.run(repo.leaderboard(10))
+    assert service.get_mock_leaderboard.call_count == 2
+
+    clock.now = 5.5
+    asyncio.run(repo.leaderboard(10))
+    assert service.get_mock_leaderboard.call_count == 3
+
+
+def test_cache_evicts_least_recently_used_entry():
+    cache = ReadThroughCache(max_entries=2)
+    keys = {name: cache.lookup(name, ())[0] for name in "abc"}
+    cache.store(keys["a"], 60, 1)
+    cache.store(keys["b"], 60, 2)
+    cache.lookup("a", ())  # "a" is now more recent than "b"
+    cache.store(keys["c"], 60, 3)
+
+    assert len(cache) == 2
+    assert cache.lookup("b", ())[1] is None
+    assert cache.lookup("a", ())[1][1] == 1
+
+
+def test_file_repository_saves_and_reloads_state(tmp_path):
+    path = str(tmp_path / "state.json")
+    state = {"employees": [], "zones": {"ZoneA": []}, "laptop_usage": []}
+    first = MagicMock(spec=actual_data_service)
+    first.export_mock_state.return_value = state
+    FileDataRepository(path, service=first)
+    with open(path) as handle:
+        assert json.load(handle) == state
+
+    second = MagicMock(spec=actual_data_service)
+    FileDataRepository(path, service=second)
+    second.load_mock_state.assert_called_once_with(state)
+
+
+class FakeTimer:
+    """Stands in for threading.Timer: records the delay and runs only when the test fires it."""
+
+    created = []
+
+    def __init__(self, delay, function):
+        self.delay, self.function = delay, function
+        self.daemon = self.started = self.cancelled = False
+        FakeTimer.created.append(self)
+
+    def start(self):
+        self.started = True
+
+    def cancel(self):
+        self.cancelled = True
+
+    def fire(self):
+        self.function()
+
+
+def test_file_repository_saves_changes_on_a_timer_and_on_close(tmp_path, monkeypatch):
+    """Changes never save on the writer's thread; a burst is saved once after the interval, and close flushes."""
+    monkeypatch.setattr(FakeTimer, "created", [])
+    path = str(tmp_path / "state.json")
+    clock = FakeClock()
+    service = MagicMock(spec=actual_data_service)
+    service.export_mock_state.return_value = {"version": 1}
+    repo = FileDataRepository(path, service=service, save_interval_seconds=5, clock=clock, timer=FakeTimer)
+    notify_service_change = service.add_change_listener.call_args[0][0]
+
+    clock.now = 2.0
+    service.export_mock_state.return_value = {"version": 2}
+    for _ in range(5):
+        notify_service_change("seating")
+    assert service.export_mock_state.call_count == 1  # Only the initial save so far
+    [timer] = FakeTimer.created  # One save scheduled for the whole burst, due 5s after the last one
+    assert timer.started and timer.delay == 3.0
+    timer.fire()
+    assert service.export_mock_state.call_count == 2
+    with open(path) as handle:
+        assert json.load(handle) == {"version": 2}
+
+    service.export_mock_state.return_value = {"version": 3}
+    notify_service_change("employees")
+    assert len(FakeTimer.created) == 2
+    repo.close()  # Well before the next save is due
+    assert FakeTimer.created[1].cancelled
+    with open(path) as handle:
+        assert json.load(handle) == {"version": 3}
+    notify_service_change("employees")  # Late changes after close schedule nothing
+    assert len(FakeTimer.created) == 2 and service.export_mock_state.call_count == 3
+
+
+def test_closing_a_repository_unsubscribes_it_from_the_service():
+    before = list(actual_data_service._change_listeners)
+    for _ in range(3):
+        MockDataRepository().close()
+    assert actual_data_service._change_listeners == before
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+
+import pytest
+
+from ..app.models.energy_models import LaptopMode, LaptopUsageEvent
+from ..app.services import database_service
+
+
+@pytest.fixture
+def sqlite_db(tmp_path, monkeypatch):
+    """A freshly seeded database with 30 employees in 3 zones of 4x5 seats."""
+    for name, value in {"RTMS_NUM_EMPLOYEES": "30", "RTMS_NUM_ZONES": "3", "RTMS_SEAT_ROWS": "4",
+                        "RTMS_SEAT_COLS": "5", "RTMS_DATA_SEED": "11"}.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.setattr(database_service, "DATABASE_PATH", str(tmp_path / "rtms.sqlite3"))
+    database_service.close_pool()
+    yield database_service
+    database_service.close_pool()
+
+
+def test_database_uses_wal_and_serves_leaderboard_in_rank_order(sqlite_db):
+    pool = sqlite_db.get_pool()
+    assert pool.run_sync(lambda conn: conn.execute("PRAGMA journal_mode").fetchone()[0]) == "wal"
+
+    leaderboard = asyncio.run(sqlite_db.get_leaderboard(limit=None))
+    assert len(leaderboard) == 30
+    keys = [(-entry["awe_points"], entry["employee_id"]) for entry in leaderboard]
+    assert keys == sorted(keys)
+
+    middle = leaderboard[14]
+    rank = asyncio.run(sqlite_db.get_employee_rank(middle["employee_id"], window=3))
+    assert rank["rank"] == 15
+    assert rank["above"] == leaderboard[11:14]
+    assert rank["below"] == leaderboard[15:18]
+
+
+def test_usage_events_award_points_in_one_transaction(sqlite_db):
+    emp = asyncio.run(sqlite_db.get_employees(0, 1))[0]
+    events = [LaptopUsageEvent(employee_id=emp.id, hours_on=1.25, mode=LaptopMode.DARK),
+              LaptopUsageEvent(employee_id=emp.id, hours_on=0.25, mode=LaptopMode.DARK),
+              LaptopUsageEvent(employee_id="nobody", hours_on=4.0, mode=LaptopMode.DARK)]
+
+    assert asyncio.run(sqlite_db.apply_laptop_usage_events(events)) == 2
+
+    updated = asyncio.run(sqlite_db.get_employee_by_id(emp.id))
+    history = asyncio.run(sqlite_db.get_points_history(emp.id))
+    expected = min(emp.awe_points + 3, 500)
+    assert updated.awe_points == expected
+    assert sum(event["amount"] for event in history) == expected - emp.awe_points
+
+
+def test_arrangement_matches_zone_occupancy(sqlite_db):
+    arrangement = asyncio.run(sqlite_db.get_seating_arrangement())
+    occupancy = asyncio.run(sqlite_db.get_zone_occupancy())
+    assert arrangement["total_seats"] == 60
+    assert sum(occupancy.values()) == arrangement["occupied_seats"]
+    assert [zone["zone_id"] for zone in arrangement["zones"]] == list(occupancy)
+
+
+def test_suggestions_plan_off_the_pool_threads(sqlite_db, monkeypatch):
+    """The optimizer search runs on its own thread, so it never holds a pooled connection."""
+    planned_on = []
+    real_suggestion = database_service.data_generation_service.consolidation_suggestion
+
+    def recording_suggestion(zones_seats, **kwargs):
+        planned_on.append((threading.current_thread().name, kwargs["department_of"]))
+        return real_suggestion(zones_seats, **kwargs)
+
+    monkeypatch.setattr(database_service.data_generation_service, "consolidation_suggestion", recording_suggestion)
+    suggestion = asyncio.run(sqlite_db.get_seating_suggestions(group_by_department=True))
+    assert "message" in suggestion
+    (thread_name, department_of), = planned_on
+    assert not thread_name.startswith("rtms-sqlite")
+    employee = asyncio.run(sqlite_db.get_employees(0, 1))[0]
+    assert department_of(employee.id) == employee.department or employee.current_seat_id is None
@@ -1,3 +1,5 @@
+import json
+
 from fastapi.testclient import TestClient
 from unittest.mock import MagicMock  # Fixtures 'client' and 'mock_data_service' are from conftest.py
 
@@ -43,12 +45,13 @@ def test_read_employees_pagination(client: TestClient, mock_data_service: MagicM
     assert response_skip_over.json() == []
 
 
-def test_read_employees_db_switch_scenario(client: TestClient, mock_data_service: MagicMock):
-    mock_data_service.USE_DATABASE_SWITCH = True
-    response = client.get("/api/employees/")
-    assert response.status_code == 501
-    assert response.json() == {"detail": "Database connection not implemented yet."}
-    mock_data_service.USE_DATABASE_SWITCH = False
+def test_read_employees_db_switch_scenario(client: TestClient, mock_data_service: MagicMock, mock_database_service: MagicMock):
+    mock_database_service.get_employees.return_value = mock_data_service.get_mock_employees.return_value[1:]
+    response = client.get("/api/employees/?skip=1&limit=5")
+    assert response.status_code == 200
+    assert [emp["id"] for emp in response.json()] == ["emp002"]
+    mock_database_service.get_employees.assert_awaited_once_with(1, 5)
+    mock_data_service.get_mock_employees.assert_not_called()
 
 
 # ---------- Employee Details ----------
@@ -59,21 +62,22 @@ def test_read_employee_by_id_success(client: TestClient, mock_data_service: Magi
     json_response = response.json()
     assert json_response["id"] == "emp001"
     assert json_response["name"] == "Test User One"
-    mock_data_service.get_mock_employees.assert_called()
+    mock_data_service.get_mock_employee_by_id.assert_called_once_with("emp001")
+    mock_data_service.get_mock_employees.assert_not_called()
 
 
 def test_read_employee_by_id_not_found(client: TestClient, mock_data_service: MagicMock):
     response = client.get("/api/employees/emp999")
     assert response.status_code == 404
     assert response.json() == {"detail": "Employee not found"}
-    mock_data_service.get_mock_employees.assert_called()
+    mock_data_service.get_mock_employee_by_id.assert_called_once_with("emp999")
 
 
 def test_read_employee_by_id_internal_error_if_service_fails(client: TestClient, mock_data_service: MagicMock):
-    mock_data_service.get_mock_employees.side_effect = Exception("Unexpected service error")
+    mock_data_service.get_mock_employee_by_id.side_effect = Exception("Unexpected service error")
     response = client.get("/api/employees/emp001")
     assert response.status_code == 500
-    mock_data_service.get_mock_employees.assert_called_once()
+    mock_data_service.get_mock_employee_by_id.assert_called_once()
 
 
 def test_get_employee_profile_check_data_structure(client: TestClient, mock_data_service: MagicMock):
@@ -102,7 +106,7 @@ def test_get_leaderboard_success(client: TestClient, mock_data_service: MagicMoc
     assert len(json_response) == 2
     assert json_response[0]["rank"] == 1
     assert json_response[0]["employee_id"] == "emp002"
-    mock_data_service.get_mock_leaderboard.assert_called_once()
+    mock_data_service.get_mock_leaderboard.assert_called_once_with(limit=10)
 
 
 def test_get_leaderboard_limit_param(client: TestClient, mock_data_service: MagicMock):
@@ -114,7 +118,7 @@ def test_get_leaderboard_limit_param(client: TestClient, mock_data_service: Magi
     response = client.get("/api/employees/leaderboard/?limit=1")
     assert response.status_code == 200
     assert response.json()[0]["employee_id"] == "emp003"
-    mock_data_service.get_mock_leaderboard.assert_called_once()
+    mock_data_service.get_mock_leaderboard.assert_called_once_with(limit=1)
 
 
 def test_get_leaderboard_empty_if_no_employees(client: TestClient, mock_data_service: MagicMock):
@@ -141,3 +145,96 @@ def test_get_leaderboard_check_data_structure(client: TestClient, mock_data_serv
         assert isinstance(entry["name"], str)
         assert isinstance(entry["awe_points"], int)
         assert isinstance(entry["department"], str)
+
+
+# ---------- Employee Rank ----------
+
+def test_read_employee_rank_success(client: TestClient, mock_data_service: MagicMock):
+    mock_data_service.get_mock_employee_rank.return_value = {
+        "employee_id": "emp001",
+        "rank": 2,
+        "awe_points": 100,
+        "total_ranked": 2,
+        "above": [{"rank": 1, "employee_id": "emp002", "name": "Test User Two", "awe_points": 200, "department": "Testing"}],
+        "below": [],
+    }
+    response = client.get("/api/employees/emp001/rank?window=1")
+    assert response.status_code == 200
+    json_response = response.json()
+    assert json_response["rank"] == 2
+    assert json_response["above"][0]["employee_id"] == "emp002"
+    assert json_response["below"] == []
+    mock_data_service.get_mock_employee_rank.assert_called_once_with("emp001", window=1)
+
+
+def test_read_employee_rank_not_found(client: TestClient, mock_data_service: MagicMock):
+    mock_data_service.get_mock_employee_rank.return_value = None
+    response = client.get("/api/employees/emp999/rank")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Employee not found"}
+    mock_data_service.get_mock_employee_rank.assert_called_once_with("emp999", window=5)
+
+
+def test_read_employee_rank_rejects_oversized_window(client: TestClient, mock_data_service: MagicMock):
+    response = client.get("/api/employees/emp001/rank?window=500")
+    assert response.status_code == 422
+    mock_data_service.get_mock_employee_rank.assert_not_called()
+
+
+# ---------- Cursor Pagination & Streaming ----------
+
+def test_read_employees_cursor_page_sets_next_cursor(client: TestClient, mock_data_service: MagicMock):
+    page = mock_data_service.get_mock_employees.return_value
+    mock_data_service.get_mock_employees_page.return_value = page
+    response = client.get("/api/employees/?cursor=&limit=2")
+    assert response.status_code == 200
+    assert [emp["id"] for emp in response.json()] == ["emp001", "emp002"]
+    assert response.headers["X-Next-Cursor"] == "emp002"
+    mock_data_service.get_mock_employees_page.assert_called_once_with("", 2)
+    mock_data_service.get_mock_employees.assert_not_called()
+
+
+def test_read_employees_cursor_last_page_has_no_next_cursor(client: TestClient, mock_data_service: MagicMock):
+    mock_data_service.get_mock_employees_page.return_value = mock_data_service.get_mock_employees.return_value[1:]
+    response = client.get("/api/employees/?cursor=emp001&limit=2")
+    assert response.status_code == 200
+    assert [emp["id"] for emp in response.json()] == ["emp002"]
+    assert "X-Next-Cursor" not in response.headers
+    mock_data_service.get_mock_employees_page.assert_called_once_with("emp001", 2)
+
+
+def test_read_employees_rejects_out_of_range_limit(client: TestClient, mock_data_service: MagicMock):
+    for query in ("cursor=&limit=-2", "limit=0", "limit=1001", "skip=-1"):
+        assert client.get(f"/api/employees/?{query}").status_code == 422
+    mock_data_service.get_mock_employees_page.assert_not_called()
+    mock_data_service.get_mock_employees.assert_not_called()
+
+
+def test_read_employees_ndjson_stream(client: TestClient, mock_data_service: MagicMock):
+    mock_data_service.iter_mock_employees.return_value = iter(mock_data_service.get_mock_employees.return_value)
+    response = client.get("/api/employees/", headers={"Accept": "application/x-ndjson"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [emp["id"] for emp in lines] == ["emp001", "emp002"]
+    mock_data_service.iter_mock_employees.assert_called_once_with(None)
+
+
+# ---------- Awe Points History ----------
+
+def test_read_points_history_success(client: TestClient, mock_data_service: MagicMock):
+    mock_data_service.get_mock_points_history.return_value = [
+        {"sequence": 7, "employee_id": "emp001", "amount": 3, "reason": "dark_mode_usage", "timestamp": "2024-05-01T09:00:00Z"},
+    ]
+    response = client.get("/api/employees/emp001/points-history?limit=5")
+    assert response.status_code == 200
+    assert response.json()[0]["sequence"] == 7
+    assert response.json()[0]["reason"] == "dark_mode_usage"
+    mock_data_service.get_mock_points_history.assert_called_once_with("emp001", limit=5)
+
+
+def test_read_points_history_not_found(client: TestClient, mock_data_service: MagicMock):
+    mock_data_service.get_mock_points_history.return_value = None
+    response = client.get("/api/employees/emp999/points-history")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Employee not found"}
@@ -0,0 +1,108 @@
+import csv
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from ..app.services import energy_history_service
+from ..app.services.energy_history_service import HISTORY_METRICS, EnergyHistoryStore
+
+START = datetime(2023, 10, 2, 9, tzinfo=timezone.utc)  # A Monday
+
+
+@pytest.fixture
+def history(tmp_path):
+    """Three weeks of daily records for four employees over two zones, written as a sample-style CSV."""
+    rng = random.Random(12)
+    records = []
+    for day in range(21):
+        for emp in range(4):
+            records.append({
+                "timestamp": (START + timedelta(days=day)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "employee_id": f"emp00{emp + 1}",
+                "light_zone_used": "ZoneA" if emp < 2 else "ZoneB",
+                **{metric: round(rng.uniform(0, 8), 2) for metric in HISTORY_METRICS},
+            })
+    rng.shuffle(records)  # The store sorts by time itself
+    path = tmp_path / "usage.csv"
+    with open(path, "w", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=list(records[0]))
+        writer.writeheader()
+        writer.writerows(records)
+    return path, records
+
+
+def _epoch(moment):
+    return int(moment.timestamp())
+
+
+def _scan(records, key, value, start, end, aggregation):
+    # Brute force over the raw records, with both window edges inclusive like the store
+    rows = [r for r in records if r[key] == value
+            and (start is None or _epoch(datetime.fromisoformat(r["timestamp"].replace("Z", "+00:00"))) >= start)
+            and (end is None or _epoch(datetime.fromisoformat(r["timestamp"].replace("Z", "+00:00"))) <= end)]
+    if not rows:
+        return 0, {metric: (0.0 if aggregation == "sum" else None) for metric in HISTORY_METRICS}
+    reduce = {"sum": sum, "mean": lambda values: sum(values) / len(values), "max": max}[aggregation]
+    return len(rows), {metric: round(reduce([r[metric] for r in rows]), 4) for metric in HISTORY_METRICS}
+
+
+@pytest.mark.parametrize("aggregation", ["sum", "mean", "max"])
+def test_daily_and_weekly_windows_match_a_scan(history, aggregation):
+    path, records = history
+    store = EnergyHistoryStore.from_csv(path)
+    assert len(store) == len(records)
+    windows = [(START + timedelta(days=d), START + timedelta(days=d, hours=23)) for d in (0, 6, 20)]
+    windows += [(START + timedelta(weeks=w), START + timedelta(weeks=w, days=6, hours=23)) for w in range(3)]
+    windows += [(None, None)]
+
+    for start, end in windows:
+        start_s = None if start is None else _epoch(start)
+        end_s = None if end is None else _epoch(end)
+        for emp_id in ("emp001", "emp004"):
+            result = store.employee_aggregate(emp_id, start_s, end_s, aggregation)
+            count, values = _scan(records, "employee_id", emp_id, start_s, end_s, aggregation)
+            assert result["record_count"] == count
+            assert result["values"] == pytest.approx(values)
+        result = store.zone_aggregate("ZoneB", start_s, end_s, aggregation)
+        count, values = _scan(records, "light_zone_used", "ZoneB", start_s, end_s, aggregation)
+        assert result["record_count"] == count
+        assert result["values"] == pytest.approx(values)
+
+
+def test_window_edges_are_inclusive(history):
+    store = EnergyHistoryStore.from_csv(history[0])
+    day = _epoch(START + timedelta(days=3))
+    assert store.employee_aggregate("emp002", day, day)["record_count"] == 1
+    assert store.employee_aggregate("emp002", day + 1, day + 86400 - 1)["record_count"] == 0
+    assert store.employee_aggregate("emp002", day - 86400 + 1, day)["record_count"] == 1
+    # Open-ended windows reach the first and last records
+    assert store.employee_aggregate("emp002", None, _epoch(START))["record_count"] == 1
+    assert store.employee_aggregate("emp002", _epoch(START + timedelta(days=20)), None)["record_count"] == 1
+    # Zone blocks do not bleed into their neighbours
+    assert store.zone_aggregate("ZoneA", None, None)["record_count"] == 42
+
+
+def test_empty_ranges_unknown_ids_and_empty_store(history):
+    store = EnergyHistoryStore.from_csv(history[0])
+    before = _epoch(START - timedelta(days=30))
+    empty_sum = store.employee_aggregate("emp001", before, before + 86400, "sum")
+    assert empty_sum == {"record_count": 0, "values": dict.fromkeys(HISTORY_METRICS, 0.0)}
+    assert store.zone_aggregate("ZoneA", before, before + 86400, "mean")["values"] == dict.fromkeys(HISTORY_METRICS, None)
+    assert store.employee_aggregate("emp001", _epoch(START) + 10, _epoch(START))["record_count"] == 0  # start after end
+
+    assert store.employee_aggregate("emp999") is None
+    assert store.zone_aggregate("ZoneZ") is None
+    with pytest.raises(ValueError):
+        store.employee_aggregate("emp001", aggregation="median")
+    assert EnergyHistoryStore.empty().employee_aggregate("emp001") is None
+
+
+def test_module_aggregates_take_datetimes(history, monkeypatch):
+    monkeypatch.setattr(energy_history_service, "_history_store", None)
+    energy_history_service.load_history(history[0])
+    naive_start = datetime(2023, 10, 2, 9)  # Read as UTC
+    result = energy_history_service.get_employee_history_aggregate("emp003", naive_start, naive_start + timedelta(days=6, hours=23))
+    assert result["scope"] == "employee" and result["key"] == "emp003" and result["record_count"] == 7
+    assert energy_history_service.get_zone_history_aggregate("ZoneA", aggregation="max")["record_count"] == 42
+    assert energy_history_service.get_zone_history_aggregate("Nowhere") is None
@@ -1,5 +1,6 @@
 from fastapi.testclient import TestClient
-from unittest.mock import MagicMock
+import json
+from unittest.mock import MagicMock, patch
 
 from ..app.models.energy_models import LaptopMode, LightState, HvacStatus # For asserting values
 
@@ -39,17 +40,16 @@ def test_get_hvac_status_data_success(client: TestClient, mock_data_service: Mag
     assert json_response[0]["current_temp_celsius"] == 22.0
     mock_data_service.get_mock_hvac_status.assert_called_once()
 
-# Example of testing with DB switch for one of the energy routes
-def test_get_laptop_usage_db_switch_scenario(client: TestClient, mock_data_service: MagicMock):
-    """Test the laptop usage route when USE_DATABASE_SWITCH is True (expect 501)."""
-    mock_data_service.USE_DATABASE_SWITCH = True # Simulate DB mode
+# Example of testing the SQLite backend for one of the energy routes
+def test_get_laptop_usage_db_switch_scenario(client: TestClient, mock_data_service: MagicMock, mock_database_service: MagicMock):
+    """Test the laptop usage route with the SQLite backend."""
+    mock_database_service.get_laptop_usage.return_value = [{"employee_id": "emp009", "hours_on": 3.0, "mode": "Dark Mode"}]
 
     response = client.get("/api/energy/laptop-usage/")
-    assert response.status_code == 501
-    assert response.json() == {"detail": "Database connection not implemented yet."}
-
-    # Reset for other tests if the mock_data_service is function-scoped and reused
-    mock_data_service.USE_DATABASE_SWITCH = False
+    assert response.status_code == 200
+    assert response.json() == [{"employee_id": "emp009", "hours_on": 3.0, "mode": "Dark Mode"}]
+    mock_database_service.get_laptop_usage.assert_awaited_once()
+    mock_data_service.get_mock_laptop_usage.assert_not_called()
 
 # Placeholder for projector usage tests if that endpoint was added to energy_routes
 # def test_get_projector_usage_data_success(client: TestClient, mock_data_service: MagicMock):
@@ -63,4 +63,131 @@ def test_get_laptop_usage_db_switch_scenario(client: TestClient, mock_data_servi
 #     json_response = response.json()
 #     assert len(json_response) == 1
 #     assert json_response[0]["room_id"] == "MeetingRoom101"
-#     mock_data_service.get_mock_projector_usage.assert_called_once()
\ No newline at end of file
+#     mock_data_service.get_mock_projector_usage.assert_called_once()
+
+# ---------- Usage History ----------
+
+def test_get_employee_energy_history_success(client: TestClient, mock_history_service: MagicMock):
+    mock_history_service.get_employee_history_aggregate.return_value = {
+        "scope": "employee", "key": "emp001", "start": None, "end": None, "aggregation": "mean",
+        "record_count": 2, "values": {"laptop_hours": 7.5, "light_hours_on": 6.0},
+    }
+    response = client.get("/api/energy/history/employees/emp001?agg=mean")
+    assert response.status_code == 200
+    json_response = response.json()
+    assert json_response["record_count"] == 2
+    assert json_response["values"]["laptop_hours"] == 7.5
+    mock_history_service.get_employee_history_aggregate.assert_called_once_with("emp001", start=None, end=None, aggregation="mean")
+
+
+def test_get_zone_energy_history_not_found(client: TestClient, mock_history_service: MagicMock):
+    mock_history_service.get_zone_history_aggregate.return_value = None
+    response = client.get("/api/energy/history/zones/Z9?start=2023-10-01T00:00:00Z")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "No history for this zone"}
+
+
+def test_get_energy_history_rejects_unknown_aggregation(client: TestClient, mock_history_service: MagicMock):
+    response = client.get("/api/energy/history/zones/A1?agg=median")
+    assert response.status_code == 422
+    mock_history_service.get_zone_history_aggregate.assert_not_called()
+
+
+# ---------- Zone Consumption Rollups ----------
+
+def test_get_zone_energy_consumption_success(client: TestClient, mock_rollup_service: MagicMock):
+    mock_rollup_service.get_zone_energy_series.return_value = {
+        "zone_id": "A1", "resolution": "day", "tier_used": "day", "start": None, "end": None, "total_kwh": 3.5,
+        "points": [{"bucket_start": "2023-10-27T00:00:00Z", "kwh": 3.5, "readings": 2}],
+    }
+    response = client.get("/api/energy/zones/A1/consumption")
+    assert response.status_code == 200
+    json_response = response.json()
+    assert json_response["tier_used"] == "day"
+    assert json_response["points"][0]["kwh"] == 3.5
+    mock_rollup_service.get_zone_energy_series.assert_called_once_with("A1", resolution="day", start=None, end=None)
+
+
+def test_get_zone_energy_consumption_unknown_zone(client: TestClient, mock_rollup_service: MagicMock):
+    mock_rollup_service.get_zone_energy_series.return_value = None
+    response = client.get("/api/energy/zones/Z9/consumption?resolution=month")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "No sensor data for this zone"}
+
+
+# ---------- Energy Summary ----------
+
+def test_get_energy_summary_success(client: TestClient, mock_summary_service: MagicMock):
+    mock_summary_service.get_energy_summary.return_value = {
+        "total_consumption_kwh_today": 12.5,
+        "comparison_yesterday_percentage": -4.2,
+        "main_contributors": [
+            {"component_name": "HVAC", "usage_metric": "kWh", "current_value": 7.5, "trend": "down", "recommendation": None},
+        ],
+    }
+    response = client.get("/api/energy/summary/")
+    assert response.status_code == 200
+    json_response = response.json()
+    assert json_response["total_consumption_kwh_today"] == 12.5
+    assert json_response["main_contributors"][0]["component_name"] == "HVAC"
+    mock_summary_service.get_energy_summary.assert_called_once_with()
+
+
+# ---------- Zone State Stream ----------
+
+def test_stream_zone_states_db_switch_scenario(client: TestClient, mock_data_service: MagicMock, mock_database_service: MagicMock):
+    response = client.get("/api/energy/stream/")
+    assert response.status_code == 501
+    assert response.json() == {"detail": "Database connection not implemented yet."}
+    mock_data_service.get_mock_zone_state_snapshot.assert_not_called()
+
+
+# ---------- Bulk Laptop Usage Ingestion ----------
+
+def test_ingest_laptop_usage_bulk_json_array(client: TestClient, mock_data_service: MagicMock):
+    events = [{"employee_id": "emp001", "hours_on": 0.5, "mode": "Dark Mode"},
+              {"employee_id": "emp002", "hours_on": 1.0, "mode": "Light Mode", "timestamp": "2023-10-27T10:00:00Z"}]
+    # Stop at the queue: the real consumer would apply the events to the shared service state
+    with patch("backend.app.services.usage_ingestion_service.laptop_usage_queue.submit", return_value=True) as submit:
+        response = client.post("/api/energy/laptop-usage/bulk", json=events)
+    assert response.status_code == 202
+    assert response.json()["accepted"] == 2
+    submitted = submit.call_args[0][0]
+    assert [(event.employee_id, event.hours_on, event.mode) for event in submitted] == [
+        ("emp001", 0.5, LaptopMode.DARK), ("emp002", 1.0, LaptopMode.LIGHT)]
+    assert submitted[0].timestamp is None and submitted[1].timestamp.year == 2023
+
+
+def test_ingest_laptop_usage_bulk_ndjson(client: TestClient, mock_data_service: MagicMock):
+    body = "\n".join(json.dumps({"employee_id": f"emp00{i}", "hours_on": 0.25}) for i in range(1, 4)) + "\n"
+    with patch("backend.app.services.usage_ingestion_service.laptop_usage_queue.submit", return_value=True) as submit:
+        response = client.post("/api/energy/laptop-usage/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert response.status_code == 202
+    assert response.json()["accepted"] == 3
+    submit.assert_called_once()
+    assert [event.employee_id for event in submit.call_args[0][0]] == ["emp001", "emp002", "emp003"]
+
+
+def test_ingest_laptop_usage_bulk_rejects_invalid_batch(client: TestClient, mock_data_service: MagicMock):
+    events = [{"employee_id": "emp001", "hours_on": 1.0}, {"employee_id": "emp002", "hours_on": -3}]
+    response = client.post("/api/energy/laptop-usage/bulk", json=events)
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"][0] == 1
+
+
+def test_ingest_laptop_usage_bulk_backpressure_when_queue_full(client: TestClient, mock_data_service: MagicMock):
+    with patch("backend.app.services.usage_ingestion_service.laptop_usage_queue.submit", return_value=False):
+        response = client.post("/api/energy/laptop-usage/bulk", json=[{"employee_id": "emp001", "hours_on": 1.0}])
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_ingest_laptop_usage_bulk_rejects_oversized_batch_before_validating(client: TestClient, mock_data_service: MagicMock):
+    """Too many events, or a body too large to hold an allowed batch, is a 413 without a parse."""
+    events = [{"employee_id": "emp001", "hours_on": 0.1}] * 50_001
+    with patch("backend.app.services.usage_ingestion_service.parse_usage_events") as parse:
+        assert client.post("/api/energy/laptop-usage/bulk", json=events).status_code == 413
+        with patch("backend.app.services.usage_ingestion_service.MAX_BODY_BYTES", 100):
+            response = client.post("/api/energy/laptop-usage/bulk", json=[{"employee_id": "emp001", "hours_on": 0.1}] * 5)
+        assert response.status_code == 413
+    parse.assert_not_called()
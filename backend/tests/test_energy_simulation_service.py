@@ -0,0 +1,92 @@
+import random
+import time
+
+import numpy as np
+import pytest
+
+from ..app.models.seating_models import Seat, SeatStatus
+from ..app.services import energy_simulation_service as sim
+from ..app.services.energy_simulation_service import EnergySimulator
+from ..app.services.seating_optimizer_service import plan_consolidation
+
+
+def _layout(rng, num_zones, seats_per_zone, occupancy):
+    zones, emp = {}, 0
+    for z in range(num_zones):
+        seats = []
+        for s in range(seats_per_zone):
+            if rng.random() < occupancy:
+                emp += 1
+                seats.append(Seat(seat_id=f"Zone{z:03d}-{s}", status=SeatStatus.OCCUPIED, employee_id=f"emp{emp:05d}"))
+            else:
+                seats.append(Seat(seat_id=f"Zone{z:03d}-{s}", status=SeatStatus.UNOCCUPIED))
+        zones[f"Zone{z:03d}"] = seats
+    return zones
+
+
+def _zones(layout):
+    return {zone_id: [(seat.seat_id, seat.employee_id) for seat in seats] for zone_id, seats in layout.items()}
+
+
+def _day_kwh_by_loop(occupied, lighting_kw=None):
+    # Straightforward step-by-step replay, one zone at a time, to check the vectorized tables against
+    total = 0.0
+    for zone_id, people in occupied.items():
+        light_kw = (lighting_kw or {}).get(zone_id, sim.ZONE_LIGHTING_KW)
+        lit = [people * share >= sim.LIGHTS_ON_PRESENCE for share in sim.PRESENCE_PROFILE]
+        for t, share in enumerate(sim.PRESENCE_PROFILE):
+            running = any(lit[t:t + sim.PRECONDITION_STEPS + 1])
+            total += sim.STEP_HOURS * (light_kw * lit[t] + running * (sim.ZONE_HVAC_KW + sim.HVAC_KW_PER_PERSON * people * share))
+        total += sim.ZONE_BASE_KW * 24
+    return total
+
+
+def test_simulation_matches_a_step_by_step_replay():
+    layout = _layout(random.Random(5), 12, 20, 0.3)
+    lighting_kw = {"Zone003": 0.9}
+    simulator = EnergySimulator.from_seats(_zones(layout), lighting_kw=lighting_kw)
+    occupied = {zone_id: sum(emp_id is not None for _, emp_id in seats) for zone_id, seats in _zones(layout).items()}
+    assert simulator.kwh_without_moves == pytest.approx(_day_kwh_by_loop(occupied, lighting_kw))
+
+    plan = plan_consolidation(layout)
+    assert plan.vacated_zones
+    result = simulator.simulate([plan.moves])[0]
+    zone_of = {seat_id: zone_id for zone_id, seats in _zones(layout).items() for seat_id, _ in seats}
+    home = {emp_id: zone_id for zone_id, seats in _zones(layout).items() for _, emp_id in seats if emp_id}
+    after = dict(occupied)
+    for emp_id, seat_id in plan.moves:
+        after[home[emp_id]] -= 1
+        after[zone_of[seat_id]] += 1
+    assert result.kwh_with_moves == pytest.approx(_day_kwh_by_loop(after, lighting_kw), abs=0.01)
+    assert result.saving_kwh > 0
+
+    # Nothing moved, nothing saved; a move to an unknown seat is rejected
+    assert simulator.simulate([[]])[0].saving_kwh == 0
+    with pytest.raises(ValueError):
+        simulator.simulate([[("emp00001", "NoSuchSeat")]])
+
+
+def test_presence_drives_lighting_and_hvac():
+    present, lit, running = sim.replay_day(np.array([0, 1, 10]))
+    assert not lit[0].any() and not running[0].any()
+    # One person keeps the lights on for less of the day than ten, and HVAC starts before the lights
+    assert 0 < lit[1].sum() < lit[2].sum()
+    assert running[2].sum() == lit[2].sum() + sim.PRECONDITION_STEPS
+    assert present[2].max() == pytest.approx(10 * sim.PRESENCE_PROFILE.max())
+
+
+def test_hundreds_of_plans_per_second():
+    layout = _layout(random.Random(9), 200, 50, 0.4)
+    simulator = EnergySimulator.from_seats(_zones(layout))
+    rng = random.Random(3)
+    employees = [seat.employee_id for seats in layout.values() for seat in seats if seat.employee_id]
+    free = [seat.seat_id for seats in layout.values() for seat in seats if seat.employee_id is None]
+    plans = [list(zip(rng.sample(employees, 50), rng.sample(free, 50))) for _ in range(500)]
+
+    started = time.perf_counter()
+    results = simulator.simulate(plans)
+    elapsed = time.perf_counter() - started
+
+    assert len(results) == 500
+    assert elapsed < 1.0
+    assert all(result.kwh_without_moves == results[0].kwh_without_moves for result in results)
@@ -0,0 +1,18 @@
+from datetime import date
+
+from ..app.models.energy_models import LaptopMode
+from ..app.services.energy_summary_service import EnergyCounters
+
+
+def test_energy_counters_summary_compares_with_yesterday():
+    counters = EnergyCounters()
+    counters.add(date(2023, 10, 26), "HVAC", 10.0)
+    counters.add(date(2023, 10, 27), "HVAC", 6.0)
+    counters.add_laptop_usage(10.0, LaptopMode.DARK, day=date(2023, 10, 27))
+
+    summary = counters.summary(today=date(2023, 10, 27))
+    assert summary["total_consumption_kwh_today"] == 6.45
+    assert summary["comparison_yesterday_percentage"] == -35.5
+    assert [c["component_name"] for c in summary["main_contributors"]] == ["HVAC", "Laptop Usage"]
+    assert summary["main_contributors"][0]["trend"] == "down"
+    assert summary["main_contributors"][1]["trend"] == "up"
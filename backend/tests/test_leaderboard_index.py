@@ -0,0 +1,54 @@
+import random
+
+from ..app.services.leaderboard_index import RankedLeaderboard
+
+
+def _expected_order(points_by_employee):
+    return sorted(points_by_employee.items(), key=lambda item: (-item[1], item[0]))
+
+
+def test_top_matches_full_sort_after_random_updates():
+    """The ranked index should always agree with sorting everyone by points."""
+    rng = random.Random(7)
+    leaderboard = RankedLeaderboard(seed=7)
+    reference = {}
+    for _ in range(3000):
+        emp_id = f"emp{rng.randint(1, 400):03}"
+        if rng.random() < 0.1:
+            leaderboard.remove(emp_id)
+            reference.pop(emp_id, None)
+        else:
+            points = rng.randint(0, 500)
+            leaderboard.update(emp_id, points)
+            reference[emp_id] = points
+
+    expected = _expected_order(reference)
+    assert len(leaderboard) == len(reference)
+    assert [(emp_id, points) for _, emp_id, points in leaderboard.top()] == expected
+    assert [rank for rank, _, _ in leaderboard.top(5)] == [1, 2, 3, 4, 5]
+
+
+def test_ties_are_broken_by_employee_id():
+    leaderboard = RankedLeaderboard(seed=1)
+    leaderboard.rebuild({"emp003": 100, "emp001": 100, "emp002": 250})
+    assert [emp_id for _, emp_id, _ in leaderboard.top()] == ["emp002", "emp001", "emp003"]
+
+
+def test_update_moves_employee_to_new_rank():
+    leaderboard = RankedLeaderboard(seed=1)
+    leaderboard.rebuild({"emp001": 100, "emp002": 200, "emp003": 300})
+    leaderboard.update("emp001", 400)
+    assert leaderboard.top(1) == [(1, "emp001", 400)]
+    assert leaderboard.points_of("emp001") == 400
+    assert leaderboard.top(limit=0) == []
+
+
+def test_rank_of_and_window_iteration():
+    leaderboard = RankedLeaderboard(seed=3)
+    leaderboard.rebuild({f"emp{i:03}": i * 10 for i in range(1, 101)})
+    assert leaderboard.rank_of("emp100") == 1
+    assert leaderboard.rank_of("emp050") == 51
+    assert leaderboard.rank_of("emp999") is None
+    window = list(leaderboard.iter_from(49, 5))
+    assert [rank for rank, _, _ in window] == [49, 50, 51, 52, 53]
+    assert window[2][1] == "emp050"
@@ -0,0 +1,80 @@
+import random
+import time
+
+from ..app.models.seating_models import Seat, SeatStatus
+from ..app.services.seat_spatial_index import SeatSpatialIndex, grid_position
+
+
+def _zone(rng, rows, cols, free_share):
+    return [
+        Seat(seat_id=f"ZoneA-R{r + 1}C{c + 1}", position=(r, c),
+             status=SeatStatus.UNOCCUPIED if rng.random() < free_share else rng.choice([SeatStatus.OCCUPIED, SeatStatus.DISABLED]))
+        for r in range(rows) for c in range(cols)
+    ]
+
+
+def _longest_runs(seats, cols):
+    # Brute force: the longest run of adjacent free seats in any row
+    best, run = 0, 0
+    for seat in seats:
+        if seat.position[1] == 0:
+            run = 0
+        run = run + 1 if seat.status == SeatStatus.UNOCCUPIED else 0
+        best = max(best, run)
+    return best
+
+
+def test_queries_match_brute_force_after_random_updates():
+    """k-nearest and free-block answers should agree with scanning every seat."""
+    rng = random.Random(17)
+    rows, cols = 23, 37
+    seats = _zone(rng, rows, cols, 0.3)
+    index = SeatSpatialIndex()
+    index.rebuild({"ZoneA": seats})
+
+    for step in range(1500):
+        seat = rng.choice(seats)
+        seat.status = rng.choice(list(SeatStatus))
+        index.update("ZoneA", seat)
+        if step % 50:
+            continue
+
+        row, col, k = rng.randrange(rows), rng.randrange(cols), rng.randint(1, 40)
+        free = [s for s in seats if s.status == SeatStatus.UNOCCUPIED]
+        distance = lambda s: (s.position[0] - row) ** 2 + (s.position[1] - col) ** 2
+        nearest = index.nearest_free("ZoneA", (row, col), k)
+        assert all(s.status == SeatStatus.UNOCCUPIED for s in nearest)
+        assert [distance(s) for s in nearest] == sorted(distance(s) for s in free)[:k]
+        assert index.free_count("ZoneA") == len(free)
+
+        block = index.largest_free_block("ZoneA")
+        assert len(block) == _longest_runs(seats, cols)
+        assert all(s.status == SeatStatus.UNOCCUPIED and s.position[0] == block[0].position[0] for s in block)
+        assert [s.position[1] for s in block] == list(range(block[0].position[1], block[0].position[1] + len(block)))
+
+
+def test_positions_fall_back_to_seat_ids():
+    assert grid_position(Seat(seat_id="ZoneB-R3C12")) == (2, 11)
+    assert grid_position(Seat(seat_id="Desk7")) is None
+    index = SeatSpatialIndex()
+    index.add_zone("ZoneB", [Seat(seat_id="ZoneB-R1C1", status=SeatStatus.OCCUPIED), Seat(seat_id="ZoneB-R1C3")])
+    assert [seat.seat_id for seat in index.nearest_free("ZoneB", None, 5)] == ["ZoneB-R1C3"]
+    assert index.occupied_centroid("ZoneB") == (0.0, 0.0)
+    assert index.nearest_free("ZoneZ", (0, 0), 1) == [] and "ZoneZ" not in index
+
+
+def test_large_floor_queries_stay_fast():
+    """A 40k-seat zone answers nearest-seat and block queries without scanning it."""
+    rng = random.Random(2)
+    seats = _zone(rng, 200, 200, 0.05)
+    index = SeatSpatialIndex()
+    index.rebuild({"ZoneA": seats})
+
+    started = time.perf_counter()
+    for _ in range(500):
+        seat = rng.choice(seats)
+        seat.status = rng.choice([SeatStatus.OCCUPIED, SeatStatus.UNOCCUPIED])
+        index.update("ZoneA", seat)
+        assert len(index.nearest_free("ZoneA", (rng.randrange(200), rng.randrange(200)), 10)) == 10
+        index.largest_free_block("ZoneA")
+    assert time.perf_counter() - started < 2.0
@@ -0,0 +1,181 @@
+import json
+import random
+import sys
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ..app.main import app
+from ..app.models.seating_models import SeatStatus
+from ..app.services import data_generation_service as service
+from ..app.services.data_repository import MockDataRepository, get_repository
+
+
+@pytest.fixture
+def live_seating():
+    """The real in-memory service, restored afterwards so other tests see the state they expect."""
+    service.get_mock_seating_arrangement_and_assign_employees()
+    saved = service.export_mock_state()
+    yield service
+    service.load_mock_state(saved)
+
+
+def _assert_consistent():
+    seated = Counter()
+    for zone_id, seats in service._generated_zones_seats.items():
+        statuses = Counter(seat.status for seat in seats)
+        assert service._zone_counters.counts(zone_id) == {status: statuses[status] for status in SeatStatus}
+        assert service._seat_index.free_count(zone_id) == statuses[SeatStatus.UNOCCUPIED]
+        for seat in seats:
+            assert (seat.status == SeatStatus.OCCUPIED) == (seat.employee_id is not None)
+            if seat.employee_id:
+                seated[seat.employee_id] += 1
+                assert service._employee_seat_map[seat.employee_id] == seat.seat_id
+                assert service._get_employee_by_id(seat.employee_id).current_seat_id == seat.seat_id
+    assert all(count == 1 for count in seated.values())
+    assert set(service._employee_seat_map) == set(seated)
+
+
+def test_parallel_moves_lose_no_updates(live_seating):
+    """Racing moves keep seats, employees, counters and the spatial index in step, and every write is counted."""
+    rng = random.Random(11)
+    employees = [emp.id for emp in service.get_mock_employees()[:60]]
+    for emp_id in employees[::3]:  # Unseated employees: their first moves into different zones share no zone lock
+        seat_id = service._employee_seat_map.get(emp_id)
+        if seat_id is not None:
+            service.update_mock_seat(seat_id, SeatStatus.UNOCCUPIED)
+    free_by_zone = [free for free in ([seat.seat_id for seat in seats if seat.status == SeatStatus.UNOCCUPIED]
+                                      for seats in service._generated_zones_seats.values()) if free]
+    first_moves = [(free[i % len(free)], emp_id) for i, emp_id in enumerate(employees[::3]) for free in free_by_zone]
+    seat_ids = [seat.seat_id for seats in service._generated_zones_seats.values() for seat in seats
+                if seat.status in (SeatStatus.OCCUPIED, SeatStatus.UNOCCUPIED)]
+    requests = [(rng.choice(seat_ids), rng.choice(employees)) for _ in range(3000)]
+    versions_before = sum(service._zone_versions.values())
+
+    def move(request):
+        seat_id, emp_id = request
+        try:
+            return service.update_mock_seat(seat_id, SeatStatus.OCCUPIED, emp_id)
+        except service.SeatConflictError:
+            return None
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Switch threads often enough for the races to happen
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = [result for result in pool.map(move, first_moves + requests) if result is not None]
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert len(results) > 100
+    writes = sum(2 if result["vacated_seat_id"] else 1 for result in results)
+    assert sum(service._zone_versions.values()) - versions_before == writes
+    _assert_consistent()
+
+
+def test_conditional_updates_over_http_have_one_winner(live_seating):
+    """Parallel requests against the same zone version: exactly one applies, the rest get 409."""
+    zone_id, seats = next(iter(service._generated_zones_seats.items()))
+    free = [seat.seat_id for seat in seats if seat.status == SeatStatus.UNOCCUPIED][:8]
+    version = service._zone_versions[zone_id]
+
+    repository = MockDataRepository()
+    app.dependency_overrides[get_repository] = lambda: repository
+    try:
+        with TestClient(app) as client:
+            assert next(zone["version"] for zone in client.get("/api/seating/arrangement/").json()["zones"]
+                        if zone["zone_id"] == zone_id) == version
+
+            def reserve(seat_id):
+                return client.put(f"/api/seating/seats/{seat_id}",
+                                  json={"status": "reserved", "expected_zone_version": version})
+
+            with ThreadPoolExecutor(max_workers=len(free)) as pool:
+                responses = list(pool.map(reserve, free))
+    finally:
+        app.dependency_overrides.pop(get_repository, None)
+        repository.close()
+
+    assert sorted(response.status_code for response in responses) == [200] + [409] * (len(free) - 1)
+    assert service._zone_versions[zone_id] == version + 1
+    assert sum(seat.status == SeatStatus.RESERVED for seat in seats if seat.seat_id in free) == 1
+    _assert_consistent()
+
+
+def test_seat_update_validation(live_seating):
+    employee = service.get_mock_employees()[0]
+    taken = next(seat for seats in service._generated_zones_seats.values() for seat in seats
+                 if seat.status == SeatStatus.OCCUPIED and seat.employee_id != employee.id)
+    with pytest.raises(service.SeatConflictError):
+        service.update_mock_seat(taken.seat_id, SeatStatus.OCCUPIED, employee.id)
+    with pytest.raises(ValueError):
+        service.update_mock_seat(taken.seat_id, SeatStatus.OCCUPIED)
+    assert service.update_mock_seat("NoSuchSeat", SeatStatus.DISABLED) is None
+    assert service.update_mock_seat(taken.seat_id, SeatStatus.OCCUPIED, "no-such-employee") is None
+
+    # Releasing an occupied seat also clears the employee's current seat
+    result = service.update_mock_seat(taken.seat_id, SeatStatus.UNOCCUPIED)
+    assert result["seat"].employee_id is None
+    _assert_consistent()
+
+
+def test_change_feed_replays_to_the_current_arrangement(live_seating, monkeypatch):
+    """Applying the deltas since a snapshot's version reproduces the current arrangement."""
+    _, body = service.get_mock_seating_arrangement_snapshot()
+    client_view = json.loads(body)
+    seats = {seat["seat_id"]: seat for zone in client_view["zones"] for seat in zone["seats"]}
+
+    employees = [emp.id for emp in service.get_mock_employees()[:10]]
+    free = [seat.seat_id for zone in service._generated_zones_seats.values() for seat in zone if seat.status == SeatStatus.UNOCCUPIED]
+    for emp_id, seat_id in zip(employees, free):
+        service.update_mock_seat(seat_id, SeatStatus.OCCUPIED, emp_id)
+
+    delta = service.get_mock_seating_changes(client_view["version"])
+    assert not delta["full_snapshot_required"]
+    assert 10 <= len(delta["changes"]) <= 20  # Each move changes the new seat and possibly the old one
+    for change in delta["changes"]:
+        seats[change["seat"].seat_id] = change["seat"].model_dump(mode="json")
+    _, current = service.get_mock_seating_arrangement_snapshot()
+    assert seats == {seat["seat_id"]: seat for zone in json.loads(current)["zones"] for seat in zone["seats"]}
+    assert service.get_mock_seating_changes(delta["version"])["changes"] == []
+
+    # Clients further behind than the log, or from before a new layout, start over from a snapshot
+    monkeypatch.setattr(service, "_change_log", deque(maxlen=3))
+    version = delta["version"]
+    for seat_id in free[10:15]:
+        service.update_mock_seat(seat_id, SeatStatus.RESERVED)
+    assert service.get_mock_seating_changes(version)["full_snapshot_required"]
+    assert len(service.get_mock_seating_changes(version + 2)["changes"]) == 3
+    service.load_mock_state(service.export_mock_state())
+    assert service.get_mock_seating_changes(version + 5)["full_snapshot_required"]
+
+
+def test_employee_change_is_notified_after_the_write(live_seating, monkeypatch):
+    """A cache refilled from an "employees" notification sees the moved employee's new seat."""
+    employee = service.get_mock_employees()[0]
+    free = next(seat for seats in service._generated_zones_seats.values() for seat in seats if seat.status == SeatStatus.UNOCCUPIED)
+    seen = []
+    monkeypatch.setattr(service, "_change_listeners", [lambda topic: topic == "employees" and seen.append(
+        (service._get_employee_by_id(employee.id).current_seat_id, service._employee_seat_map.get(employee.id)))])
+
+    service.update_mock_seat(free.seat_id, SeatStatus.OCCUPIED, employee.id)
+    assert seen and seen[-1] == (free.seat_id, free.seat_id)
+
+
+def test_seat_update_retries_when_the_layout_is_replaced_underneath(live_seating, monkeypatch):
+    """An update that pairs a new layout's seats with the old zone locks retries instead of failing."""
+    free = next(seat for seats in service._generated_zones_seats.values() for seat in seats if seat.status == SeatStatus.UNOCCUPIED)
+    current_locks = service._zone_locks
+
+    class SwappedLocks(dict):
+        # The locks of the layout being replaced: they know none of the new zones
+        def get(self, zone_id, default=None):
+            monkeypatch.setattr(service, "_zone_locks", current_locks)  # The swap completes
+            return default
+
+    monkeypatch.setattr(service, "_zone_locks", SwappedLocks())
+    result = service.update_mock_seat(free.seat_id, SeatStatus.RESERVED)
+    assert result["seat"].status == SeatStatus.RESERVED
+    _assert_consistent()
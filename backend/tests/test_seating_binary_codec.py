@@ -0,0 +1,65 @@
+import random
+import time
+
+import pytest
+
+from ..app.models.seating_models import Seat, SeatingArrangement, SeatStatus
+from ..app.services.seating_binary_codec import decode_arrangement, encode_arrangement
+
+
+def _floor(rng, num_zones, rows, cols):
+    zones, emp = [], 0
+    for z in range(num_zones):
+        zone_id = f"Zone{z:03d}"
+        seats = []
+        for r in range(rows):
+            for c in range(cols):
+                status = rng.choice(list(SeatStatus))
+                emp += status == SeatStatus.OCCUPIED
+                seats.append(Seat(seat_id=f"{zone_id}-R{r + 1}C{c + 1}", status=status, position=(r, c),
+                                  employee_id=f"emp{emp:06d}" if status == SeatStatus.OCCUPIED else None))
+        zones.append({"zone_id": zone_id, "description": f"Area {z}", "grid_rows": rows, "grid_cols": cols, "seats": seats, "version": z})
+    occupied = emp
+    total = num_zones * rows * cols
+    return {"zones": zones, "total_seats": total, "occupied_seats": occupied, "unoccupied_seats": total - occupied, "version": 7}
+
+
+def _seats_by_id(arrangement):
+    return {seat["seat_id"]: seat for zone in arrangement["zones"] for seat in zone["seats"]}
+
+
+def test_round_trip_keeps_irregular_seats():
+    """Renamed seats, seats placed only by id, and seats off the grid all survive encoding."""
+    seats = [
+        Seat(seat_id="ZoneA-R1C1", status=SeatStatus.OCCUPIED, employee_id="emp001", position=(0, 0)),
+        Seat(seat_id="Desk-Window", status=SeatStatus.RESERVED, position=(0, 1)),
+        Seat(seat_id="ZoneA-R2C1", status=SeatStatus.UNOCCUPIED),  # Position only in the id
+        Seat(seat_id="Hotdesk", status=SeatStatus.OCCUPIED, employee_id="emp002"),  # Not on the grid
+        Seat(seat_id="Annex", status=SeatStatus.DISABLED, position=(9, 9)),  # Outside the grid
+        Seat(seat_id="Twin", status=SeatStatus.OCCUPIED, employee_id="emp001", position=(0, 0)),  # Cell already taken
+    ]
+    arrangement = SeatingArrangement(zones=[{"zone_id": "ZoneA", "grid_rows": 2, "grid_cols": 2, "seats": seats}],
+                                     total_seats=6, occupied_seats=3, unoccupied_seats=3).model_dump()
+    decoded = decode_arrangement(encode_arrangement(arrangement))
+    assert decoded["version"] is None and decoded["zones"][0]["description"] is None
+    assert _seats_by_id(decoded) == _seats_by_id(arrangement)
+
+    with pytest.raises(ValueError):
+        decode_arrangement(b"JSON")
+
+
+def test_large_floor_is_over_ten_times_smaller_and_fast():
+    """A 50k-seat view: the binary payload beats JSON by >10x and round-trips quickly."""
+    arrangement = _floor(random.Random(4), 20, 50, 50)
+    as_json = SeatingArrangement(**arrangement).model_dump_json().encode()
+
+    started = time.perf_counter()
+    encoded = encode_arrangement(arrangement)
+    decoded = decode_arrangement(encoded)
+    elapsed = time.perf_counter() - started
+
+    assert len(as_json) > 10 * len(encoded)
+    assert elapsed < 2.0
+    assert decoded["version"] == 7 and [zone["version"] for zone in decoded["zones"]] == list(range(20))
+    assert _seats_by_id(decoded) == {seat_id: seat.model_dump() for seat_id, seat in
+                                      ((s.seat_id, s) for zone in arrangement["zones"] for s in zone["seats"])}
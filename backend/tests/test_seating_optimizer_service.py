@@ -0,0 +1,104 @@
+import itertools
+import random
+import time
+
+from ..app.models.seating_models import Seat, SeatStatus
+from ..app.services import seating_optimizer_service
+from ..app.services.seating_optimizer_service import OBJECTIVE_ENERGY, plan_consolidation
+
+
+def _layout(rng, num_zones, seats_per_zone, occupancy):
+    zones, emp = {}, 0
+    for z in range(num_zones):
+        zone_id = f"Zone{z:03d}"
+        seats = []
+        for s in range(seats_per_zone):
+            roll = rng.random()
+            if roll < occupancy:
+                emp += 1
+                seats.append(Seat(seat_id=f"{zone_id}-{s}", status=SeatStatus.OCCUPIED, employee_id=f"emp{emp:05d}"))
+            else:
+                seats.append(Seat(seat_id=f"{zone_id}-{s}", status=SeatStatus.UNOCCUPIED if roll < 0.95 else SeatStatus.DISABLED))
+        zones[zone_id] = seats
+    return zones
+
+
+def _assert_valid(zones, plan):
+    """Every mover leaves a vacated zone for a distinct free seat, and vacated zones end up empty."""
+    zone_of = {seat.seat_id: zone_id for zone_id, seats in zones.items() for seat in seats}
+    status_of = {seat.seat_id: seat.status for seats in zones.values() for seat in seats}
+    new_seats = [seat_id for _, seat_id in plan.moves]
+    assert len(set(new_seats)) == len(new_seats)
+    assert all(status_of[seat_id] == SeatStatus.UNOCCUPIED for seat_id in new_seats)
+    assert not {zone_of[seat_id] for seat_id in new_seats} & set(plan.vacated_zones)
+    movers = {emp_id for emp_id, _ in plan.moves}
+    for zone_id in plan.vacated_zones:
+        assert {seat.employee_id for seat in zones[zone_id] if seat.status == SeatStatus.OCCUPIED} <= movers
+
+
+def _fewest_zones_in_use(zones):
+    # Brute force: the smallest set of zones whose usable seats hold everyone seated today
+    stats = {z: (sum(s.status == SeatStatus.OCCUPIED for s in seats), sum(s.status == SeatStatus.UNOCCUPIED for s in seats))
+             for z, seats in zones.items()}
+    people = sum(occ for occ, _ in stats.values())
+    for size in range(0, len(stats) + 1):
+        for kept in itertools.combinations(stats, size):
+            if sum(occ + free for occ, free in (stats[z] for z in kept)) >= people:
+                return size
+
+
+def test_plan_uses_as_few_zones_as_brute_force():
+    """The exact search should match exhaustive search on small floors."""
+    rng = random.Random(3)
+    for _ in range(25):
+        zones = _layout(rng, rng.randint(2, 7), rng.randint(2, 8), rng.uniform(0.1, 0.8))
+        plan = plan_consolidation(zones)
+        _assert_valid(zones, plan)
+        assert plan.optimal
+        in_use = sum(any(seat.status == SeatStatus.OCCUPIED for seat in seats) for seats in zones.values())
+        assert in_use - len(plan.vacated_zones) + len(plan.opened_zones) == _fewest_zones_in_use(zones)
+
+
+def test_energy_objective_prefers_expensive_zones():
+    """With per-zone kWh, the plan empties the zone that saves the most, not just any zone."""
+    zones = _layout(random.Random(5), 3, 6, 0.3)
+    kwh = {"Zone000": 5.0, "Zone001": 40.0, "Zone002": 5.0}
+    plan = plan_consolidation(zones, objective=OBJECTIVE_ENERGY, zone_kwh=kwh)
+    _assert_valid(zones, plan)
+    assert "Zone001" in plan.vacated_zones
+    assert plan.energy_saving_kwh >= 40.0 - sum(kwh[z] for z in plan.opened_zones)
+
+
+def test_department_grouping_seats_movers_with_colleagues():
+    """Movers should join the zone where their own department already sits."""
+    def seats(zone_id, employees, free):
+        return ([Seat(seat_id=f"{zone_id}-{emp_id}", status=SeatStatus.OCCUPIED, employee_id=emp_id) for emp_id in employees]
+                + [Seat(seat_id=f"{zone_id}-free{i}", status=SeatStatus.UNOCCUPIED) for i in range(free)])
+
+    zones = {
+        "ZoneA": seats("ZoneA", ["eng1", "eng2", "eng3", "eng4"], 4),
+        "ZoneB": seats("ZoneB", ["ops1", "ops2", "ops3", "ops4"], 4),
+        "ZoneC": seats("ZoneC", ["eng5", "ops5"], 6),
+    }
+    department_of = lambda emp_id: "Engineering" if emp_id.startswith("eng") else "Ops"
+
+    plan = plan_consolidation(zones, department_of=department_of)
+    _assert_valid(zones, plan)
+    assert plan.vacated_zones == ["ZoneC"]
+    assert {emp_id: seat_id.split("-")[0] for emp_id, seat_id in plan.moves} == {"eng5": "ZoneA", "ops5": "ZoneB"}
+
+
+def test_greedy_fallback_and_large_floor_within_budget(monkeypatch):
+    """Past the exact-search limit the greedy search still returns a valid plan, and 12k seats stay fast."""
+    zones = _layout(random.Random(9), 500, 24, 0.35)
+    started = time.perf_counter()
+    exact = plan_consolidation(zones, time_budget_seconds=5.0)
+    assert time.perf_counter() - started < 5.0
+    _assert_valid(zones, exact)
+    assert exact.optimal and len(exact.vacated_zones) > 200
+
+    monkeypatch.setattr(seating_optimizer_service, "DP_CELL_LIMIT", 0)
+    greedy = plan_consolidation(zones, time_budget_seconds=0.5)
+    _assert_valid(zones, greedy)
+    assert not greedy.optimal
+    assert len(greedy.vacated_zones) >= len(exact.vacated_zones) - 5
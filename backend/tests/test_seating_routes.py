@@ -1,6 +1,11 @@
+import json
 from fastapi.testclient import TestClient
 from unittest.mock import MagicMock
 
+from ..app.models.seating_models import Seat, SeatStatus
+from ..app.services import data_generation_service as service
+from ..app.services.seating_binary_codec import MEDIA_TYPE, decode_arrangement
+
 # Fixtures 'client' and 'mock_data_service' are from conftest.py
 
 def test_get_seating_arrangement_data_success(client: TestClient, mock_data_service: MagicMock):
@@ -38,50 +43,26 @@ def test_get_seating_suggestions_data_success(client: TestClient, mock_data_serv
 
     mock_data_service.get_mock_seating_suggestions.assert_called_once()
 
-def test_get_seating_arrangement_db_switch_scenario(client: TestClient, mock_data_service: MagicMock):
-    """Test the seating arrangement route when USE_DATABASE_SWITCH is True (expect 501)."""
-    mock_data_service.USE_DATABASE_SWITCH = True # Simulate DB mode
+def test_get_seating_arrangement_db_switch_scenario(client: TestClient, mock_data_service: MagicMock, mock_database_service: MagicMock):
+    """Test the seating arrangement route with the SQLite backend."""
+    mock_database_service.get_seating_arrangement.return_value = mock_data_service.get_mock_seating_arrangement_and_assign_employees.return_value
 
     response = client.get("/api/seating/arrangement/")
-    assert response.status_code == 501
-    assert response.json() == {"detail": "Database connection not implemented yet."}
-
-    # Reset for other tests
-    mock_data_service.USE_DATABASE_SWITCH = False
-
-def test_get_seating_suggestions_db_switch_scenario(client: TestClient, mock_data_service: MagicMock):
-    """Test the seating suggestions route when USE_DATABASE_SWITCH is True (expect 501)."""
-    # For suggestions, the current mock service has a different message for DB mode.
-    # Let's ensure that path is also covered if we were to toggle the switch.
-    # The conftest mock for get_mock_seating_suggestions doesn't currently check USE_DATABASE_SWITCH,
-    # but the actual service does. So, this test is more about the route's behavior if the
-    # service *did* return a 501 or a specific DB-mode message through the route.
-    # For consistency with other DB switch tests, we'll expect a 501 from the route.
-
-    mock_data_service.USE_DATABASE_SWITCH = True
-    # If the route itself checked the switch (it doesn't, it relies on service):
-    # response = client.get("/api/seating/suggestions/")
-    # assert response.status_code == 501
-    # assert response.json() == {"detail": "Database connection not implemented yet."}
-
-    # Instead, let's test the scenario where the *service itself* indicates DB mode.
-    # We can make the mock behave as if the service raised an HTTPException or returned a specific structure.
-    # For this test, we'll assume the route would propagate a 501 if the service indicated it.
-    # The current setup has the service return a specific message for DB mode, not raise 501.
-    # So, let's adjust the mock for this one test to simulate the 501 from the service path.
-
-    original_suggestion_mock = mock_data_service.get_mock_seating_suggestions
-    mock_data_service.get_mock_seating_suggestions = MagicMock(
-        return_value={"detail": "Seating optimization suggestions are not available in DB mode yet."} # This is what actual service returns
-    )
+    assert response.status_code == 200
+    assert response.json()["occupied_seats"] == 1
+    mock_database_service.get_seating_arrangement.assert_awaited_once()
+    mock_data_service.get_mock_seating_arrangement_and_assign_employees.assert_not_called()
+
+def test_get_seating_suggestions_db_switch_scenario(client: TestClient, mock_data_service: MagicMock, mock_database_service: MagicMock):
+    """Test the seating suggestions route with the SQLite backend."""
+    mock_database_service.get_seating_suggestions.return_value = {"message": "Office layout reasonably optimized.", "suggested_moves": []}
 
     response = client.get("/api/seating/suggestions/")
-    assert response.status_code == 501 # The route itself doesn't throw 501 based on switch
-    assert response.json()["detail"] == "Database connection not implemented yet."
+    assert response.status_code == 200
+    assert response.json()["message"] == "Office layout reasonably optimized."
+    mock_database_service.get_seating_suggestions.assert_awaited_once()
+    mock_data_service.get_mock_seating_suggestions.assert_not_called()
 
-    # Restore original mock and switch
-    mock_data_service.get_mock_seating_suggestions = original_suggestion_mock
-    mock_data_service.USE_DATABASE_SWITCH = False
 
 def test_get_seating_arrangement_check_data_structure(client: TestClient, mock_data_service: MagicMock):
     """Test the data structure of a successfully retrieved seating arrangement."""
@@ -184,4 +165,151 @@ def test_get_seating_arrangement_internal_error(client: TestClient, mock_data_se
     mock_data_service.get_mock_seating_arrangement_and_assign_employees.side_effect = Exception("Service Failure")
     response = client.get("/api/seating/arrangement/")
     assert response.status_code == 500 # FastAPI's default for unhandled exceptions
-    mock_data_service.get_mock_seating_arrangement_and_assign_employees.assert_called_once()
\ No newline at end of file
+    mock_data_service.get_mock_seating_arrangement_and_assign_employees.assert_called_once()
+def test_get_seating_arrangement_etag_not_modified(client: TestClient, mock_data_service: MagicMock):
+    """A matching If-None-Match returns 304 without a body; anything else gets the full arrangement."""
+    response = client.get("/api/seating/arrangement/")
+    etag = response.headers["ETag"]
+    assert response.status_code == 200
+
+    not_modified = client.get("/api/seating/arrangement/", headers={"If-None-Match": f'"stale", W/{etag}'})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+
+    changed = client.get("/api/seating/arrangement/", headers={"If-None-Match": '"stale"'})
+    assert changed.status_code == 200
+    assert changed.json()["total_seats"] == 2
+
+def test_seating_snapshot_reused_until_a_seat_changes():
+    """The service serializes the arrangement once per seating version."""
+    version, body = service.get_mock_seating_arrangement_snapshot()
+    assert service.get_mock_seating_arrangement_snapshot()[1] is body
+
+    zone_id, seats = next(iter(service._generated_zones_seats.items()))
+    seat = next(seat for seat in seats if seat.status == SeatStatus.UNOCCUPIED)
+    service._set_seat_state(zone_id, seat, SeatStatus.RESERVED)
+    try:
+        new_version, new_body = service.get_mock_seating_arrangement_snapshot()
+        assert new_version > version
+        assert json.loads(new_body) != json.loads(body)
+    finally:
+        service._set_seat_state(zone_id, seat, SeatStatus.UNOCCUPIED)
+
+def test_get_seating_suggestions_passes_optimizer_options(client: TestClient, mock_data_service: MagicMock):
+    """Objective, department grouping and time budget reach the service; unknown objectives are rejected."""
+    response = client.get("/api/seating/suggestions/?objective=energy&group_by_department=true&time_budget_ms=50")
+    assert response.status_code == 200
+    mock_data_service.get_mock_seating_suggestions.assert_called_once_with(objective="energy", group_by_department=True, time_budget_ms=50, shard=None)
+
+    assert client.get("/api/seating/suggestions/?objective=fastest").status_code == 422
+
+def test_get_nearest_free_seats_and_free_block(client: TestClient, mock_data_service: MagicMock):
+    """Spatial queries are answered by the service; unknown zones are 404."""
+    free_seat = Seat(seat_id="ZoneA-R1C2", status=SeatStatus.UNOCCUPIED, position=(0, 1))
+    mock_data_service.get_mock_nearest_free_seats.return_value = [free_seat]
+    mock_data_service.get_mock_largest_free_block.return_value = [free_seat]
+
+    response = client.get("/api/seating/zones/ZoneA/nearest-free/?row=0&col=0&k=3")
+    assert response.status_code == 200
+    assert response.json() == [{"seat_id": "ZoneA-R1C2", "status": "unoccupied", "employee_id": None, "position": [0, 1]}]
+    mock_data_service.get_mock_nearest_free_seats.assert_called_once_with("ZoneA", 0, 0, 3)
+
+    assert client.get("/api/seating/zones/ZoneA/free-block/").json()[0]["seat_id"] == "ZoneA-R1C2"
+
+    mock_data_service.get_mock_nearest_free_seats.return_value = None
+    mock_data_service.get_mock_largest_free_block.return_value = None
+    assert client.get("/api/seating/zones/ZoneZ/nearest-free/?row=0&col=0").status_code == 404
+    assert client.get("/api/seating/zones/ZoneZ/free-block/").status_code == 404
+
+def test_update_seat_maps_service_results(client: TestClient, mock_data_service: MagicMock):
+    """Moves are delegated to the service; conflicts are 409 and unknown seats 404."""
+    mock_data_service.update_mock_seat.return_value = {
+        "zone_id": "ZoneA", "zone_version": 4, "vacated_seat_id": "ZoneA-R1C1",
+        "seat": Seat(seat_id="ZoneA-R1C2", status=SeatStatus.OCCUPIED, employee_id="emp001"),
+    }
+    response = client.put("/api/seating/seats/ZoneA-R1C2", json={"status": "occupied", "employee_id": "emp001", "expected_zone_version": 3})
+    assert response.status_code == 200
+    assert response.json()["zone_version"] == 4
+    mock_data_service.update_mock_seat.assert_called_once_with("ZoneA-R1C2", SeatStatus.OCCUPIED, "emp001", 3)
+
+    mock_data_service.update_mock_seat.side_effect = service.SeatConflictError("Zone ZoneA is at version 5, not 3")
+    assert client.put("/api/seating/seats/ZoneA-R1C2", json={"status": "occupied", "employee_id": "emp001", "expected_zone_version": 3}).status_code == 409
+
+    mock_data_service.update_mock_seat.side_effect = None
+    mock_data_service.update_mock_seat.return_value = None
+    assert client.put("/api/seating/seats/Nowhere", json={"status": "disabled"}).status_code == 404
+
+def test_get_seating_changes(client: TestClient, mock_data_service: MagicMock):
+    """The change feed passes `since` to the service and requires it."""
+    mock_data_service.get_mock_seating_changes.return_value = {
+        "version": 9, "full_snapshot_required": False,
+        "changes": [{"zone_id": "ZoneA", "seat": Seat(seat_id="ZoneA-R1C2", status=SeatStatus.RESERVED)}],
+    }
+    response = client.get("/api/seating/changes/?since=7")
+    assert response.status_code == 200
+    assert response.json()["version"] == 9
+    assert response.json()["changes"][0]["seat"]["status"] == "reserved"
+    mock_data_service.get_mock_seating_changes.assert_called_once_with(7, None)
+
+    assert client.get("/api/seating/changes/").status_code == 422
+
+def test_seat_updates_and_changes_db_switch_scenario(client: TestClient, mock_data_service: MagicMock, mock_database_service: MagicMock):
+    """SQLite seats are not versioned: both routes answer 501 without reaching a backend."""
+    assert client.get("/api/seating/changes/?since=0").status_code == 501
+    assert client.put("/api/seating/seats/ZoneA-R1C2", json={"status": "reserved"}).status_code == 501
+    mock_data_service.get_mock_seating_changes.assert_not_called()
+    mock_data_service.update_mock_seat.assert_not_called()
+
+def test_get_seating_arrangement_binary_by_content_negotiation(client: TestClient, mock_data_service: MagicMock):
+    """Clients that ask for the binary media type get it, with its own ETag; others keep JSON."""
+    binary = client.get("/api/seating/arrangement/", headers={"Accept": f"{MEDIA_TYPE}, application/json;q=0.5"})
+    assert binary.status_code == 200
+    assert binary.headers["content-type"] == MEDIA_TYPE
+    assert "Accept" in binary.headers["vary"]
+    decoded = decode_arrangement(binary.content)
+    assert [seat["seat_id"] for seat in decoded["zones"][0]["seats"]] == [
+        seat["seat_id"] for seat in client.get("/api/seating/arrangement/").json()["zones"][0]["seats"]]
+    mock_data_service.get_mock_seating_arrangement_snapshot.assert_any_call("binary", None)
+
+    assert client.get("/api/seating/arrangement/", headers={"Accept": f"{MEDIA_TYPE};q=0.2, application/json"}).headers["content-type"] == "application/json"
+    assert client.get("/api/seating/arrangement/", headers={"Accept": "*/*"}).headers["content-type"] == "application/json"
+
+def test_campus_occupancy_and_unknown_shards(client: TestClient, mock_data_service: MagicMock):
+    """Occupancy lists each shard with campus totals; shard-scoped reads of unknown shards are 404."""
+    mock_data_service.get_mock_campus_occupancy.return_value = {
+        "shards": [{"shard": "HQ", "zones": 2, "total_seats": 40, "occupied_seats": 30, "unoccupied_seats": 10}],
+        "total_seats": 40, "occupied_seats": 30, "unoccupied_seats": 10,
+    }
+    response = client.get("/api/seating/occupancy/")
+    assert response.status_code == 200
+    assert response.json()["shards"][0]["shard"] == "HQ"
+
+    mock_data_service.get_mock_seating_arrangement_snapshot.side_effect = None
+    mock_data_service.get_mock_seating_arrangement_snapshot.return_value = None
+    assert client.get("/api/seating/arrangement/?shard=Nowhere").status_code == 404
+    mock_data_service.get_mock_seating_suggestions.return_value = None
+    assert client.get("/api/seating/suggestions/?shard=Nowhere").status_code == 404
+
+def test_simulate_seat_moves(client: TestClient, mock_data_service: MagicMock):
+    """Each plan gets its projected kWh; an unknown seat in a plan is a 422."""
+    mock_data_service.simulate_mock_seat_moves.return_value = [
+        {"kwh_without_moves": 40.0, "kwh_with_moves": 31.5, "saving_kwh": 8.5},
+        {"kwh_without_moves": 40.0, "kwh_with_moves": 40.0, "saving_kwh": 0.0},
+    ]
+    response = client.post("/api/seating/simulate/", json={"plans": [[["emp001", "ZoneA-R1C2"]], []]})
+    assert response.status_code == 200
+    assert [result["saving_kwh"] for result in response.json()] == [8.5, 0.0]
+    mock_data_service.simulate_mock_seat_moves.assert_called_once_with([[("emp001", "ZoneA-R1C2")], []])
+
+    mock_data_service.simulate_mock_seat_moves.side_effect = ValueError("Unknown seat Nowhere")
+    assert client.post("/api/seating/simulate/", json={"plans": [[["emp001", "Nowhere"]]]}).status_code == 422
+
+def test_simulate_seat_moves_db_switch_scenario(client: TestClient, mock_data_service: MagicMock, mock_database_service: MagicMock):
+    """The SQLite backend simulates from its arrangement."""
+    mock_database_service.get_seating_arrangement.return_value = mock_data_service.get_mock_seating_arrangement_and_assign_employees.return_value
+
+    response = client.post("/api/seating/simulate/", json={"plans": [[["emp001", "ZoneA-R1C2"]]]})
+    assert response.status_code == 200
+    assert response.json()[0]["saving_kwh"] == 0.0 # Same zone, same energy
+    mock_data_service.simulate_mock_seat_moves.assert_not_called()
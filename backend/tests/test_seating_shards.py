@@ -0,0 +1,153 @@
+import threading
+import time
+from collections import Counter
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ..app.main import app
+from ..app.models.seating_models import SeatStatus
+from ..app.services import data_generation_service as service
+from ..app.services.data_repository import MockDataRepository, get_repository
+from ..app.services.seating_shard_service import DEFAULT_SHARD, ShardWorkers, shard_of
+
+
+@pytest.fixture
+def two_buildings():
+    """The live service with its zones split over buildings "HQ" and "Annex"; restored afterwards."""
+    service.get_mock_seating_arrangement_and_assign_employees()
+    saved = service.export_mock_state()
+    zone_ids = list(saved["zones"])
+    renamed = {zone_id: f"{'HQ' if i < len(zone_ids) // 2 + 1 else 'Annex'}/{zone_id}" for i, zone_id in enumerate(zone_ids)}
+    service.load_mock_state({**saved, "zones": {renamed[zone_id]: seats for zone_id, seats in saved["zones"].items()}})
+    yield renamed
+    service.load_mock_state(saved)
+
+
+def test_shard_of():
+    assert shard_of("HQ-F2/ZoneA") == "HQ-F2"
+    assert shard_of("ZoneA") == DEFAULT_SHARD
+
+
+def test_campus_occupancy_merges_shard_totals(two_buildings):
+    occupancy = service.get_mock_campus_occupancy()
+    assert [shard["shard"] for shard in occupancy["shards"]] == ["Annex", "HQ"]
+    for shard in occupancy["shards"]:
+        seats = [seat for zone_id, zone in service._generated_zones_seats.items() if shard_of(zone_id) == shard["shard"] for seat in zone]
+        assert shard["total_seats"] == len(seats)
+        assert shard["occupied_seats"] == Counter(seat.status for seat in seats)[SeatStatus.OCCUPIED]
+    assert occupancy["total_seats"] == sum(len(zone) for zone in service._generated_zones_seats.values())
+    assert occupancy["occupied_seats"] == sum(shard["occupied_seats"] for shard in occupancy["shards"])
+
+
+def test_shard_snapshots_and_changes_are_independent(two_buildings):
+    """A seat change in HQ rebuilds HQ's snapshot only, and shows up only in HQ's change feed."""
+    hq_version, hq_body = service.get_mock_seating_arrangement_snapshot(shard="HQ")
+    _, annex_body = service.get_mock_seating_arrangement_snapshot(shard="Annex")
+    assert service.get_mock_seating_arrangement_snapshot(shard="Nowhere") is None
+
+    zone_id = next(zone_id for zone_id in service._generated_zones_seats if zone_id.startswith("HQ/"))
+    seat = next(seat for seat in service._generated_zones_seats[zone_id] if seat.status == SeatStatus.UNOCCUPIED)
+    service.update_mock_seat(seat.seat_id, SeatStatus.RESERVED)
+
+    assert service.get_mock_seating_arrangement_snapshot(shard="Annex")[1] is annex_body
+    new_version, new_body = service.get_mock_seating_arrangement_snapshot(shard="HQ")
+    assert new_version > hq_version and new_body != hq_body
+    assert [change["seat"].seat_id for change in service.get_mock_seating_changes(hq_version, "HQ")["changes"]] == [seat.seat_id]
+    assert service.get_mock_seating_changes(hq_version, "Annex")["changes"] == []
+
+
+def test_suggestions_are_planned_per_shard_in_worker_processes(two_buildings, monkeypatch):
+    """Each building is planned on its own worker process; moves never leave a building."""
+    # Send most people home so every building has zones worth emptying
+    occupied = [seat for seats in service._generated_zones_seats.values() for seat in seats if seat.status == SeatStatus.OCCUPIED]
+    for seat in occupied[::4] + occupied[1::4] + occupied[2::4]:
+        service.update_mock_seat(seat.seat_id, SeatStatus.UNOCCUPIED)
+
+    workers = ShardWorkers("process")
+    monkeypatch.setattr(service, "shard_workers", workers)
+    try:
+        campus = service.get_mock_seating_suggestions()
+        hq = service.get_mock_seating_suggestions(shard="HQ")
+    finally:
+        workers.shutdown()
+    assert service.get_mock_seating_suggestions(shard="Nowhere") is None
+
+    assert campus["suggested_moves"] and hq["suggested_moves"]
+    seat_zone = {seat.seat_id: zone_id for zone_id, seats in service._generated_zones_seats.items() for seat in seats}
+    for emp_id, seat_id in campus["suggested_moves"]:
+        old_seat = service._employee_seat_map[emp_id]
+        assert shard_of(seat_zone[old_seat]) == shard_of(seat_zone[seat_id])
+    assert set(hq["suggested_moves"]) <= set(campus["suggested_moves"])
+    assert all(zone_id.startswith("HQ/") for zone_id in hq.get("vacated_zones_lights_off", []))
+
+
+def test_slow_shard_does_not_hold_up_another():
+    workers = ShardWorkers("thread")
+    release = threading.Event()
+    try:
+        slow = workers.submit("HQ", release.wait, 5)
+        started = time.perf_counter()
+        assert workers.submit("Annex", sum, [1, 2, 3]).result(timeout=2) == 6
+        assert time.perf_counter() - started < 1.0 and not slow.done()
+    finally:
+        release.set()
+        workers.shutdown()
+
+
+@pytest.fixture
+def generated_buildings(monkeypatch):
+    """A layout generated with RTMS_NUM_BUILDINGS=2, so seat ids carry the shard too ("B1/ZoneA-R1C1")."""
+    service.get_mock_seating_arrangement_and_assign_employees()
+    saved = service.export_mock_state()
+    monkeypatch.setattr(service, "NUM_BUILDINGS", 2)
+    service.get_mock_seating_arrangement_and_assign_employees(refresh=True)
+    yield
+    service.load_mock_state(saved)
+
+
+def test_zone_and_seat_routes_accept_shard_prefixed_ids(generated_buildings):
+    """Ids like "B1/ZoneA-R1C1" reach the zone and seat routes, raw or with the slash escaped."""
+    zone_id = next(zone_id for zone_id in service._generated_zones_seats if zone_id.startswith("B1/"))
+    free = [seat.seat_id for seat in service._generated_zones_seats[zone_id] if seat.status == SeatStatus.UNOCCUPIED]
+    assert free[0].startswith(f"{zone_id}-")
+    repository = MockDataRepository()
+    app.dependency_overrides[get_repository] = lambda: repository
+    try:
+        with TestClient(app) as client:
+            for path_zone_id in (zone_id, zone_id.replace("/", "%2F")):
+                response = client.get(f"/api/seating/zones/{path_zone_id}/nearest-free/?row=0&col=0&k=2")
+                assert response.status_code == 200
+                assert response.json() and all(seat["seat_id"].startswith(zone_id) for seat in response.json())
+                assert client.get(f"/api/seating/zones/{path_zone_id}/free-block/").status_code == 200
+            assert client.get("/api/seating/zones/B1/Nowhere/free-block/").status_code == 404
+
+            for seat_id in (free[0], free[1].replace("/", "%2F")):
+                response = client.put(f"/api/seating/seats/{seat_id}", json={"status": "reserved"})
+                assert response.status_code == 200
+                assert response.json()["zone_id"] == zone_id
+    finally:
+        app.dependency_overrides.pop(get_repository, None)
+        repository.close()
+    assert {seat.seat_id for seat in service._generated_zones_seats[zone_id] if seat.status == SeatStatus.RESERVED} >= set(free[:2])
+
+
+def test_both_generators_give_shard_prefixed_zone_ids_and_notify_once(monkeypatch):
+    service.get_mock_seating_arrangement_and_assign_employees()
+    saved = service.export_mock_state()
+    monkeypatch.setattr(service, "NUM_BUILDINGS", 2)
+    monkeypatch.setattr(service, "_synthetic_data", None)
+    topics = []
+    monkeypatch.setattr(service, "_change_listeners", [topics.append])
+    zone_ids = {}
+    try:
+        for generator in ("random", "vectorized"):
+            monkeypatch.setattr(service, "DATA_GENERATOR", generator)
+            topics.clear()
+            service.get_mock_seating_arrangement_and_assign_employees(refresh=True)
+            zone_ids[generator] = list(service._generated_zones_seats)
+            assert sorted(topics) == ["employees", "seating"]  # Once for the layout, not once per seated employee
+    finally:
+        service.load_mock_state(saved)
+    assert zone_ids["random"] == zone_ids["vectorized"]
+    assert zone_ids["random"][:2] == ["B1/ZoneA", "B2/ZoneB"]
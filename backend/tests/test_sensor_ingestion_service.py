@@ -0,0 +1,49 @@
+import io
+import json
+
+from ..app.services.sensor_ingestion_service import SensorReadingStore, ingest_sensor_stream, iter_json_array
+
+
+def _zone_record(zone: str, kwh: float) -> dict:
+    return {
+        "timestamp": "2023-10-27T10:00:00Z", "office_zone": zone, "temperature_celsius": 22.5,
+        "light_status": "ON", "ac_status": "ECO", "projector_status": "OFF",
+        "energy_consumption_kwh_hourly": kwh,
+    }
+
+
+def test_iter_json_array_handles_elements_split_across_chunks():
+    """Decoding must not depend on where the read chunks happen to end."""
+    text = json.dumps([1, {"a": [1, 2], "b": "x,]"}, 3.25, "tail"])
+    assert list(iter_json_array(io.StringIO(text), chunk_chars=3)) == [1, {"a": [1, 2], "b": "x,]"}, 3.25, "tail"]
+
+
+def test_ingest_reports_counts_and_notifies_listeners():
+    records = [_zone_record("A1", 1.5), {"employee_id": "emp001", "laptop_mode": "Dark Mode"},
+               _zone_record("B2", -4.0), _zone_record("B2", 2.0)]
+    store = SensorReadingStore()
+    received = []
+    store.add_listener(received.extend)
+
+    report = ingest_sensor_stream(io.StringIO(json.dumps(records)), store, batch_size=2)
+
+    assert report.records_read == 4
+    assert report.records_ingested == 2
+    assert report.records_rejected == 1  # Negative kWh fails validation
+    assert report.records_skipped == 1  # Laptop record is not a zone snapshot
+    assert report.records_per_second > 0
+    assert len(store) == 2
+    assert list(store.energy_kwh) == [1.5, 2.0]
+    assert [reading.office_zone for reading in received] == ["A1", "B2"]
+
+
+def test_new_listeners_replay_history_in_batches():
+    store = SensorReadingStore()
+    ingest_sensor_stream(io.StringIO(json.dumps([_zone_record(zone, kwh) for zone, kwh in zip("ABABA", range(5))])), store)
+    batches = []
+    store.add_listener(batches.append, batch_size=2)
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert [reading.energy_consumption_kwh_hourly for batch in batches for reading in batch] == [0, 1, 2, 3, 4]
+
+    store.add_listener(batches.append, replay=False)
+    assert len(batches) == 3
@@ -0,0 +1,29 @@
+from ..app.services.synthetic_data_service import (
+    SyntheticConfig, generate_dataset, materialize_employees, materialize_zones, zone_id_for, OCCUPIED,
+)
+
+
+def test_same_seed_generates_identical_dataset():
+    config = SyntheticConfig(num_employees=500, num_zones=30, seat_rows=5, seat_cols=4, seed=7)
+    assert generate_dataset(config).checksum() == generate_dataset(config).checksum()
+    other_seed = SyntheticConfig(num_employees=500, num_zones=30, seat_rows=5, seat_cols=4, seed=8)
+    assert generate_dataset(config).checksum() != generate_dataset(other_seed).checksum()
+
+
+def test_each_employee_gets_at_most_one_seat():
+    config = SyntheticConfig(num_employees=40, num_zones=3, seat_rows=5, seat_cols=4, seed=1)
+    dataset = generate_dataset(config)
+    assigned = dataset.seat_employee[dataset.seat_employee >= 0]
+    assert len(assigned) == len(set(assigned.tolist()))
+    assert (dataset.seat_status[dataset.seat_employee >= 0] == OCCUPIED).all()
+
+    employees = materialize_employees(dataset)
+    zones, employee_seats, _ = materialize_zones(dataset)
+    assert len(employees) == 40
+    assert set(employee_seats) <= {emp.id for emp in employees}
+    assert sum(len(seats) for seats in zones.values()) == 60
+
+
+def test_zone_ids_stay_unique_past_z():
+    assert [zone_id_for(i) for i in (0, 25, 26, 27)] == ["ZoneA", "ZoneZ", "ZoneAA", "ZoneAB"]
+    assert [zone_id_for(i, num_buildings=2) for i in (0, 1, 26)] == ["B1/ZoneA", "B2/ZoneB", "B1/ZoneAA"]
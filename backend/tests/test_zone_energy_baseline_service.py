@@ -0,0 +1,130 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from ..app.models.employee_models import Employee
+from ..app.models.energy_models import HvacStatus, LightState, SensorReading
+from ..app.models.seating_models import Seat, SeatStatus
+from ..app.services import data_generation_service, zone_energy_baseline_service
+from ..app.services.sensor_ingestion_service import SensorReadingStore
+from ..app.services.zone_energy_baseline_service import ZoneEnergyBaselines, seating_zone_for
+
+
+def _readings(rng, zone_ids, days):
+    # Hourly readings: zones are busy in office hours, with lights and AC mostly following
+    start = datetime(2024, 3, 4, tzinfo=timezone.utc)
+    readings = []
+    for hour in range(24 * days):
+        moment = start + timedelta(hours=hour)
+        for zone_id in zone_ids:
+            busy = 8 <= moment.hour < 18 and rng.random() < 0.8
+            readings.append(SensorReading(
+                timestamp=moment, office_zone=zone_id,
+                light_status=LightState.ON if busy else LightState.OFF,
+                ac_status=HvacStatus.ON if busy or rng.random() < 0.05 else HvacStatus.OFF,
+                energy_consumption_kwh_hourly=round(rng.uniform(1.0, 2.5) if busy else rng.uniform(0.0, 0.4), 2),
+            ))
+    return readings
+
+
+def _saving_by_scan(readings, zone_id):
+    # Brute force: group the zone's readings by hour and occupancy and compare averages
+    share = {(True, True): (0.3, 0.6), (True, False): (1.0, 0.0), (False, True): (0.0, 1.0), (False, False): (0.0, 0.0)}
+    groups = {}
+    for reading in readings:
+        if reading.office_zone != zone_id:
+            continue
+        light, ac = reading.light_status == LightState.ON, reading.ac_status != HvacStatus.OFF
+        weights = share[light, ac]
+        kwh = reading.energy_consumption_kwh_hourly * sum(weights) / (sum(weights) or 1)
+        groups.setdefault((reading.timestamp.hour, light), []).append(kwh)
+    vacant_all = [kwh for (_, light), values in groups.items() if not light for kwh in values]
+    total = 0.0
+    for hour in range(24):
+        occupied, vacant = groups.get((hour, True), []), groups.get((hour, False))
+        if not occupied:
+            continue
+        vacant_mean = sum(vacant) / len(vacant) if vacant else sum(vacant_all) / len(vacant_all)
+        in_use = len(occupied) / (len(occupied) + len(vacant or []))
+        total += in_use * max(sum(occupied) / len(occupied) - vacant_mean, 0.0)
+    return total
+
+
+def test_baselines_match_a_scan_and_refresh_incrementally():
+    readings = _readings(random.Random(2), ["A1", "B2"], days=6)
+    baselines = ZoneEnergyBaselines()
+    baselines.add_readings(readings[: len(readings) // 3])
+    baselines.add_readings(readings[len(readings) // 3:])
+
+    for zone_id in ("A1", "B2"):
+        assert baselines.vacating_saving_kwh(zone_id) == pytest.approx(_saving_by_scan(readings, zone_id))
+    assert baselines.vacating_saving_kwh("Nowhere") is None
+    assert baselines.zone_kwh(["A1", "Nowhere"]).keys() == {"A1"}
+
+    lighting, hvac = baselines.draw_kwh("A1", 10, occupied=True)
+    assert lighting > 0 and hvac > 0
+    assert baselines.draw_kwh("A1", 3, occupied=True) is None
+
+    # A new day of readings moves the baseline without replaying the history
+    before = baselines.vacating_saving_kwh("A1")
+    late = [SensorReading(timestamp=datetime(2024, 3, 11, 10, tzinfo=timezone.utc), office_zone="A1",
+                          light_status=LightState.ON, ac_status=HvacStatus.ON, energy_consumption_kwh_hourly=9.0)]
+    baselines.add_readings(late)
+    assert baselines.vacating_saving_kwh("A1") > before
+    assert baselines.vacating_saving_kwh("A1") == pytest.approx(_saving_by_scan(readings + late, "A1"))
+
+
+def test_suggestion_savings_come_from_zone_baselines(monkeypatch):
+    zones = {}
+    for zone_id, people in (("ZoneA", 2), ("ZoneB", 12), ("ZoneC", 1)):
+        zones[zone_id] = [Seat(seat_id=f"{zone_id}-R1C{s + 1}", status=SeatStatus.OCCUPIED if s < people else SeatStatus.UNOCCUPIED,
+                               employee_id=f"{zone_id}-emp{s}" if s < people else None) for s in range(16)]
+    baselines = ZoneEnergyBaselines()
+    baselines.add_readings(_readings(random.Random(8), ["ZoneA", "ZoneB", "ZoneC"], days=3))
+    monkeypatch.setattr(zone_energy_baseline_service, "_baselines", baselines)
+
+    suggestion = data_generation_service.consolidation_suggestion(zones)
+    assert sorted(suggestion["vacated_zones_lights_off"]) == ["ZoneA", "ZoneC"]
+    expected = baselines.vacating_saving_kwh("ZoneA") + baselines.vacating_saving_kwh("ZoneC")
+    assert suggestion["estimated_energy_saving_kwh"] == pytest.approx(expected, abs=0.01)
+
+
+def test_sensor_zones_map_to_seating_zones():
+    assert seating_zone_for("A1") == "ZoneA" and seating_zone_for("AB12") == "ZoneAB"
+    assert seating_zone_for("B1/ZoneA") == "B1/ZoneA" and seating_zone_for("Lobby") == "Lobby"
+    assert seating_zone_for("Lobby", {"Lobby": "B2/ZoneC"}) == "B2/ZoneC"
+
+    baselines = ZoneEnergyBaselines(zone_map={"Lobby": "B2/ZoneC"})
+    baselines.add_readings(_readings(random.Random(5), ["A1", "Lobby"], days=2))
+    assert baselines.zone_kwh(["B1/ZoneA", "ZoneA", "B2/ZoneC", "B1/ZoneB"]).keys() == {"B1/ZoneA", "ZoneA", "B2/ZoneC"}
+    assert baselines.vacating_saving_kwh("A1") == baselines.vacating_saving_kwh("B1/ZoneA")
+
+
+def test_suggestions_use_baselines_learned_from_sensor_zone_ids(monkeypatch):
+    """Sensor readings for "A1".."C1" ingested into a store drive the savings of a suggestion for "B1/ZoneA".."B1/ZoneC"."""
+    data_generation_service.get_mock_seating_arrangement_and_assign_employees()
+    saved = data_generation_service.export_mock_state()
+    employees, zones = [], {}
+    for letter, people in (("A", 2), ("B", 12), ("C", 1)):
+        zone_id = f"B1/Zone{letter}"
+        zones[zone_id] = [Seat(seat_id=f"{zone_id}-R{s // 4 + 1}C{s % 4 + 1}", position=divmod(s, 4),
+                               status=SeatStatus.OCCUPIED if s < people else SeatStatus.UNOCCUPIED,
+                               employee_id=f"emp{letter}{s}" if s < people else None).model_dump(mode="json") for s in range(16)]
+        employees += [Employee(id=f"emp{letter}{s}", name=f"Person {letter}{s}", department="Testing", awe_points=0,
+                               current_seat_id=f"{zone_id}-R{s // 4 + 1}C{s % 4 + 1}").model_dump() for s in range(people)]
+
+    store, baselines = SensorReadingStore(), ZoneEnergyBaselines(zone_map={})
+    store.append_batch(_readings(random.Random(8), ["A1", "B1", "C1"], days=3))
+    store.add_listener(baselines.add_readings)  # Replays the stored readings
+    monkeypatch.setattr(zone_energy_baseline_service, "_baselines", baselines)
+    try:
+        data_generation_service.load_mock_state({"employees": employees, "zones": zones, "laptop_usage": []})
+        suggestion = data_generation_service.get_mock_seating_suggestions()
+    finally:
+        data_generation_service.load_mock_state(saved)
+
+    assert sorted(suggestion["vacated_zones_lights_off"]) == ["B1/ZoneA", "B1/ZoneC"]
+    expected = baselines.vacating_saving_kwh("A1") + baselines.vacating_saving_kwh("C1")
+    assert expected > 0
+    assert suggestion["estimated_energy_saving_kwh"] == pytest.approx(expected, abs=0.01)
@@ -0,0 +1,38 @@
+import io
+import json
+from datetime import datetime, timezone
+
+from ..app.services.sensor_ingestion_service import SensorReadingStore, ingest_sensor_stream
+from ..app.services.zone_energy_rollup_service import ZoneEnergyRollups
+
+
+def _zone_record(zone: str, timestamp: str, kwh: float) -> dict:
+    return {
+        "timestamp": timestamp, "office_zone": zone, "temperature_celsius": 22.5,
+        "light_status": "ON", "ac_status": "ECO", "projector_status": "OFF",
+        "energy_consumption_kwh_hourly": kwh,
+    }
+
+
+def test_rollups_pick_coarsest_aligned_tier():
+    store = SensorReadingStore()
+    rollups = ZoneEnergyRollups()
+    store.add_listener(rollups.add_readings)
+    records = [_zone_record("A1", f"2023-{month:02}-{day:02}T{hour:02}:00:00Z", 1.0)
+               for month in (1, 2) for day in (1, 15) for hour in (9, 17)]
+    ingest_sensor_stream(io.StringIO(json.dumps(records)), store)
+
+    def epoch(*args):
+        return int(datetime(*args, tzinfo=timezone.utc).timestamp())
+
+    tier, rows = rollups.series("A1", "month")
+    assert tier == "month"
+    assert [(kwh, readings) for _, kwh, readings in rows] == [(4.0, 4), (4.0, 4)]
+
+    tier, rows = rollups.series("A1", "month", start=epoch(2023, 1, 15), end=epoch(2023, 3, 1))
+    assert tier == "day"  # Mid-month start cannot be served by the monthly tier
+    assert [kwh for _, kwh, _ in rows] == [2.0, 4.0]
+
+    tier, rows = rollups.series("A1", "day", start=epoch(2023, 1, 1, 12), end=epoch(2023, 1, 2))
+    assert tier == "hour"
+    assert [kwh for _, kwh, _ in rows] == [1.0]
@@ -0,0 +1,57 @@
+import random
+
+from ..app.models.seating_models import Seat, SeatStatus
+from ..app.services import data_generation_service
+from ..app.services.zone_occupancy_index import ZoneOccupancyCounters
+
+
+def _recount(zones_seats):
+    return {
+        zone_id: {status: sum(1 for seat in seats if seat.status == status) for status in SeatStatus}
+        for zone_id, seats in zones_seats.items()
+    }
+
+
+def test_counters_match_recount_after_random_moves():
+    """Incremental updates should always agree with counting every seat again."""
+    rng = random.Random(11)
+    statuses = list(SeatStatus)
+    zones_seats = {
+        f"Zone{zone}": [Seat(seat_id=f"Zone{zone}-{i}", status=rng.choice(statuses)) for i in range(50)]
+        for zone in "ABC"
+    }
+    counters = ZoneOccupancyCounters()
+    counters.rebuild(zones_seats)
+
+    for _ in range(2000):
+        zone_id = rng.choice(list(zones_seats))
+        seat = rng.choice(zones_seats[zone_id])
+        new_status = rng.choice(statuses)
+        counters.move(zone_id, seat.status, new_status)
+        seat.status = new_status
+
+    expected = _recount(zones_seats)
+    assert {zone_id: counters.counts(zone_id) for zone_id in zones_seats} == expected
+    assert counters.occupied_by_zone() == {zone_id: counts[SeatStatus.OCCUPIED] for zone_id, counts in expected.items()}
+    assert counters.total() == 150
+    assert counters.total(SeatStatus.OCCUPIED) == sum(counters.occupied_by_zone().values())
+    assert counters.counts("ZoneZ") is None and counters.occupied("ZoneZ") == 0
+
+
+def test_seat_changes_in_mock_service_update_counters():
+    """Seat changes made through the service are reflected without a rescan."""
+    zones_seats = data_generation_service._generated_zones_seats
+    zone_id, seats = next(iter(zones_seats.items()))
+    seat = next(seat for seat in seats if seat.status == SeatStatus.UNOCCUPIED)
+    before = data_generation_service._zone_occupancy()[zone_id]
+
+    data_generation_service._set_seat_state(zone_id, seat, SeatStatus.DISABLED)
+    try:
+        assert data_generation_service._zone_counters.counts(zone_id) == _recount({zone_id: seats})[zone_id]
+        arrangement = data_generation_service.get_mock_seating_arrangement_and_assign_employees()
+        assert arrangement["total_seats"] == sum(len(s) for s in zones_seats.values())
+        assert arrangement["occupied_seats"] == sum(_recount(zones_seats)[z][SeatStatus.OCCUPIED] for z in zones_seats)
+        assert data_generation_service._zone_occupancy()[zone_id] == before
+    finally:
+        data_generation_service._set_seat_state(zone_id, seat, SeatStatus.UNOCCUPIED)
+    assert data_generation_service._zone_counters.counts(zone_id) == _recount({zone_id: seats})[zone_id]
@@ -0,0 +1,21 @@
+import asyncio
+
+from ..app.services.zone_state_stream_service import RESYNC_EVENT, ZoneStateBroadcaster
+
+
+def test_zone_state_broadcaster_sends_deltas_and_resyncs_slow_subscribers():
+    async def scenario():
+        broadcaster = ZoneStateBroadcaster(queue_size=2)
+        queue = broadcaster.subscribe()
+        broadcaster.publish({"type": "lighting", "zone_id": "ZoneA", "status": "ON"})
+        first = queue.get_nowait()
+        for status in ("OFF", "ON", "OFF"):  # One more than the queue holds
+            broadcaster.publish({"type": "lighting", "zone_id": "ZoneA", "status": status})
+        backlog = [queue.get_nowait() for _ in range(queue.qsize())]
+        broadcaster.unsubscribe(queue)
+        return first, backlog, broadcaster.subscriber_count
+
+    first, backlog, remaining = asyncio.run(scenario())
+    assert first == {"type": "lighting", "zone_id": "ZoneA", "status": "ON"}
+    assert backlog == [RESYNC_EVENT]
+    assert remaining == 0
@@ -46,6 +46,13 @@ export const getSeatingSuggestions = () => {
   return apiClient.get('/seating/suggestions/');
 };
 
+// Dashboard Endpoint: every widget in one request (optionally only some sections)
+export const getDashboard = (sections = [], leaderboardLimit = 10) => {
+  const params = new URLSearchParams({ leaderboard_limit: leaderboardLimit });
+  sections.forEach((section) => params.append('sections', section));
+  return apiClient.get(`/dashboard/?${params.toString()}`);
+};
+
 // Example of how to handle potential errors (optional, can be done in components)
 // export const getLeaderboardWithErrorHandling = async (limit = 10) => {
 //   try {